@@ -13,14 +13,82 @@ DB_NAME = os.getenv("DB_NAME")
 
 # Se construye la URL de conexión, ideal para librerías como SQLAlchemy
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Misma base, con driver asíncrono para las rutas async (SQLAlchemy asyncio)
+ASYNC_DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Pool de conexiones (QueuePool de SQLAlchemy)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))  # segundos esperando una conexión libre
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # menor que el wait_timeout de MySQL
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
 
 # --- Autenticación JWT ---
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
+# Hilos dedicados a bcrypt (hash/verificación de contraseñas) por proceso
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+# Caché en memoria del usuario autenticado (por proceso)
+AUTH_USER_CACHE_TTL_SECONDS = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", 60))
+AUTH_USER_CACHE_MAXSIZE = int(os.getenv("AUTH_USER_CACHE_MAXSIZE", 10000))
 
 # --- Google Gemini AI ---
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+# Llamadas concurrentes a Gemini (generación de quizzes en lote)
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", 5))
+AI_REQUEST_TIMEOUT_SECONDS = float(os.getenv("AI_REQUEST_TIMEOUT_SECONDS", 60))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", 3))
+# Caché de respuestas de Gemini: "sqlite" (archivo local), "redis" o "none"
+AI_CACHE_BACKEND = os.getenv("AI_CACHE_BACKEND", "sqlite").lower()
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "ai_cache.sqlite3")
+AI_CACHE_REDIS_URL = os.getenv("AI_CACHE_REDIS_URL", "redis://localhost:6379/1")
+AI_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", 10000))
+
+# Recomendador local de cursos (dashboard del alumno)
+RECOMMENDER_REFRESH_SECONDS = int(os.getenv("RECOMMENDER_REFRESH_SECONDS", 900))
+RECOMMENDER_NEIGHBORS = int(os.getenv("RECOMMENDER_NEIGHBORS", 50))
+# Si está activo, Gemini reordena los candidatos del recomendador local
+RECOMMENDER_LLM_RERANK = os.getenv("RECOMMENDER_LLM_RERANK", "false").lower() in ("1", "true", "yes")
+
+# Caché en memoria de las claves de respuestas de los quizzes (por proceso)
+ANSWER_KEY_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_KEY_CACHE_TTL_SECONDS", 600))
+ANSWER_KEY_CACHE_MAXSIZE = int(os.getenv("ANSWER_KEY_CACHE_MAXSIZE", 5000))
+
+# Índice en memoria de los temas de las sugerencias de cursos: recarga completa periódica
+SUGGESTION_INDEX_RELOAD_SECONDS = int(os.getenv("SUGGESTION_INDEX_RELOAD_SECONDS", 600))
+
+# Caché en memoria de los conteos de votos por curso/módulo (por proceso)
+RATING_COUNTS_CACHE_TTL_SECONDS = int(os.getenv("RATING_COUNTS_CACHE_TTL_SECONDS", 60))
+RATING_COUNTS_CACHE_MAXSIZE = int(os.getenv("RATING_COUNTS_CACHE_MAXSIZE", 20000))
+
+# Pool de frases motivadoras del resultado de los quizzes
+MOTIVATION_PHRASES_PER_BUCKET = int(os.getenv("MOTIVATION_PHRASES_PER_BUCKET", 10))
+MOTIVATION_REFRESH_SECONDS = int(os.getenv("MOTIVATION_REFRESH_SECONDS", 24 * 3600))
+
+# PDFs de los módulos: se renderizan en un pool de procesos y se cachean en disco
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "pdf_cache")
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", 2))
+# Antigüedad mínima de una versión vieja de un PDF antes de borrarla del caché
+PDF_CACHE_GRACE_SECONDS = int(os.getenv("PDF_CACHE_GRACE_SECONDS", 600))
+
+# Audio de los módulos (texto a voz): "gtts" o "fake" (bytes deterministas, sin red; para tests)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gtts")
+TTS_LANGUAGE = os.getenv("TTS_LANGUAGE", "es")
+TTS_CHUNK_MAX_CHARS = int(os.getenv("TTS_CHUNK_MAX_CHARS", 500))
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", 4))
+# Almacenamiento del audio generado: por ahora solo "local" (archivos en AUDIO_OUTPUT_DIR)
+AUDIO_STORAGE_BACKEND = os.getenv("AUDIO_STORAGE_BACKEND", "local")
+AUDIO_OUTPUT_DIR = os.getenv("AUDIO_OUTPUT_DIR", "static/audio/modules")
+
+# --- Celery (pipeline de generación en segundo plano) ---
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+# En tests: CELERY_BROKER_URL=memory:// y CELERY_TASK_ALWAYS_EAGER=true ejecutan las tareas en el mismo proceso
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false").lower() in ("1", "true", "yes")
+GENERATION_STAGE_MAX_RETRIES = int(os.getenv("GENERATION_STAGE_MAX_RETRIES", 3))
+GENERATION_STAGE_RETRY_DELAY_SECONDS = float(os.getenv("GENERATION_STAGE_RETRY_DELAY_SECONDS", 5))
 
 # Variables para el servicio de correo
 EMAIL_HOST = os.getenv("EMAIL_HOST")
@@ -0,0 +1,191 @@
+# backend/app/core/ai_cache.py
+
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from typing import Optional
+
+from app.config import (
+    AI_CACHE_BACKEND, AI_CACHE_PATH, AI_CACHE_REDIS_URL,
+    AI_CACHE_TTL_SECONDS, AI_CACHE_MAX_ENTRIES
+)
+
+
+def make_cache_key(model_name: str, prompt: str) -> str:
+    """Clave direccionada por contenido: sha256 del modelo + el prompt exacto."""
+    return hashlib.sha256(f"{model_name}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Base de las cachés de respuestas de la IA. Lleva los contadores de aciertos
+    y fallos; un error del backend cuenta como fallo y nunca corta la llamada a la IA.
+    """
+    backend = "none"
+
+    def __init__(self, ttl_seconds: int = AI_CACHE_TTL_SECONDS, max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self._get(key)
+        except Exception as e:
+            print(f"Error al leer la caché de IA ({self.backend}): {e!r}")
+            value = None
+            self._count("errors")
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str):
+        try:
+            self._set(key, value)
+        except Exception as e:
+            print(f"Error al escribir la caché de IA ({self.backend}): {e!r}")
+            self._count("errors")
+
+    def stats(self) -> dict:
+        try:
+            entries = self._size()
+        except Exception:
+            entries = None
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _get(self, key: str) -> Optional[str]:
+        return None
+
+    def _set(self, key: str, value: str):
+        pass
+
+    def _size(self) -> int:
+        return 0
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Caché local en un archivo SQLite, compartida por todos los procesos de la máquina
+    (API y workers de Celery). Expira por TTL y, al superar max_entries, descarta
+    las entradas usadas hace más tiempo (LRU).
+    """
+    backend = "sqlite"
+
+    def __init__(self, path: str = AI_CACHE_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_ai_responses_accessed_at ON ai_responses (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        # `with conn` solo confirma o revierte la transacción; closing() cierra la conexión
+        with closing(sqlite3.connect(self.path, timeout=5)) as conn, conn:
+            yield conn
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM ai_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute("DELETE FROM ai_responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE ai_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _set(self, key: str, value: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now)
+            )
+            conn.execute("DELETE FROM ai_responses WHERE expires_at < ?", (now,))
+            conn.execute(
+                "DELETE FROM ai_responses WHERE key IN ("
+                " SELECT key FROM ai_responses ORDER BY accessed_at ASC"
+                " LIMIT max(0, (SELECT COUNT(*) FROM ai_responses) - ?))",
+                (self.max_entries,)
+            )
+
+    def _size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM ai_responses").fetchone()[0]
+
+
+class RedisResponseCache(ResponseCache):
+    """
+    Caché en Redis, compartida entre máquinas. El TTL lo aplica Redis (SETEX); el
+    límite de tamaño se mantiene con un sorted set de último acceso (LRU).
+    """
+    backend = "redis"
+    prefix = "ai_cache:"
+
+    def __init__(self, url: str = AI_CACHE_REDIS_URL, **kwargs):
+        import redis
+        super().__init__(**kwargs)
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.index_key = f"{self.prefix}index"
+
+    def _get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        if value is not None:
+            self.client.zadd(self.index_key, {key: time.time()})
+        return value
+
+    def _set(self, key: str, value: str):
+        pipe = self.client.pipeline()
+        pipe.setex(self.prefix + key, self.ttl_seconds, value)
+        pipe.zadd(self.index_key, {key: time.time()})
+        # Las claves expiradas por TTL también salen del índice
+        pipe.zremrangebyscore(self.index_key, "-inf", time.time() - self.ttl_seconds)
+        pipe.zcard(self.index_key)
+        size = pipe.execute()[-1]
+
+        overflow = size - self.max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in self.client.zpopmin(self.index_key, overflow)]
+            if evicted:
+                self.client.delete(*(self.prefix + member for member in evicted))
+
+    def _size(self) -> int:
+        return self.client.zcard(self.index_key)
+
+
+def build_response_cache() -> ResponseCache:
+    """Crea la caché configurada en AI_CACHE_BACKEND ('sqlite', 'redis' o 'none')."""
+    if AI_CACHE_BACKEND == "redis":
+        return RedisResponseCache()
+    if AI_CACHE_BACKEND == "sqlite":
+        return SQLiteResponseCache()
+    return ResponseCache()
+
+
+response_cache = build_response_cache()
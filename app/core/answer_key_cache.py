@@ -0,0 +1,28 @@
+# backend/app/core/answer_key_cache.py
+
+import threading
+from typing import Optional
+from cachetools import TTLCache
+from app.config import ANSWER_KEY_CACHE_TTL_SECONDS, ANSWER_KEY_CACHE_MAXSIZE
+from app.logic.quiz_logic import AnswerKey
+
+# Claves de respuestas compiladas por módulo. Se invalidan al crear preguntas
+# (quiz_repo); el TTL cubre los cambios hechos desde otros procesos, como el worker
+# de Celery. Las claves vacías (módulo todavía sin quiz) no se guardan.
+_cache = TTLCache(maxsize=ANSWER_KEY_CACHE_MAXSIZE, ttl=ANSWER_KEY_CACHE_TTL_SECONDS)
+_lock = threading.Lock()
+
+
+def get_cached_answer_key(module_id: int) -> Optional[AnswerKey]:
+    with _lock:
+        return _cache.get(module_id)
+
+
+def set_cached_answer_key(module_id: int, answer_key: AnswerKey):
+    with _lock:
+        _cache[module_id] = answer_key
+
+
+def invalidate_answer_key(module_id: int):
+    with _lock:
+        _cache.pop(module_id, None)
@@ -0,0 +1,132 @@
+# backend/app/core/audio_storage.py
+
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from app.config import AUDIO_STORAGE_BACKEND, AUDIO_OUTPUT_DIR
+
+# Ruta pública con la que se sirve el audio (ver app/routers/audio.py)
+AUDIO_URL_PREFIX = "/audio/modules"
+
+# Claves válidas: nombres de archivo planos, sin rutas (evita path traversal)
+_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_-]+\.mp3$")
+# Nombre = sha256 del contenido: el archivo nunca cambia
+_HASHED_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.mp3$")
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def is_valid_key(key: str) -> bool:
+    return bool(_KEY_PATTERN.match(key))
+
+
+def is_content_addressed(key: str) -> bool:
+    return bool(_HASHED_KEY_PATTERN.match(key))
+
+
+def module_audio_url(key: str) -> str:
+    """URL que se guarda en Module.content_audio_url."""
+    return f"{AUDIO_URL_PREFIX}/{key}"
+
+
+@dataclass(frozen=True)
+class StoredAudio:
+    size: int
+    etag: str               # entre comillas, como exige HTTP
+    last_modified: datetime
+
+
+class AudioStorage(ABC):
+    """
+    Interfaz de almacenamiento del audio de los módulos. Las claves son nombres
+    de archivo planos. Un backend de object storage (S3, GCS) implementa los mismos
+    métodos con HEAD / PUT / GET con Range, y puede devolver en public_url una URL
+    firmada o de CDN para que el cliente descargue directamente.
+    """
+    backend = "none"
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[StoredAudio]:
+        """Tamaño, ETag y fecha del objeto, o None si no existe."""
+
+    @abstractmethod
+    def save(self, key: str, data: bytes):
+        """Guarda el objeto completo; quien lee nunca debe ver uno a medias."""
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        """Bytes [start, end] (ambos inclusive) del objeto, por bloques."""
+
+    def public_url(self, key: str) -> Optional[str]:
+        """URL de descarga directa, si el backend la ofrece; None para servir desde la API."""
+        return None
+
+
+class LocalAudioStorage(AudioStorage):
+    """Archivos en un directorio local (AUDIO_OUTPUT_DIR)."""
+    backend = "local"
+
+    def __init__(self, root: str = AUDIO_OUTPUT_DIR):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        if not is_valid_key(key):
+            raise ValueError(f"Clave de audio inválida: {key!r}")
+        return os.path.join(self.root, key)
+
+    def stat(self, key: str) -> Optional[StoredAudio]:
+        try:
+            file_stat = os.stat(self._path(key))
+        except FileNotFoundError:
+            return None
+        if is_content_addressed(key):
+            etag = f'"{key[:-4]}"'
+        else:
+            etag = f'"{file_stat.st_size:x}-{int(file_stat.st_mtime):x}"'
+        return StoredAudio(
+            size=file_stat.st_size,
+            etag=etag,
+            last_modified=datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc)
+        )
+
+    def save(self, key: str, data: bytes):
+        # Temporal + rename: nunca se sirve un archivo a medias
+        path = self._path(key)
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as audio_file:
+                audio_file.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def iter_range(self, key: str, start: int, end: int) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as audio_file:
+            audio_file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = audio_file.read(min(_READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+def build_audio_storage() -> AudioStorage:
+    """Crea el almacenamiento configurado en AUDIO_STORAGE_BACKEND (por ahora solo 'local')."""
+    if AUDIO_STORAGE_BACKEND == "local":
+        return LocalAudioStorage()
+    raise ValueError(f"AUDIO_STORAGE_BACKEND desconocido: {AUDIO_STORAGE_BACKEND!r}")
+
+
+audio_storage = build_audio_storage()
@@ -1,4 +1,12 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
+from app.config import PASSWORD_HASH_WORKERS
+
+# bcrypt es deliberadamente lento (~250ms) pero libera el GIL: se ejecuta en un pool
+# de hilos acotado para no congelar el event loop ni saturar la CPU en una ráfaga de logins.
+_hashing_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -24,4 +32,14 @@ def get_password_hash(password: str) -> str:
     # Genera una 'salt' y la incluye en el hash
     hashed_bytes = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
     # Devuelve el hash como un string para guardarlo en la base de datos
-    return hashed_bytes.decode('utf-8')
\ No newline at end of file
+    return hashed_bytes.decode('utf-8')
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Igual que verify_password, pero ejecutada en el pool de bcrypt para usarla
+    desde handlers `async def`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hashing_executor, verify_password, plain_password, hashed_password)
+
@@ -0,0 +1,19 @@
+# backend/app/core/http_cache.py
+
+import hashlib
+
+# Validadores para peticiones condicionales (ETag / If-None-Match) de las
+# respuestas que se pueden revalidar: resumen del curso, PDFs y audio.
+
+
+def text_etag(text: str) -> str:
+    """ETag fuerte (entre comillas, como exige HTTP) de un texto."""
+    return '"' + hashlib.sha256(text.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """Compara la cabecera If-None-Match (lista, '*' o validadores débiles W/) con un ETag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
@@ -0,0 +1,61 @@
+# backend/app/core/pdf_cache.py
+
+import glob
+import os
+import time
+from app.config import PDF_CACHE_DIR, PDF_CACHE_GRACE_SECONDS
+
+# PDFs y fragmentos HTML renderizados en disco, por ID y huella de contenido:
+#   {PDF_CACHE_DIR}/module_{id}_{hash}.pdf   PDF de un módulo
+#   {PDF_CACHE_DIR}/module_{id}_{hash}.html  cuerpo del módulo (Markdown ya convertido)
+#   {PDF_CACHE_DIR}/course_{id}_{hash}.pdf   PDF del curso completo
+# Un cambio de contenido cambia la huella, así que nunca se sirve un archivo viejo;
+# remove_superseded_files solo libera el espacio de las versiones anteriores, y sin
+# borrar las que una petición en curso todavía puede estar por enviar.
+
+
+def module_pdf_path(module_id: int, content_hash: str) -> str:
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    return os.path.join(PDF_CACHE_DIR, f"module_{module_id}_{content_hash}.pdf")
+
+
+def module_fragment_path(module_id: int, content_hash: str) -> str:
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    return os.path.join(PDF_CACHE_DIR, f"module_{module_id}_{content_hash}.html")
+
+
+def course_pdf_path(course_id: int, content_hash: str) -> str:
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    return os.path.join(PDF_CACHE_DIR, f"course_{course_id}_{content_hash}.pdf")
+
+
+def remove_superseded_files(pattern: str, keep: str = None):
+    """
+    Borra las versiones anteriores de un archivo cacheado, salvo `keep` y la más
+    reciente de las demás: una petición que leyó el contenido justo antes del cambio
+    puede estar por servirla. El resto se borra recién cuando tiene más de
+    PDF_CACHE_GRACE_SECONDS; si aun así falta, se vuelve a renderizar al pedirla.
+    """
+    versions = []
+    for path in glob.glob(os.path.join(PDF_CACHE_DIR, pattern)):
+        if path == keep:
+            continue
+        try:
+            versions.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            pass
+    versions.sort(reverse=True)
+
+    cutoff = time.time() - PDF_CACHE_GRACE_SECONDS
+    for mtime, path in versions[1:]:
+        if mtime > cutoff:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def invalidate_module_pdfs(module_id: int):
+    remove_superseded_files(f"module_{module_id}_*.pdf")
+    remove_superseded_files(f"module_{module_id}_*.html")
@@ -0,0 +1,83 @@
+# backend/app/core/pool_metrics.py
+
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Límites superiores (en milisegundos) de los buckets del histograma de espera
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolStats:
+    """Contadores e histograma (thread-safe) de la espera por conexiones del pool."""
+
+    def __init__(self, buckets_ms=WAIT_BUCKETS_MS):
+        self._lock = threading.Lock()
+        self.buckets_ms = tuple(buckets_ms)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._bucket_counts = [0] * (len(self.buckets_ms) + 1)  # el último es +Inf
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_ms_total = 0.0
+            self.wait_ms_max = 0.0
+
+    def observe_wait(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            for index, upper_bound in enumerate(self.buckets_ms):
+                if wait_ms <= upper_bound:
+                    self._bucket_counts[index] += 1
+                    break
+            else:
+                self._bucket_counts[-1] += 1
+
+    def snapshot(self, pool=None) -> dict:
+        """Devuelve el estado actual del pool y el histograma acumulado de esperas."""
+        with self._lock:
+            observations = self.checkouts + self.timeouts
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / observations, 3) if observations else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "wait_ms_histogram": {
+                    **{f"le_{upper_bound}": count for upper_bound, count in zip(self.buckets_ms, self._bucket_counts)},
+                    "le_inf": self._bucket_counts[-1],
+                },
+            }
+
+        if pool is not None and isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+            })
+        return data
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mide cuánto espera cada checkout por una conexión libre."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.observe_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        pool_stats.observe_wait((time.perf_counter() - start) * 1000)
+        return connection
@@ -0,0 +1,28 @@
+# backend/app/core/rating_counts_cache.py
+
+import threading
+from typing import Dict, Optional, Tuple
+from cachetools import TTLCache
+from app.config import RATING_COUNTS_CACHE_TTL_SECONDS, RATING_COUNTS_CACHE_MAXSIZE
+
+# Conteos de votos por objetivo: ("course", id), ("module", id) o ("global", None).
+# create_or_update_rating invalida el objetivo votado y el global; el TTL cubre
+# los votos registrados desde otros procesos.
+_cache = TTLCache(maxsize=RATING_COUNTS_CACHE_MAXSIZE, ttl=RATING_COUNTS_CACHE_TTL_SECONDS)
+_lock = threading.Lock()
+
+
+def get_cached_counts(key: Tuple[str, Optional[int]]) -> Optional[Dict[str, int]]:
+    with _lock:
+        return _cache.get(key)
+
+
+def set_cached_counts(key: Tuple[str, Optional[int]], counts: Dict[str, int]):
+    with _lock:
+        _cache[key] = counts
+
+
+def invalidate_counts(*keys: Tuple[str, Optional[int]]):
+    with _lock:
+        for key in keys:
+            _cache.pop(key, None)
@@ -0,0 +1,152 @@
+# backend/app/core/suggestion_index.py
+
+import difflib
+import threading
+import time
+from typing import Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config import SUGGESTION_INDEX_RELOAD_SECONDS
+
+# Columnas del histograma de caracteres. Dos caracteres que caen en la misma
+# columna solo agrandan la cota superior: nunca descartan una coincidencia real.
+_HISTOGRAM_BUCKETS = 128
+# Los huecos de IDs hasta esta distancia de last_id se siguen buscando en cada puesta
+# al día (transacciones que confirmaron tarde); los más viejos los cubre la recarga
+_MISSING_ID_WINDOW = 100
+
+
+def normalize_topic(topic: str) -> str:
+    """Forma con la que se indexan y se comparan los temas: minúsculas y espacios simples."""
+    return " ".join(topic.lower().split())
+
+
+def _histogram(text: str) -> np.ndarray:
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32) % _HISTOGRAM_BUCKETS
+    return np.minimum(np.bincount(codes, minlength=_HISTOGRAM_BUCKETS), 255).astype(np.uint8)
+
+
+class SuggestionIndex:
+    """
+    Índice en memoria de los temas de las sugerencias de cursos para encontrar la
+    más parecida a un tema nuevo sin comparar con difflib contra toda la tabla.
+
+    Guarda cada tema normalizado con su largo y su histograma de caracteres. La
+    cantidad de caracteres en común acota SequenceMatcher.ratio() por arriba
+    (es su quick_ratio), así que con numpy se descartan de una vez las sugerencias
+    que no pueden llegar al umbral, y el ratio exacto solo se calcula para las
+    restantes, de mayor a menor cota, hasta que la cota ya no puede superar al mejor.
+
+    Es por proceso: se pone al día leyendo las filas con ID mayor a `last_id` y los
+    huecos pendientes (IDs que se confirmaron fuera de orden), y cada
+    SUGGESTION_INDEX_RELOAD_SECONDS se recarga completo.
+    """
+
+    def __init__(self, reload_seconds: float = SUGGESTION_INDEX_RELOAD_SECONDS):
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.int32)
+        self._histograms = np.zeros((0, _HISTOGRAM_BUCKETS), dtype=np.uint8)
+        self._topics: List[str] = []
+        self._known_ids: Set[int] = set()
+        self._pending: List[Tuple[int, str, np.ndarray]] = []
+        self._missing_ids: Set[int] = set()
+        self.last_id = 0
+        self._loaded_at: Optional[float] = None
+
+    def needs_reload(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.reload_seconds
+
+    def reload(self, rows: Iterable[Tuple[int, str]]):
+        """
+        Reemplaza todo el contenido por `rows` (id, tema). Se arma aparte y se
+        intercambia al final, así las búsquedas en curso no esperan a la recarga.
+        """
+        fresh = SuggestionIndex(self.reload_seconds)
+        fresh._add_rows(rows)
+        fresh._compact()
+        with self._lock:
+            for name in ("_ids", "_lengths", "_histograms", "_topics", "_known_ids",
+                         "_pending", "_missing_ids", "last_id"):
+                setattr(self, name, getattr(fresh, name))
+            self._loaded_at = time.monotonic()
+
+    def add(self, suggestion_id: int, topic: str):
+        self.add_many([(suggestion_id, topic)])
+
+    def add_many(self, rows: Iterable[Tuple[int, str]]):
+        with self._lock:
+            self._add_rows(rows)
+
+    def missing_ids(self) -> List[int]:
+        """IDs menores a `last_id` todavía no vistos: otra transacción pudo confirmarlos tarde."""
+        with self._lock:
+            return sorted(self._missing_ids)
+
+    def _add_rows(self, rows):
+        for suggestion_id, topic in sorted(rows):
+            self._missing_ids.discard(suggestion_id)
+            if suggestion_id in self._known_ids:
+                continue
+            if suggestion_id > self.last_id + 1:
+                self._missing_ids.update(range(max(self.last_id + 1, suggestion_id - _MISSING_ID_WINDOW), suggestion_id))
+            normalized = normalize_topic(topic)
+            self._known_ids.add(suggestion_id)
+            self._pending.append((suggestion_id, normalized, _histogram(normalized)))
+            self.last_id = max(self.last_id, suggestion_id)
+
+        # Los huecos viejos suelen ser IDs descartados (rollback o borrado)
+        self._missing_ids = {
+            missing_id for missing_id in self._missing_ids if missing_id >= self.last_id - _MISSING_ID_WINDOW
+        }
+
+    def _compact(self):
+        if not self._pending:
+            return
+        ids, topics, histograms = zip(*self._pending)
+        self._ids = np.concatenate([self._ids, np.array(ids, dtype=np.int64)])
+        self._lengths = np.concatenate([self._lengths, np.array([len(topic) for topic in topics], dtype=np.int32)])
+        self._histograms = np.vstack([self._histograms, np.array(histograms, dtype=np.uint8)])
+        self._topics.extend(topics)
+        self._pending = []
+
+    def best_match(self, topic: str, cutoff: float) -> Optional[Tuple[int, float]]:
+        """
+        (ID, ratio) de la sugerencia con mayor SequenceMatcher.ratio() contra el
+        tema, comparando ambos normalizados, o None si ninguna llega a `cutoff`.
+        """
+        normalized = normalize_topic(topic)
+        length = len(normalized)
+        if not length:
+            return None
+
+        with self._lock:
+            self._compact()
+            # Cota por largo (real_quick_ratio): ratio <= 2*min(a,b)/(a+b)
+            totals = self._lengths + length
+            rows = np.nonzero(2 * np.minimum(self._lengths, length) / totals >= cutoff)[0]
+            # Cota por caracteres en común (quick_ratio)
+            common = np.minimum(self._histograms[rows], _histogram(normalized)).sum(axis=1, dtype=np.int32)
+            bounds = 2 * common / totals[rows]
+            keep = bounds >= cutoff
+            rows, bounds = rows[keep], bounds[keep]
+            order = np.argsort(-bounds, kind="stable")
+            candidates = [(bounds[i], int(self._ids[rows[i]]), self._topics[rows[i]]) for i in order]
+
+        best = None
+        best_ratio = 0.0
+        for bound, suggestion_id, existing_topic in candidates:
+            if bound <= best_ratio:
+                break
+            ratio = difflib.SequenceMatcher(None, normalized, existing_topic).ratio()
+            if ratio >= cutoff and ratio > best_ratio:
+                best, best_ratio = suggestion_id, ratio
+        return (best, best_ratio) if best is not None else None
+
+
+suggestion_index = SuggestionIndex()
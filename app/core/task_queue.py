@@ -0,0 +1,38 @@
+# backend/app/core/task_queue.py
+
+import importlib
+
+from celery import Celery
+
+from app.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND, CELERY_TASK_ALWAYS_EAGER
+
+# La app de Celery vive acá para que la API pueda encolar sin importar worker.py
+# (y con él el pipeline de generación); worker.py registra las tareas sobre ella.
+celery_app = Celery("tasks", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
+celery_app.conf.update(
+    task_always_eager=CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+    # El estado del trabajo vive en generation_jobs; no hace falta guardar el resultado
+    task_ignore_result=True,
+    task_acks_late=True,
+)
+
+# Nombres de las tareas definidas en worker.py
+GENERATE_FULL_COURSE_CONTENT = "worker.generate_full_course_content"
+GENERATE_MODULE_CONTENT = "worker.generate_module_content"
+GENERATE_MODULE_AUDIO = "worker.generate_module_audio"
+REFRESH_LEARNING_PATH_SUGGESTIONS = "worker.refresh_learning_path_suggestions"
+REFRESH_COURSE_SUMMARY = "worker.refresh_course_summary"
+
+_WORKER_MODULE = "worker"
+
+
+def enqueue(task_name: str, *args):
+    """
+    Encola una tarea de worker.py por nombre. En modo eager (CELERY_TASK_ALWAYS_EAGER,
+    tests) se ejecuta en este mismo proceso, así que recién ahí se carga worker.py.
+    """
+    if celery_app.conf.task_always_eager:
+        importlib.import_module(_WORKER_MODULE)
+        return celery_app.tasks[task_name].delay(*args)
+    return celery_app.send_task(task_name, args=args)
@@ -0,0 +1,33 @@
+# backend/app/core/user_cache.py
+
+import threading
+from typing import Optional
+from cachetools import TTLCache
+from app.config import AUTH_USER_CACHE_TTL_SECONDS, AUTH_USER_CACHE_MAXSIZE
+from app.models.user import CurrentUser
+
+# Caché TTL/LRU de usuarios autenticados, indexada por el 'sub' del JWT (username).
+# Es por proceso: la invalidación explícita solo alcanza al worker que hizo el cambio,
+# y el TTL acota cuánto puede quedar desactualizado el resto.
+_cache = TTLCache(maxsize=AUTH_USER_CACHE_MAXSIZE, ttl=AUTH_USER_CACHE_TTL_SECONDS)
+_lock = threading.Lock()
+
+
+def get_cached_user(username: str) -> Optional[CurrentUser]:
+    with _lock:
+        return _cache.get(username)
+
+
+def set_cached_user(user: CurrentUser):
+    with _lock:
+        _cache[user.username] = user
+
+
+def invalidate_cached_user(username: str):
+    with _lock:
+        _cache.pop(username, None)
+
+
+def clear_user_cache():
+    with _lock:
+        _cache.clear()
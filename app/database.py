@@ -1,13 +1,40 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import DATABASE_URL # Importa la URL de conexión desde .env
+from .config import DATABASE_URL, ASYNC_DATABASE_URL # Importa la URL de conexión desde .env
+from .config import DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+from .core.pool_metrics import InstrumentedQueuePool
 
-# Crea el "motor" de SQLAlchemy que se conectará a tu base de datos
-engine = create_engine(DATABASE_URL)
+# Crea el "motor" de SQLAlchemy que se conectará a tu base de datos.
+# pool_pre_ping y pool_recycle evitan el "MySQL server has gone away" tras períodos inactivos.
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
 
 # Crea una fábrica de sesiones que se usará para cada petición a la API
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Motor y fábrica de sesiones asíncronas (aiomysql) para los handlers `async def`,
+# así las consultas no bloquean el event loop.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+# expire_on_commit=False: tras un commit los objetos se pueden serializar sin
+# volver a la base (en modo async no hay carga perezosa implícita).
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # Una clase Base de la cual heredarán todos tus modelos de base de datos
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
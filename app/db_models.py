@@ -1,6 +1,6 @@
 # backend/app/db_models.py
 
-from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, TIMESTAMP, Boolean, Float, Date, DECIMAL, func, DateTime
+from sqlalchemy import Column, Integer, String, Text, Enum, ForeignKey, TIMESTAMP, Boolean, Float, Date, DECIMAL, func, DateTime, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -108,6 +108,16 @@ class Course(Base):
     def enrolled_students(self):
         return [enrollment.user for enrollment in self.enrollments]
 
+class CourseSummary(Base):
+    """Resumen del curso generado por la IA, persistido para no regenerarlo en cada visita."""
+    __tablename__ = "course_summaries"
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    summary = Column(Text, nullable=False)
+    # Hash del título y la descripción con los que se generó: si cambian, el resumen se regenera
+    source_hash = Column(String(64), nullable=False)
+    generated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
 class Module(Base):
     __tablename__ = "modules"
     id = Column(Integer, primary_key=True, index=True)
@@ -139,12 +149,37 @@ class StudentProgress(Base):
     module = relationship("Module", back_populates="progress")
 
 
+class UserCourseProgress(Base):
+    """Resumen desnormalizado del progreso de un usuario en un curso (se actualiza de forma incremental)."""
+    __tablename__ = "user_course_progress"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    completed_modules = Column(Integer, nullable=False, default=0)
+    total_modules = Column(Integer, nullable=False, default=0)
+    quiz_attempts = Column(Integer, nullable=False, default=0)
+    quiz_score_sum = Column(Float, nullable=False, default=0)
+    last_activity_at = Column(DateTime, nullable=True)
+
+    @property
+    def average_quiz_score(self):
+        return self.quiz_score_sum / self.quiz_attempts if self.quiz_attempts else None
+
+
 class LearningPath(Base):
     __tablename__ = "learning_paths"
     id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     courses = relationship("LearningPathCourse", back_populates="path", cascade="all, delete-orphan")
+    suggestion = relationship("LearningPathSuggestion", uselist=False, cascade="all, delete-orphan")
+
+
+class LearningPathSuggestion(Base):
+    """Cursos que la IA sugiere para completar una ruta; se recalculan cuando cambian sus cursos."""
+    __tablename__ = "learning_path_suggestions"
+    path_id = Column(Integer, ForeignKey("learning_paths.id", ondelete="CASCADE"), primary_key=True)
+    suggested_titles = Column(JSON, nullable=False)
+    generated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 # --- Modelos de Quiz ---
@@ -262,6 +297,11 @@ class CourseSuggestion(Base):
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
     merged_from = Column(Text, nullable=True)
 
+    # Índice FULLTEXT para la búsqueda (MATCH ... AGAINST) de suggestion_repo.search_suggestions
+    __table_args__ = (
+        Index('ft_course_suggestions_topic', 'topic', mysql_prefix='FULLTEXT'),
+    )
+
     # Optional: Link to the user who suggested it
     # user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     # user = relationship("User")
@@ -278,6 +318,33 @@ class Rating(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    # Un voto por usuario y curso/módulo; permiten el upsert atómico de rating_repo
+    # (MySQL no compara los NULL, así que un voto de módulo no choca con uno de curso).
+    # En una base existente, después de borrar los votos duplicados:
+    #   ALTER TABLE ratings
+    #     ADD CONSTRAINT uq_ratings_user_course UNIQUE (user_id, course_id),
+    #     ADD CONSTRAINT uq_ratings_user_module UNIQUE (user_id, module_id);
+    __table_args__ = (
+        UniqueConstraint('user_id', 'course_id', name='uq_ratings_user_course'),
+        UniqueConstraint('user_id', 'module_id', name='uq_ratings_user_module'),
+    )
+
     user = relationship("User")
     course = relationship("Course")
-    module = relationship("Module")
\ No newline at end of file
+    module = relationship("Module")
+
+class GenerationJob(Base):
+    """Trabajo en segundo plano de generación con IA (currícula, contenido, quizzes, audio)."""
+    __tablename__ = "generation_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(Enum('course', 'module_content', 'module_audio', name='generation_job_type_enum'), nullable=False)
+    status = Column(Enum('pending', 'running', 'completed', 'failed', name='generation_job_status_enum'), nullable=False, default='pending')
+    stage = Column(String(50), nullable=True)
+    progress = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=True)
+    module_id = Column(Integer, ForeignKey("modules.id", ondelete="CASCADE"), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime, nullable=True)
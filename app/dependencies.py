@@ -1,9 +1,9 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends
 
-from app.database import SessionLocal
+from app.database import SessionLocal, AsyncSessionLocal
 from app.services.course_service import CourseService
-from app.services.module_service import ModuleService
 
 # 1. Se define PRIMERO la dependencia de base de datos, ya que las otras la usan.
 def get_db():
@@ -16,11 +16,15 @@ def get_db():
     finally:
         db.close()
 
-# 2. Ahora se definen las dependencias de los servicios, que usan get_db.
-def get_course_service(db: Session = Depends(get_db)) -> CourseService:
-    """Dependencia para obtener el servicio de cursos."""
-    return CourseService(db)
+async def get_async_db():
+    """
+    Dependencia de FastAPI que entrega una AsyncSession por petición,
+    para los handlers `async def` que no deben bloquear el event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
 
-def get_module_service(db: Session = Depends(get_db)) -> ModuleService:
-    """Dependencia para obtener el servicio de módulos."""
-    return ModuleService(db)
\ No newline at end of file
+# 2. Ahora se definen las dependencias de los servicios, que usan la sesión asíncrona.
+def get_course_service(db: AsyncSession = Depends(get_async_db)) -> CourseService:
+    """Dependencia para obtener el servicio de cursos."""
+    return CourseService(db)
\ No newline at end of file
@@ -1,29 +1,79 @@
 # backend/app/logic/course_logic.py
 
+import hashlib
 from sqlalchemy.orm import Session
-from app.repositories import quiz_repo
+from app.repositories import quiz_repo, progress_repo
+
+def get_total_stars(level: str) -> int:
+    """Regla 1: Estrellas totales según el nivel del curso."""
+    level_map = {"basico": 3, "intermedio": 5, "avanzado": 7}
+    return level_map.get(level, 3)
+
+def get_earned_stars(total_stars: int, avg_score) -> int:
+    """Regla 2: Estrellas ganadas según el puntaje promedio de los quizzes."""
+    if avg_score is None:
+        return 0
+    if avg_score < 50: # Desaprobado
+        return 0
+    elif avg_score < 75: # Calificación baja
+        return round(total_stars * 0.33)
+    elif avg_score < 95: # Calificación media
+        return round(total_stars * 0.66)
+    else: # Calificación perfecta
+        return total_stars
+
+def calculate_completion_percentage(completed_modules: int, total_modules: int) -> int:
+    """Porcentaje de módulos completados, redondeado."""
+    return round((completed_modules / total_modules) * 100) if total_modules > 0 else 0
 
 def calculate_star_rating(db: Session, course, user_id: int):
     """Calcula las estrellas totales y ganadas para un curso y un usuario."""
-    # Regla 1: Estrellas totales según el nivel
-    level_map = {"basico": 3, "intermedio": 5, "avanzado": 7}
-    total_stars = level_map.get(course.level, 3)
+    total_stars = get_total_stars(course.level)
 
-    # Regla 2: Estrellas ganadas según el progreso
     earned_stars = 0
     is_enrolled = any(enrollment.user_id == user_id for enrollment in course.enrollments)
 
     if is_enrolled:
         avg_score = quiz_repo.get_average_quiz_score(db, user_id, course.id)
+        earned_stars = get_earned_stars(total_stars, avg_score)
+
+    return total_stars, earned_stars
+
+def calculate_courses_progress(db: Session, courses: list, user_id: int, enrolled_course_ids=None) -> dict:
+    """
+    Calcula progreso y estrellas de un usuario para una lista de cursos con
+    consultas agrupadas, en lugar de dos o más consultas por curso.
+
+    Las estrellas ganadas solo se otorgan en los cursos en los que el usuario
+    está inscrito; si no se pasa `enrolled_course_ids` se asume que lo está en todos.
+
+    Devuelve {course_id: {"total_modules", "completed_modules", "average_score",
+    "completion_percentage", "total_stars", "earned_stars"}}.
+    """
+    course_ids = [course.id for course in courses]
+    summary = progress_repo.get_progress_summary_for_courses(db, user_id, course_ids)
+    if enrolled_course_ids is None:
+        enrolled_course_ids = set(course_ids)
+
+    progress = {}
+    for course in courses:
+        course_summary = summary.get(course.id, {"total_modules": 0, "completed_modules": 0, "average_score": None})
+        total_stars = get_total_stars(course.level)
+        earned_stars = 0
+        if course.id in enrolled_course_ids:
+            earned_stars = get_earned_stars(total_stars, course_summary["average_score"])
+
+        progress[course.id] = {
+            **course_summary,
+            "completion_percentage": calculate_completion_percentage(
+                course_summary["completed_modules"], course_summary["total_modules"]
+            ),
+            "total_stars": total_stars,
+            "earned_stars": earned_stars
+        }
+    return progress
+
 
-        if avg_score is not None:
-            if avg_score < 50: # Desaprobado
-                earned_stars = 0
-            elif avg_score < 75: # Calificación baja
-                earned_stars = round(total_stars * 0.33)
-            elif avg_score < 95: # Calificación media
-                earned_stars = round(total_stars * 0.66)
-            else: # Calificación perfecta
-                earned_stars = total_stars
-
-    return total_stars, earned_stars
\ No newline at end of file
+def summary_source_hash(title: str, description) -> str:
+    """Huella del título y la descripción a partir de los cuales se generó el resumen."""
+    return hashlib.sha256(f"{title}\x00{description or ''}".encode("utf-8")).hexdigest()
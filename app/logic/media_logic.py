@@ -0,0 +1,42 @@
+# backend/app/logic/media_logic.py
+
+from typing import Optional, Tuple
+
+
+class RangeNotSatisfiable(Exception):
+    """La cabecera Range no se puede cumplir para el tamaño del recurso (HTTP 416)."""
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interpreta una cabecera Range de un único rango ("bytes=0-499", "bytes=500-",
+    "bytes=-500") y devuelve (inicio, fin) inclusive, o None si hay que responder el
+    recurso completo (sin cabecera, unidad desconocida, varios rangos o mal formada).
+    Lanza RangeNotSatisfiable si el rango queda fuera del recurso.
+    """
+    if not range_header:
+        return None
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    start_text, dash, end_text = ranges.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if not start_text:
+            # Sufijo: los últimos N bytes
+            suffix_length = int(end_text)
+            if suffix_length <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(size - suffix_length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if end < start:
+        return None
+    return start, min(end, size - 1)
@@ -0,0 +1,70 @@
+# backend/app/logic/quiz_logic.py
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+PASSING_SCORE = 55
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """
+    Clave de respuestas compilada de un módulo: IDs de pregunta ordenados y, en la
+    misma posición, el ID de su opción correcta. Incluye el curso y su nivel para
+    calcular las estrellas sin volver a consultar el módulo ni el curso.
+    """
+    module_id: int
+    course_id: int
+    course_level: str
+    question_ids: np.ndarray
+    correct_option_ids: np.ndarray
+
+    @property
+    def total_questions(self) -> int:
+        return len(self.question_ids)
+
+    def correct_option_for(self, question_id: int) -> Optional[int]:
+        position = np.searchsorted(self.question_ids, question_id)
+        if position < len(self.question_ids) and self.question_ids[position] == question_id:
+            return int(self.correct_option_ids[position])
+        return None
+
+
+def compile_answer_key(module_id: int, course_id: int, course_level: str, correct_options) -> AnswerKey:
+    """Compila la clave a partir de pares (question_id, correct_option_id)."""
+    pairs = sorted(correct_options)
+    return AnswerKey(
+        module_id=module_id,
+        course_id=course_id,
+        course_level=course_level,
+        question_ids=np.array([question_id for question_id, _ in pairs], dtype=np.int64),
+        correct_option_ids=np.array([option_id for _, option_id in pairs], dtype=np.int64),
+    )
+
+
+def grade_submission(answer_key: AnswerKey, answers: Dict[int, int]) -> dict:
+    """Corrige las respuestas {question_id: option_id} de un alumno contra la clave."""
+    score_count = 0
+    detailed_results = []
+    for q_id, user_opt_id in answers.items():
+        correct_opt_id = answer_key.correct_option_for(int(q_id))
+        is_correct = (int(user_opt_id) == correct_opt_id)
+        if is_correct:
+            score_count += 1
+        detailed_results.append({
+            "question_id": int(q_id), "user_option_id": int(user_opt_id),
+            "correct_option_id": correct_opt_id, "is_correct": is_correct
+        })
+
+    total_questions = answer_key.total_questions
+    final_score = round((score_count / total_questions) * 100) if total_questions > 0 else 0
+    return {
+        "score": final_score,
+        "passed": final_score >= PASSING_SCORE,
+        "total_questions": total_questions,
+        "correct_count": score_count,
+        "incorrect_count": total_questions - score_count,
+        "detailed_results": detailed_results,
+    }
@@ -0,0 +1,21 @@
+# backend/app/models/generation_job.py
+
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class GenerationJob(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    stage: Optional[str] = None
+    progress: int
+    error: Optional[str] = None
+    course_id: Optional[int] = None
+    module_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
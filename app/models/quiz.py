@@ -1,7 +1,7 @@
 # backend/app/models/quiz.py
 
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 # --- Schemas para OBTENER un quiz ---
 class OptionSchema(BaseModel):
@@ -28,7 +28,7 @@ class QuizSubmission(BaseModel):
 class AnswerResult(BaseModel):
     question_id: int
     user_option_id: int
-    correct_option_id: int
+    correct_option_id: Optional[int] = None # None si la pregunta no pertenece al quiz
     is_correct: bool
 
 class QuizResultDetailed(BaseModel): # <-- El modelo que faltaba
@@ -38,6 +38,20 @@ class QuizResultDetailed(BaseModel): # <-- El modelo que faltaba
     correct_count: int
     incorrect_count: int
     detailed_results: List[AnswerResult]
+    motivational_phrase: Optional[str] = None
+    course_total_stars: int = 0
+    course_earned_stars: int = 0
+
+# --- Corrección en lote (exámenes supervisados) ---
+class BulkSubmissionItem(BaseModel):
+    user_id: int
+    answers: Dict[int, int] # { question_id: option_id }
+
+class QuizBulkSubmission(BaseModel):
+    submissions: List[BulkSubmissionItem]
+
+class BulkQuizResult(QuizResultDetailed):
+    user_id: int
 
 class QuizStatus(BaseModel):
     can_attempt: bool
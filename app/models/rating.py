@@ -23,4 +23,8 @@ class RatingResponse(RatingBase):
 class RatingCounts(BaseModel):
     upvotes: int
     downvotes: int
-    user_rating: Optional[bool] = None # True for upvote, False for downvote, None if not rated
\ No newline at end of file
+    user_rating: Optional[bool] = None # True for upvote, False for downvote, None if not rated
+class CourseRatingCounts(BaseModel):
+    course_id: int
+    upvotes: int
+    downvotes: int
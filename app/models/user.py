@@ -41,6 +41,19 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     username: Optional[str] = None
 
+
+# --- Usuario autenticado (versión compacta que se guarda en caché) ---
+class CurrentUserRole(BaseModel):
+    name: str
+    model_config = {"frozen": True}
+
+class CurrentUser(BaseModel):
+    id: int
+    username: str
+    role: CurrentUserRole
+    is_active: bool
+    model_config = {"frozen": True}
+
 # --- Perfil ---
 class UserProfileBase(BaseModel):
     first_name: Optional[str] = None
@@ -0,0 +1,145 @@
+# backend/app/repositories/async_course_repo.py
+# Versiones asíncronas (AsyncSession) de las consultas más usadas de course_repo.
+
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from app import db_models
+from app.models import course as course_schemas
+from app.repositories import course_repo
+
+# En modo async no hay carga perezosa: se carga todo lo que serializa el schema Course
+# (la categoría y sus cursos) y los módulos del curso.
+_COURSE_OPTIONS = (
+    joinedload(db_models.Course.category).selectinload(db_models.Category.courses),
+)
+
+async def get_all_courses(db: AsyncSession):
+    """Obtiene todos los cursos, cargando su categoría."""
+    result = await db.execute(select(db_models.Course).options(*_COURSE_OPTIONS))
+    return result.unique().scalars().all()
+
+async def get_published_courses(db: AsyncSession):
+    """Obtiene todos los cursos con estado 'published'."""
+    result = await db.execute(
+        select(db_models.Course).filter(
+            db_models.Course.status == 'published'
+        ).options(*_COURSE_OPTIONS)
+    )
+    return result.unique().scalars().all()
+
+async def get_course_by_id(db: AsyncSession, course_id: int):
+    """Obtiene un curso por ID, cargando su categoría y sus módulos."""
+    result = await db.execute(
+        select(db_models.Course).filter(
+            db_models.Course.id == course_id
+        ).options(
+            *_COURSE_OPTIONS,
+            selectinload(db_models.Course.modules)
+        )
+    )
+    return result.unique().scalars().first()
+
+async def get_courses_by_instructor_id(db: AsyncSession, instructor_id: int):
+    """Obtiene los cursos de un instructor específico."""
+    result = await db.execute(
+        select(db_models.Course).filter(
+            db_models.Course.instructor_id == instructor_id
+        ).options(*_COURSE_OPTIONS)
+    )
+    return result.unique().scalars().all()
+
+async def get_courses_created_by_user(db: AsyncSession, user_id: int):
+    """Obtiene los cursos creados por un usuario (estudiante)."""
+    result = await db.execute(
+        select(db_models.Course).filter(
+            db_models.Course.creator_id == user_id
+        ).options(*_COURSE_OPTIONS)
+    )
+    return result.unique().scalars().all()
+
+async def count_courses_by_instructor(db: AsyncSession, instructor_id: int) -> int:
+    """Cuenta la cantidad de cursos creados por un instructor."""
+    result = await db.execute(
+        select(func.count(db_models.Course.id)).filter(db_models.Course.instructor_id == instructor_id)
+    )
+    return result.scalar_one()
+
+async def create_instructor_course(db: AsyncSession, course: course_schemas.CourseCreate, instructor_id: int):
+    """Crea un curso de instructor (reutiliza la lógica de precios de course_repo)."""
+    db_course = await db.run_sync(course_repo.create_instructor_course, course, instructor_id)
+    return await get_course_by_id(db, db_course.id)
+
+async def add_modules_to_course(db: AsyncSession, course_id: int, modules: list):
+    """Añade una lista de módulos a un curso (y actualiza los resúmenes de progreso)."""
+    await db.run_sync(course_repo.add_modules_to_course, course_id, modules)
+    # Las colecciones ya cargadas (course.modules) quedaron desactualizadas
+    db.expire_all()
+
+async def update_course(db: AsyncSession, course_id: int, course_update: course_schemas.CourseCreate, user_id: int):
+    """Actualiza un curso, verificando que el usuario sea el propietario."""
+    result = await db.execute(
+        select(db_models.Course).filter(
+            db_models.Course.id == course_id,
+            db_models.Course.instructor_id == user_id
+        )
+    )
+    db_course = result.scalars().first()
+
+    if db_course:
+        db_course.title = course_update.title
+        db_course.description = course_update.description
+        db_course.category_id = course_update.category_id
+        db_course.level = course_update.level
+        await db.commit()
+        db.expire(db_course)
+        db_course = await get_course_by_id(db, course_id)
+    return db_course
+
+async def delete_course(db: AsyncSession, course_id: int, user_id: int) -> bool:
+    """Elimina un curso, verificando que el usuario sea el propietario."""
+    result = await db.execute(
+        select(db_models.Course).filter(
+            db_models.Course.id == course_id,
+            db_models.Course.instructor_id == user_id
+        )
+    )
+    db_course = result.scalars().first()
+
+    if db_course:
+        await db.delete(db_course)
+        await db.commit()
+        return True
+    return False
+
+
+async def get_course_with_summary(db: AsyncSession, course_id: int):
+    """
+    Devuelve (title, description, CourseSummary | None) de un curso en una sola consulta,
+    o None si el curso no existe. No carga relaciones del curso.
+    """
+    result = await db.execute(
+        select(
+            db_models.Course.title, db_models.Course.description, db_models.CourseSummary
+        ).outerjoin(
+            db_models.CourseSummary, db_models.CourseSummary.course_id == db_models.Course.id
+        ).filter(db_models.Course.id == course_id)
+    )
+    return result.first()
+
+async def save_course_summary(db: AsyncSession, course_id: int, summary: str, source_hash: str):
+    """Crea o reemplaza el resumen persistido de un curso."""
+    db_summary = await db.get(db_models.CourseSummary, course_id)
+    if db_summary is None:
+        db_summary = db_models.CourseSummary(course_id=course_id)
+        db.add(db_summary)
+    db_summary.summary = summary
+    db_summary.source_hash = source_hash
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Otra petición lo insertó en paralelo: gana la versión ya guardada
+        await db.rollback()
+        db_summary = await db.get(db_models.CourseSummary, course_id, populate_existing=True)
+    return db_summary
@@ -0,0 +1,36 @@
+# backend/app/repositories/async_enrollment_repo.py
+# Versiones asíncronas (AsyncSession) de enrollment_repo.
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from app import db_models
+
+
+async def create_enrollment(db: AsyncSession, user_id: int, course_id: int):
+    """Crea una nueva inscripción si no existe."""
+    if not await is_enrolled(db, user_id=user_id, course_id=course_id):
+        db.add(db_models.CourseEnrollment(user_id=user_id, course_id=course_id))
+        await db.commit()
+
+
+async def get_enrolled_courses(db: AsyncSession, user_id: int):
+    """Obtiene los cursos en los que un usuario está inscrito."""
+    result = await db.execute(
+        select(db_models.Course).join(
+            db_models.CourseEnrollment, db_models.CourseEnrollment.course_id == db_models.Course.id
+        ).filter(
+            db_models.CourseEnrollment.user_id == user_id
+        ).options(
+            joinedload(db_models.Course.category).selectinload(db_models.Category.courses)
+        )
+    )
+    return result.unique().scalars().all()
+
+
+async def is_enrolled(db: AsyncSession, user_id: int, course_id: int) -> bool:
+    """Verifica si una inscripción específica existe."""
+    result = await db.execute(
+        select(db_models.CourseEnrollment.user_id).filter_by(user_id=user_id, course_id=course_id)
+    )
+    return result.first() is not None
@@ -0,0 +1,57 @@
+# backend/app/repositories/async_progress_repo.py
+# Versiones asíncronas (AsyncSession) de progress_repo.
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import db_models
+from app.repositories import progress_repo
+
+
+async def mark_module_as_completed(db: AsyncSession, user_id: int, module_id: int):
+    """
+    Marca un módulo como completado. Reutiliza la versión síncrona vía run_sync para
+    mantener en un solo lugar la actualización del resumen user_course_progress.
+    """
+    return await db.run_sync(progress_repo.mark_module_as_completed, user_id, module_id)
+
+
+async def get_progress_for_course(db: AsyncSession, user_id: int, course_id: int):
+    """Obtiene todos los registros de progreso de un usuario para un curso específico."""
+    result = await db.execute(
+        select(db_models.StudentProgress).join(db_models.Module).filter(
+            db_models.StudentProgress.user_id == user_id,
+            db_models.Module.course_id == course_id
+        )
+    )
+    return result.scalars().all()
+
+
+async def get_completed_modules_count(db: AsyncSession, user_id: int, course_id: int) -> int:
+    """Cuenta cuántos módulos de un curso ha completado un usuario (desde el resumen materializado)."""
+    result = await db.execute(
+        select(db_models.UserCourseProgress.completed_modules).filter_by(
+            user_id=user_id, course_id=course_id
+        )
+    )
+    return result.scalar() or 0
+
+
+async def get_progress_summary_for_courses(db: AsyncSession, user_id: int, course_ids: list) -> dict:
+    """Lee el resumen materializado del progreso de un usuario en varios cursos."""
+    if not course_ids:
+        return {}
+
+    result = await db.execute(
+        select(db_models.UserCourseProgress).filter(
+            db_models.UserCourseProgress.user_id == user_id,
+            db_models.UserCourseProgress.course_id.in_(course_ids)
+        )
+    )
+    return {
+        summary.course_id: {
+            "total_modules": summary.total_modules,
+            "completed_modules": summary.completed_modules,
+            "average_score": summary.average_quiz_score
+        }
+        for summary in result.scalars().all()
+    }
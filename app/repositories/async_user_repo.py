@@ -0,0 +1,45 @@
+# backend/app/repositories/async_user_repo.py
+# Versiones asíncronas (AsyncSession) de user_repo.
+
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app import db_models
+
+# Todo lo que serializa el schema User (rol y perfil) se carga de antemano
+_USER_OPTIONS = (
+    selectinload(db_models.User.role),
+    selectinload(db_models.User.profile),
+)
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int):
+    """Obtiene un usuario por su ID, incluyendo su rol y perfil."""
+    result = await db.execute(
+        select(db_models.User).options(*_USER_OPTIONS).filter(db_models.User.id == user_id)
+    )
+    return result.scalars().first()
+
+
+async def get_user_by_username(db: AsyncSession, username: str):
+    """Obtiene un usuario por su nombre de usuario, incluyendo su rol y perfil."""
+    result = await db.execute(
+        select(db_models.User).options(*_USER_OPTIONS).filter(db_models.User.username == username)
+    )
+    return result.scalars().first()
+
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    """Busca un usuario por su dirección de email."""
+    result = await db.execute(select(db_models.User).filter(db_models.User.email == email))
+    return result.scalars().first()
+
+
+async def update_user_last_login(db: AsyncSession, user_id: int):
+    """Actualiza la fecha del último inicio de sesión de un usuario en UTC-3."""
+    utc_minus_3 = timezone(timedelta(hours=-3))
+    await db.execute(
+        update(db_models.User).where(db_models.User.id == user_id).values(last_login=datetime.now(utc_minus_3))
+    )
+    await db.commit()
@@ -3,6 +3,7 @@
 from sqlalchemy.orm import Session, joinedload
 from app import db_models
 from app.models import course as course_schemas
+from app.repositories import progress_repo
 
 def get_all_courses(db: Session):
     """Obtiene todos los cursos, cargando su categoría."""
@@ -107,8 +108,33 @@ def add_modules_to_course(db: Session, course_id: int, modules: list):
             diagram_mermaid_syntax=module_data.get('diagram_mermaid_syntax')
         )
         db.add(db_module)
+    db.flush()
+    progress_repo.refresh_course_total_modules(db, course_id)
     db.commit()
 
+def course_has_modules(db: Session, course_id: int) -> bool:
+    """Indica si el curso ya tiene al menos un módulo."""
+    return db.query(
+        db.query(db_models.Module.id).filter(db_models.Module.course_id == course_id).exists()
+    ).scalar()
+
+def add_modules_to_empty_course(db: Session, course_id: int, modules: list) -> bool:
+    """
+    Añade los módulos solo si el curso todavía no tiene ninguno y devuelve si los
+    añadió. La fila del curso se bloquea (SELECT ... FOR UPDATE) hasta el commit,
+    así dos generaciones simultáneas del mismo curso no duplican la currícula.
+    """
+    db.query(db_models.Course.id).filter(db_models.Course.id == course_id).with_for_update().first()
+    # Lectura con bloqueo: ve lo último confirmado, no la instantánea de la transacción
+    existing_module = db.query(db_models.Module.id).filter(
+        db_models.Module.course_id == course_id
+    ).limit(1).with_for_update().first()
+    if existing_module is not None:
+        db.rollback()
+        return False
+    add_modules_to_course(db, course_id, modules)
+    return True
+
 def update_course(db: Session, course_id: int, course_update: course_schemas.CourseCreate, user_id: int):
     """Actualiza un curso, verificando que el usuario sea el propietario."""
     db_course = db.query(db_models.Course).filter(
@@ -125,6 +151,28 @@ def update_course(db: Session, course_id: int, course_update: course_schemas.Cou
         db.refresh(db_course)
     return db_course
 
+def get_course_with_summary(db: Session, course_id: int):
+    """
+    Devuelve (title, description, CourseSummary | None) de un curso en una sola consulta,
+    o None si el curso no existe (versión síncrona de la de async_course_repo, para el worker).
+    """
+    return db.query(
+        db_models.Course.title, db_models.Course.description, db_models.CourseSummary
+    ).outerjoin(
+        db_models.CourseSummary, db_models.CourseSummary.course_id == db_models.Course.id
+    ).filter(db_models.Course.id == course_id).first()
+
+def save_course_summary(db: Session, course_id: int, summary: str, source_hash: str):
+    """Crea o reemplaza el resumen persistido de un curso."""
+    db_summary = db.get(db_models.CourseSummary, course_id)
+    if db_summary is None:
+        db_summary = db_models.CourseSummary(course_id=course_id)
+        db.add(db_summary)
+    db_summary.summary = summary
+    db_summary.source_hash = source_hash
+    db.commit()
+    return db_summary
+
 def delete_course(db: Session, course_id: int, user_id: int) -> bool:
     """Elimina un curso, verificando que el usuario sea el propietario."""
     db_course = db.query(db_models.Course).filter(
@@ -18,10 +18,29 @@ def create_enrollment(db: Session, user_id: int, course_id: int):
 def get_enrolled_courses(db: Session, user_id: int):
     """Obtiene los cursos en los que un usuario está inscrito."""
     user = db.query(db_models.User).options(
-        joinedload(db_models.User.enrollments).joinedload(db_models.CourseEnrollment.course)
+        joinedload(db_models.User.enrollments)
+        .joinedload(db_models.CourseEnrollment.course)
+        .joinedload(db_models.Course.category)
     ).filter(db_models.User.id == user_id).first()
     return [enrollment.course for enrollment in user.enrollments] if user else []
 
+def get_enrolled_course_ids(db: Session, user_id: int) -> set:
+    """Obtiene los IDs de los cursos en los que un usuario está inscrito."""
+    rows = db.query(db_models.CourseEnrollment.course_id).filter(
+        db_models.CourseEnrollment.user_id == user_id
+    ).all()
+    return {course_id for (course_id,) in rows}
+
+def get_enrolled_user_ids(db: Session, course_id: int, user_ids: list) -> set:
+    """De los usuarios indicados, devuelve los IDs de los inscritos en el curso."""
+    if not user_ids:
+        return set()
+    rows = db.query(db_models.CourseEnrollment.user_id).filter(
+        db_models.CourseEnrollment.course_id == course_id,
+        db_models.CourseEnrollment.user_id.in_(user_ids)
+    ).all()
+    return {user_id for (user_id,) in rows}
+
 def is_enrolled(db: Session, user_id: int, course_id: int) -> bool:
     """Verifica si una inscripción específica existe."""
     return db.query(db_models.CourseEnrollment).filter_by(
@@ -1,4 +1,6 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from typing import List
 from app import db_models
 
 def create_event_invitation(db: Session, event_id: int, user_id: int, status: str = "pending"):
@@ -8,6 +10,18 @@ def create_event_invitation(db: Session, event_id: int, user_id: int, status: st
     db.refresh(db_invitation)
     return db_invitation
 
+def add_event_invitations(db: Session, event_id: int, user_ids: List[int], status: str = "pending"):
+    """
+    Inserta las invitaciones de varios usuarios a un evento en un único INSERT de
+    varias filas. No hace commit: forma parte de la transacción de quien la llama.
+    """
+    if not user_ids:
+        return
+    db.execute(
+        insert(db_models.EventInvitation),
+        [{"event_id": event_id, "user_id": user_id, "status": status} for user_id in user_ids]
+    )
+
 def get_event_invitation(db: Session, invitation_id: int):
     return db.query(db_models.EventInvitation).filter(db_models.EventInvitation.id == invitation_id).first()
 
@@ -0,0 +1,86 @@
+# backend/app/repositories/generation_job_repo.py
+
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from app import db_models
+
+
+def create_job(db: Session, job_type: str, created_by: int, course_id: Optional[int] = None, module_id: Optional[int] = None):
+    """Registra un trabajo de generación en estado 'pending'."""
+    job = db_models.GenerationJob(
+        job_type=job_type,
+        created_by=created_by,
+        course_id=course_id,
+        module_id=module_id,
+        status='pending',
+        progress=0
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+def get_job_by_id(db: Session, job_id: int):
+    """Obtiene un trabajo de generación por su ID."""
+    return db.query(db_models.GenerationJob).filter(db_models.GenerationJob.id == job_id).first()
+
+def get_active_job(db: Session, job_type: str, module_id: int, max_age: timedelta = timedelta(minutes=30)):
+    """
+    Trabajo 'pending' o 'running' del mismo tipo y módulo, para unirse a él en lugar
+    de encolar otro igual. Los que no avanzan hace más de `max_age` se consideran
+    abandonados (p. ej. un worker caído) y se ignoran.
+    """
+    return db.query(db_models.GenerationJob).filter(
+        db_models.GenerationJob.job_type == job_type,
+        db_models.GenerationJob.module_id == module_id,
+        db_models.GenerationJob.status.in_(['pending', 'running']),
+        db_models.GenerationJob.updated_at >= datetime.now() - max_age
+    ).order_by(db_models.GenerationJob.id.desc()).first()
+
+def get_or_create_module_job(db: Session, job_type: str, created_by: int, course_id: int, module_id: int):
+    """
+    Devuelve (trabajo, creado): el trabajo activo del mismo tipo y módulo o uno nuevo.
+    La fila del módulo se bloquea (SELECT ... FOR UPDATE) hasta el commit, así dos
+    pedidos simultáneos no crean cada uno su trabajo entre la consulta y el INSERT.
+    En SQLite el bloqueo no existe y la consulta seguida del INSERT puede duplicarlo.
+    """
+    db.query(db_models.Module.id).filter(db_models.Module.id == module_id).with_for_update().first()
+    job = get_active_job(db, job_type, module_id=module_id)
+    if job is not None:
+        db.commit()
+        return job, False
+    return create_job(db, job_type, created_by=created_by, course_id=course_id, module_id=module_id), True
+
+def has_previous_completed_job(db: Session, job: db_models.GenerationJob) -> bool:
+    """Indica si otro trabajo del mismo tipo y curso ya terminó antes que este."""
+    return db.query(
+        db.query(db_models.GenerationJob.id).filter(
+            db_models.GenerationJob.job_type == job.job_type,
+            db_models.GenerationJob.course_id == job.course_id,
+            db_models.GenerationJob.status == 'completed',
+            db_models.GenerationJob.id != job.id
+        ).exists()
+    ).scalar()
+
+def update_job_stage(db: Session, job: db_models.GenerationJob, stage: str, progress: int):
+    """Marca el trabajo como 'running' en la etapa indicada."""
+    job.status = 'running'
+    job.stage = stage
+    job.progress = progress
+    job.error = None
+    db.commit()
+
+def complete_job(db: Session, job: db_models.GenerationJob):
+    """Marca el trabajo como terminado; `stage` queda en la última etapa ejecutada."""
+    job.status = 'completed'
+    job.progress = 100
+    job.finished_at = datetime.now()
+    db.commit()
+
+def fail_job(db: Session, job: db_models.GenerationJob, error: str):
+    """Marca el trabajo como fallido conservando la etapa en la que se detuvo."""
+    job.status = 'failed'
+    job.error = error
+    job.finished_at = datetime.now()
+    db.commit()
@@ -1,6 +1,8 @@
 # backend/app/repositories/learning_path_repo.py
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app import db_models
 from app.models.learning_path import LearningPathCreate
 
@@ -8,10 +10,13 @@ def get_learning_paths(db: Session):
     return db.query(db_models.LearningPath).all()
 
 def get_learning_path_by_id(db: Session, path_id: int):
+    """Carga la ruta con sus cursos, las categorías que serializa el schema y las sugerencias guardadas."""
     return db.query(db_models.LearningPath).options(
         joinedload(db_models.LearningPath.courses)
         .joinedload(db_models.LearningPathCourse.course)
         .joinedload(db_models.Course.category)
+        .selectinload(db_models.Category.courses),
+        joinedload(db_models.LearningPath.suggestion)
     ).filter(db_models.LearningPath.id == path_id).first()
 
 def create_learning_path(db: Session, path: LearningPathCreate):
@@ -34,4 +39,33 @@ def add_course_to_path(db: Session, path_id: int, course_id: int, step: int):
     db.add(db_assoc)
     db.commit()
     db.refresh(db_assoc)
-    return db_assoc
\ No newline at end of file
+    return db_assoc
+
+def save_path_suggestions(db: Session, path_id: int, suggested_titles: list):
+    """Crea o reemplaza los cursos sugeridos por la IA para una ruta."""
+    db_suggestion = db.get(db_models.LearningPathSuggestion, path_id)
+    if db_suggestion is None:
+        db_suggestion = db_models.LearningPathSuggestion(path_id=path_id)
+        db.add(db_suggestion)
+    db_suggestion.suggested_titles = suggested_titles
+    db.commit()
+    return db_suggestion
+
+def mark_path_suggestions_requested(db: Session, path_id: int) -> bool:
+    """
+    Registra que se pidieron las sugerencias de una ruta que todavía no las tiene
+    (fila sin títulos y con generated_at NULL) y devuelve si esta llamada la creó.
+    Así el recálculo se encola una sola vez, aunque la IA no devuelva nada o
+    lleguen varias visitas a la vez.
+    """
+    try:
+        # INSERT explícito: con el ORM un generated_at None tomaría el default now()
+        db.execute(insert(db_models.LearningPathSuggestion).values(
+            path_id=path_id, suggested_titles=[], generated_at=None
+        ))
+        db.commit()
+    except IntegrityError:
+        # Otra petición la registró primero
+        db.rollback()
+        return False
+    return True
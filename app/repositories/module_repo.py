@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app import db_models
+from app.core.pdf_cache import invalidate_module_pdfs
 
 def get_module_by_id(db: Session, module_id: int):
     """
@@ -31,6 +32,8 @@ def update_module_content(db: Session, module_id: int, content: str):
         db_module.content_data = content
         db.commit()
         db.refresh(db_module)
+        # Los PDFs cacheados del contenido anterior ya no se servirán
+        invalidate_module_pdfs(module_id)
     return db_module
 
 def update_module_audio(db: Session, module_id: int, audio_path: str):
@@ -40,7 +43,7 @@ def update_module_audio(db: Session, module_id: int, audio_path: str):
     Args:
         db (Session): La sesión de la base de datos.
         module_id (int): El ID del módulo a actualizar.
-        audio_path (str): La ruta al archivo de audio generado.
+        audio_path (str): La URL del audio generado (ver audio_storage.module_audio_url).
 
     Returns:
         db_models.Module | None: El objeto del módulo actualizado si se encuentra, de lo contrario None.
@@ -1,6 +1,8 @@
 # backend/app/repositories/notification_repo.py
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from typing import List
 from app import db_models
 
 def create_notification(db: Session, user_id: int, message: str, link_url: str):
@@ -12,6 +14,18 @@ def create_notification(db: Session, user_id: int, message: str, link_url: str):
     db.add(db_notification)
     db.commit()
 
+def add_notifications(db: Session, user_ids: List[int], message: str, link_url: str):
+    """
+    Crea la misma notificación para varios usuarios en un único INSERT de varias
+    filas. No hace commit: forma parte de la transacción de quien la llama.
+    """
+    if not user_ids:
+        return
+    db.execute(
+        insert(db_models.Notification),
+        [{"user_id": user_id, "message": message, "link_url": link_url} for user_id in user_ids]
+    )
+
 def get_notifications_for_user(db: Session, user_id: int):
     """Obtiene las notificaciones de un usuario, las más recientes primero."""
     return db.query(db_models.Notification).filter(
@@ -1,14 +1,41 @@
 # backend/app/repositories/progress_repo.py
+from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy import func, distinct, insert
+from sqlalchemy.exc import IntegrityError
 from app import db_models
 
 
 def mark_module_as_completed(db: Session, user_id: int, module_id: int):
-    """Busca un registro de progreso y lo marca como 'completed'. Si no existe, lo crea."""
+    """
+    Busca un registro de progreso y lo marca como 'completed'. Si no existe, lo crea.
+    También suma el módulo al resumen `user_course_progress` del curso.
+    """
+    progress = set_module_completed(db, user_id, module_id)
+    db.commit()
+    return progress
+
+
+def set_module_completed(db: Session, user_id: int, module_id: int, course_id: int = None):
+    """
+    Igual que mark_module_as_completed pero sin commit, para usarla dentro de una
+    transacción más grande. Si se conoce el curso del módulo, evita consultarlo.
+    """
     progress = db.query(db_models.StudentProgress).filter_by(
         user_id=user_id, module_id=module_id
     ).first()
 
+    if not progress or progress.status != 'completed':
+        if course_id is None:
+            course_id = db.query(db_models.Module.course_id).filter(db_models.Module.id == module_id).scalar()
+        if course_id is not None:
+            # El resumen se asegura ANTES de tocar el progreso para no contar el módulo dos veces
+            ensure_course_progress_summary(db, user_id, course_id)
+            _increment_course_progress_summary(
+                db, user_id, course_id,
+                completed_modules=db_models.UserCourseProgress.completed_modules + 1
+            )
+
     if progress:
         progress.status = 'completed'
     else:
@@ -18,8 +45,6 @@ def mark_module_as_completed(db: Session, user_id: int, module_id: int):
             status='completed'
         )
         db.add(progress)
-
-    db.commit()
     return progress
 
 
@@ -31,9 +56,215 @@ def get_progress_for_course(db: Session, user_id: int, course_id: int):
     ).all()
 
 def get_completed_modules_count(db: Session, user_id: int, course_id: int) -> int:
-    """Cuenta cuántos módulos de un curso ha completado un usuario."""
-    return db.query(db_models.StudentProgress).join(db_models.Module).filter(
-        db_models.StudentProgress.user_id == user_id,
-        db_models.Module.course_id == course_id,
-        db_models.StudentProgress.status == 'completed'
-    ).count()
\ No newline at end of file
+    """Cuenta cuántos módulos de un curso ha completado un usuario (desde el resumen materializado)."""
+    completed = db.query(db_models.UserCourseProgress.completed_modules).filter_by(
+        user_id=user_id, course_id=course_id
+    ).scalar()
+    return completed or 0
+
+def get_progress_summary_for_courses(db: Session, user_id: int, course_ids: list) -> dict:
+    """
+    Lee, en una sola consulta, el resumen materializado del progreso de un usuario en varios cursos.
+
+    Devuelve un diccionario {course_id: {"total_modules", "completed_modules", "average_score"}}.
+    Los cursos sin actividad del usuario no aparecen en el resultado.
+    """
+    if not course_ids:
+        return {}
+
+    summaries = db.query(db_models.UserCourseProgress).filter(
+        db_models.UserCourseProgress.user_id == user_id,
+        db_models.UserCourseProgress.course_id.in_(course_ids)
+    ).all()
+
+    return {
+        summary.course_id: {
+            "total_modules": summary.total_modules,
+            "completed_modules": summary.completed_modules,
+            "average_score": summary.average_quiz_score
+        }
+        for summary in summaries
+    }
+
+def get_enrolled_progress_for_courses(db: Session, user_id: int, course_ids: list) -> dict:
+    """
+    En una sola consulta, devuelve {course_id: (completed_modules, total_modules)} para los
+    cursos de la lista en los que el usuario está inscrito (0, 0 si aún no tiene actividad).
+    """
+    if not course_ids:
+        return {}
+
+    rows = db.query(
+        db_models.CourseEnrollment.course_id,
+        db_models.UserCourseProgress.completed_modules,
+        db_models.UserCourseProgress.total_modules
+    ).outerjoin(
+        db_models.UserCourseProgress,
+        (db_models.UserCourseProgress.user_id == db_models.CourseEnrollment.user_id)
+        & (db_models.UserCourseProgress.course_id == db_models.CourseEnrollment.course_id)
+    ).filter(
+        db_models.CourseEnrollment.user_id == user_id,
+        db_models.CourseEnrollment.course_id.in_(course_ids)
+    ).all()
+
+    return {course_id: (completed or 0, total or 0) for course_id, completed, total in rows}
+
+
+# --- Resumen materializado (user_course_progress) ---
+
+def ensure_course_progress_summary(db: Session, user_id: int, course_id: int):
+    """
+    Crea la fila de resumen de (usuario, curso) si no existe, calculándola desde
+    los datos crudos. No hace commit: forma parte de la transacción que la llama.
+    """
+    exists = db.query(db_models.UserCourseProgress.user_id).filter_by(
+        user_id=user_id, course_id=course_id
+    ).first()
+    if exists:
+        return
+
+    # Sin autoflush: un intento o progreso pendiente en la sesión lo suma después quien
+    # llama con el UPDATE incremental; si entrara en el cálculo se contaría dos veces
+    with db.no_autoflush:
+        summary = _compute_course_progress_summaries(db, user_id=user_id, course_id=course_id).get(
+            (user_id, course_id), _empty_summary(user_id, course_id)
+        )
+        summary["total_modules"] = db.query(func.count(db_models.Module.id)).filter(
+            db_models.Module.course_id == course_id
+        ).scalar()
+
+    try:
+        with db.begin_nested():
+            db.add(db_models.UserCourseProgress(**summary))
+    except IntegrityError:
+        # Otra petición creó la fila en paralelo; la actualización incremental la usa igual
+        pass
+
+
+def record_quiz_attempt_in_summary(db: Session, user_id: int, module_id: int, score: float, course_id: int = None):
+    """Suma un intento de quiz al resumen del curso del módulo. No hace commit."""
+    if course_id is None:
+        course_id = db.query(db_models.Module.course_id).filter(db_models.Module.id == module_id).scalar()
+    if course_id is None:
+        return
+
+    ensure_course_progress_summary(db, user_id, course_id)
+    _increment_course_progress_summary(
+        db, user_id, course_id,
+        quiz_attempts=db_models.UserCourseProgress.quiz_attempts + 1,
+        quiz_score_sum=db_models.UserCourseProgress.quiz_score_sum + score
+    )
+
+
+def refresh_course_total_modules(db: Session, course_id: int):
+    """Recalcula total_modules en todos los resúmenes de un curso. No hace commit."""
+    total_modules = db.query(func.count(db_models.Module.id)).filter(
+        db_models.Module.course_id == course_id
+    ).scalar()
+    db.query(db_models.UserCourseProgress).filter(
+        db_models.UserCourseProgress.course_id == course_id
+    ).update({db_models.UserCourseProgress.total_modules: total_modules}, synchronize_session=False)
+
+
+def rebuild_course_progress_summaries(db: Session, batch_size: int = 1000) -> int:
+    """
+    Reconstruye por completo la tabla user_course_progress desde student_progress,
+    quiz_attempts y course_enrollments. Devuelve la cantidad de filas generadas.
+    """
+    totals = dict(db.query(
+        db_models.Module.course_id, func.count(db_models.Module.id)
+    ).group_by(db_models.Module.course_id).all())
+
+    summaries = _compute_course_progress_summaries(db)
+    for user_id, course_id, enrollment_date in db.query(
+        db_models.CourseEnrollment.user_id,
+        db_models.CourseEnrollment.course_id,
+        db_models.CourseEnrollment.enrollment_date
+    ).all():
+        summary = summaries.setdefault((user_id, course_id), _empty_summary(user_id, course_id))
+        summary["last_activity_at"] = _latest(summary["last_activity_at"], enrollment_date)
+
+    rows = []
+    for (user_id, course_id), summary in summaries.items():
+        summary["total_modules"] = totals.get(course_id, 0)
+        rows.append(summary)
+
+    db.query(db_models.UserCourseProgress).delete(synchronize_session=False)
+    for start in range(0, len(rows), batch_size):
+        db.execute(insert(db_models.UserCourseProgress), rows[start:start + batch_size])
+    db.commit()
+    return len(rows)
+
+
+def _increment_course_progress_summary(db: Session, user_id: int, course_id: int, **values):
+    """Aplica un UPDATE atómico (col = col + n) sobre la fila de resumen."""
+    values["last_activity_at"] = datetime.now()
+    db.query(db_models.UserCourseProgress).filter_by(
+        user_id=user_id, course_id=course_id
+    ).update(
+        {getattr(db_models.UserCourseProgress, key): value for key, value in values.items()},
+        synchronize_session=False
+    )
+
+
+def _empty_summary(user_id: int, course_id: int) -> dict:
+    return {
+        "user_id": user_id, "course_id": course_id, "completed_modules": 0,
+        "quiz_attempts": 0, "quiz_score_sum": 0.0, "last_activity_at": None
+    }
+
+
+def _latest(current, candidate):
+    if current is None:
+        return candidate
+    if candidate is None:
+        return current
+    return max(current, candidate)
+
+
+def _compute_course_progress_summaries(db: Session, user_id: int = None, course_id: int = None) -> dict:
+    """
+    Calcula desde los datos crudos los módulos completados y los intentos de quiz
+    agrupados por (user_id, course_id). Sin total_modules.
+    """
+    completed_query = db.query(
+        db_models.StudentProgress.user_id,
+        db_models.Module.course_id,
+        func.count(distinct(db_models.StudentProgress.module_id))
+    ).join(
+        db_models.Module, db_models.Module.id == db_models.StudentProgress.module_id
+    ).filter(db_models.StudentProgress.status == 'completed')
+
+    attempts_query = db.query(
+        db_models.QuizAttempt.user_id,
+        db_models.Module.course_id,
+        func.count(db_models.QuizAttempt.id),
+        func.sum(db_models.QuizAttempt.score),
+        func.max(db_models.QuizAttempt.submitted_at)
+    ).join(
+        db_models.Module, db_models.Module.id == db_models.QuizAttempt.module_id
+    )
+
+    if user_id is not None:
+        completed_query = completed_query.filter(db_models.StudentProgress.user_id == user_id)
+        attempts_query = attempts_query.filter(db_models.QuizAttempt.user_id == user_id)
+    if course_id is not None:
+        completed_query = completed_query.filter(db_models.Module.course_id == course_id)
+        attempts_query = attempts_query.filter(db_models.Module.course_id == course_id)
+
+    summaries = {}
+    for row_user_id, row_course_id, completed in completed_query.group_by(
+        db_models.StudentProgress.user_id, db_models.Module.course_id
+    ).all():
+        summary = summaries.setdefault((row_user_id, row_course_id), _empty_summary(row_user_id, row_course_id))
+        summary["completed_modules"] = completed
+
+    for row_user_id, row_course_id, attempts, score_sum, last_attempt in attempts_query.group_by(
+        db_models.QuizAttempt.user_id, db_models.Module.course_id
+    ).all():
+        summary = summaries.setdefault((row_user_id, row_course_id), _empty_summary(row_user_id, row_course_id))
+        summary["quiz_attempts"] = attempts
+        summary["quiz_score_sum"] = float(score_sum or 0)
+        summary["last_activity_at"] = last_attempt
+
+    return summaries
@@ -1,8 +1,11 @@
 # backend/app/repositories/quiz_repo.py
 
-from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 from app import db_models
+from app.core import answer_key_cache
+from app.logic import quiz_logic
+from app.repositories import progress_repo
 from typing import Optional
 
 
@@ -27,6 +30,30 @@ def create_quiz_for_module(db: Session, module_id: int, questions_data: list):
             )
             db.add(db_option)
     db.commit()
+    answer_key_cache.invalidate_answer_key(module_id)
+
+def create_quizzes_for_modules(db: Session, quizzes: dict):
+    """
+    Crea en una sola transacción los quizzes de varios módulos.
+    Recibe {module_id: questions_data}; los módulos sin preguntas se ignoran.
+    """
+    for module_id, questions_data in quizzes.items():
+        for q_data in questions_data:
+            db_question = db_models.Question(
+                module_id=module_id,
+                question_text=q_data.get('question_text', 'Sin texto'),
+                options=[
+                    db_models.Option(
+                        option_text=o_data.get('option_text', 'Sin opción'),
+                        is_correct=o_data.get('is_correct', False)
+                    )
+                    for o_data in q_data.get('options', [])
+                ]
+            )
+            db.add(db_question)
+    db.commit()
+    for module_id in quizzes:
+        answer_key_cache.invalidate_answer_key(module_id)
 
 def get_quiz_for_module(db: Session, module_id: int):
     """Obtiene todas las preguntas y sus opciones para un módulo específico."""
@@ -46,7 +73,38 @@ def get_correct_answers_for_module(db: Session, module_id: int) -> dict:
                 break
     return correct_answers
 
-def create_quiz_attempt(db: Session, user_id: int, module_id: int, score: float, passed: bool):
+def get_answer_key(db: Session, module_id: int) -> Optional[quiz_logic.AnswerKey]:
+    """
+    Devuelve la clave de respuestas compilada del módulo desde la caché en memoria.
+    Si no está, la compila con dos consultas livianas (sin cargar los textos) y, si
+    el módulo ya tiene preguntas, la guarda.
+    """
+    answer_key = answer_key_cache.get_cached_answer_key(module_id)
+    if answer_key is not None:
+        return answer_key
+
+    module_info = db.query(db_models.Module.course_id, db_models.Course.level).join(
+        db_models.Course, db_models.Course.id == db_models.Module.course_id
+    ).filter(db_models.Module.id == module_id).first()
+    if module_info is None:
+        return None
+
+    # Una opción correcta por pregunta (la de menor ID si hubiera varias)
+    correct_options = db.query(db_models.Question.id, func.min(db_models.Option.id)).join(
+        db_models.Option, db_models.Option.question_id == db_models.Question.id
+    ).filter(
+        db_models.Question.module_id == module_id,
+        db_models.Option.is_correct == True
+    ).group_by(db_models.Question.id).all()
+
+    answer_key = quiz_logic.compile_answer_key(module_id, module_info.course_id, module_info.level, correct_options)
+    # Un módulo sin preguntas no se guarda: su quiz lo crea el worker de Celery, cuya
+    # invalidación no llega a la caché de la API, y quedaría vacío hasta el TTL
+    if answer_key.total_questions:
+        answer_key_cache.set_cached_answer_key(module_id, answer_key)
+    return answer_key
+
+def create_quiz_attempt(db: Session, user_id: int, module_id: int, score: float, passed: bool, course_id: int = None):
     """Guarda un intento de quiz en la base de datos."""
     attempt = db_models.QuizAttempt(
         user_id=user_id,
@@ -54,22 +112,34 @@ def create_quiz_attempt(db: Session, user_id: int, module_id: int, score: float,
         score=score,
         passed=passed
     )
+    # El resumen se asegura ANTES de agregar el intento: si se calcula desde cero no debe incluirlo
+    progress_repo.record_quiz_attempt_in_summary(db, user_id, module_id, score, course_id=course_id)
     db.add(attempt)
     db.commit()
 
+def create_graded_attempts(db: Session, module_id: int, course_id: int, graded: list):
+    """
+    Guarda en una sola transacción los intentos de varios alumnos, recibidos como
+    (user_id, score, passed), y marca el módulo como completado para quienes aprobaron.
+    """
+    for user_id, score, passed in graded:
+        progress_repo.record_quiz_attempt_in_summary(db, user_id, module_id, score, course_id=course_id)
+        db.add(db_models.QuizAttempt(user_id=user_id, module_id=module_id, score=score, passed=passed))
+        if passed:
+            progress_repo.set_module_completed(db, user_id, module_id, course_id=course_id)
+    db.commit()
+
 
 def get_average_quiz_score(db: Session, user_id: int, course_id: int) -> Optional[float]:
     """
-    Calcula el puntaje promedio de los quizzes de un usuario para un curso específico.
+    Obtiene el puntaje promedio de los quizzes de un usuario para un curso específico
+    desde el resumen materializado user_course_progress.
     """
-    avg_score = db.query(func.avg(db_models.QuizAttempt.score)).join(
-        db_models.Module
-    ).filter(
-        db_models.QuizAttempt.user_id == user_id,
-        db_models.Module.course_id == course_id
-    ).scalar()
+    summary = db.query(db_models.UserCourseProgress).filter_by(
+        user_id=user_id, course_id=course_id
+    ).first()
 
-    return avg_score
+    return summary.average_quiz_score if summary else None
 
 def count_quiz_attempts(db: Session, user_id: int, module_id: int) -> int:
     """Cuenta el número de intentos para un quiz por un usuario."""
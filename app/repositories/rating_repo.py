@@ -1,6 +1,9 @@
+from sqlalchemy import func, case
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from .. import db_models
+from ..core.rating_counts_cache import get_cached_counts, set_cached_counts, invalidate_counts
 
 def create_or_update_rating(
     db: Session,
@@ -14,6 +17,19 @@ def create_or_update_rating(
     if not course_id and not module_id:
         raise ValueError("Must provide either a course_id or a module_id.")
 
+    # INSERT ... ON DUPLICATE KEY UPDATE: crear o cambiar el voto es una sola sentencia
+    # atómica, sin leer antes, así dos peticiones simultáneas no crean votos duplicados
+    stmt = mysql_insert(db_models.Rating).values(
+        user_id=user_id,
+        course_id=course_id,
+        module_id=module_id,
+        is_upvote=is_upvote
+    )
+    stmt = stmt.on_duplicate_key_update(is_upvote=stmt.inserted.is_upvote, updated_at=func.now())
+    db.execute(stmt)
+    db.commit()
+    invalidate_counts(_counts_key(course_id, module_id), ("global", None))
+
     query = db.query(db_models.Rating).filter(db_models.Rating.user_id == user_id)
 
     if course_id:
@@ -21,22 +37,17 @@ def create_or_update_rating(
     elif module_id:
         query = query.filter(db_models.Rating.module_id == module_id)
 
-    rating = query.first()
+    return query.first()
 
-    if rating:
-        rating.is_upvote = is_upvote
-    else:
-        rating = db_models.Rating(
-            user_id=user_id,
-            course_id=course_id,
-            module_id=module_id,
-            is_upvote=is_upvote
-        )
-        db.add(rating)
+def _counts_key(course_id: Optional[int], module_id: Optional[int]):
+    return ("course", course_id) if course_id else ("module", module_id)
 
-    db.commit()
-    db.refresh(rating)
-    return rating
+def _count_columns():
+    """Votos positivos y negativos con agregación condicional: un solo recorrido."""
+    return (
+        func.coalesce(func.sum(case((db_models.Rating.is_upvote == True, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((db_models.Rating.is_upvote == False, 1), else_=0)), 0),
+    )
 
 def get_rating_counts(
     db: Session,
@@ -48,22 +59,57 @@ def get_rating_counts(
     if not course_id and not module_id:
         raise ValueError("Must provide either a course_id or a module_id.")
 
-    query = db.query(db_models.Rating)
+    key = _counts_key(course_id, module_id)
+    counts = get_cached_counts(key)
+    if counts is not None:
+        return dict(counts)
+
+    query = db.query(*_count_columns())
 
     if course_id:
         query = query.filter(db_models.Rating.course_id == course_id)
     elif module_id:
         query = query.filter(db_models.Rating.module_id == module_id)
 
-    upvotes = query.filter(db_models.Rating.is_upvote == True).count()
-    downvotes = query.filter(db_models.Rating.is_upvote == False).count()
-
-    return {"upvotes": upvotes, "downvotes": downvotes}
+    upvotes, downvotes = query.one()
+    counts = {"upvotes": int(upvotes), "downvotes": int(downvotes)}
+    set_cached_counts(key, counts)
+    return dict(counts)
+
+def get_course_rating_counts_bulk(db: Session, course_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    """
+    Conteos de votos de varios cursos: los que no están en caché salen de un único
+    GROUP BY. Los cursos sin votos devuelven 0/0.
+    """
+    result = {}
+    missing = []
+    for course_id in dict.fromkeys(course_ids):
+        counts = get_cached_counts(("course", course_id))
+        if counts is not None:
+            result[course_id] = dict(counts)
+        else:
+            missing.append(course_id)
+
+    if missing:
+        rows = db.query(db_models.Rating.course_id, *_count_columns())\
+            .filter(db_models.Rating.course_id.in_(missing))\
+            .group_by(db_models.Rating.course_id)\
+            .all()
+        fetched = {course_id: {"upvotes": int(upvotes), "downvotes": int(downvotes)} for course_id, upvotes, downvotes in rows}
+        for course_id in missing:
+            counts = fetched.get(course_id, {"upvotes": 0, "downvotes": 0})
+            set_cached_counts(("course", course_id), counts)
+            result[course_id] = dict(counts)
+
+    return result
 
 def get_global_rating_counts(db: Session) -> Dict[str, int]:
-    upvotes = db.query(db_models.Rating).filter(db_models.Rating.is_upvote == True).count()
-    downvotes = db.query(db_models.Rating).filter(db_models.Rating.is_upvote == False).count()
-    return {"upvotes": upvotes, "downvotes": downvotes}
+    counts = get_cached_counts(("global", None))
+    if counts is None:
+        upvotes, downvotes = db.query(*_count_columns()).one()
+        counts = {"upvotes": int(upvotes), "downvotes": int(downvotes)}
+        set_cached_counts(("global", None), counts)
+    return dict(counts)
 
 def get_user_rating(
     db: Session,
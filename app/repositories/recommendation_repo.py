@@ -0,0 +1,70 @@
+# backend/app/repositories/recommendation_repo.py
+# Consultas agregadas con las que se entrena el recomendador local de cursos.
+
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from app import db_models
+
+
+def get_course_features(db: Session):
+    """Devuelve (id, category_id, level, status) de todos los cursos."""
+    return db.query(
+        db_models.Course.id,
+        db_models.Course.category_id,
+        db_models.Course.level,
+        db_models.Course.status
+    ).order_by(db_models.Course.id).all()
+
+def get_enrollment_cooccurrence(db: Session):
+    """
+    Devuelve (course_a, course_b, usuarios) para cada par de cursos con alumnos en común,
+    incluido el par (a, a) con el total de inscriptos de cada curso. Lo calcula la base
+    con un self-join agrupado, sin traer las inscripciones individuales.
+    """
+    other = aliased(db_models.CourseEnrollment)
+    return db.query(
+        db_models.CourseEnrollment.course_id,
+        other.course_id,
+        func.count()
+    ).join(
+        other, other.user_id == db_models.CourseEnrollment.user_id
+    ).group_by(
+        db_models.CourseEnrollment.course_id, other.course_id
+    ).all()
+
+def get_course_rating_totals(db: Session):
+    """Devuelve (course_id, upvotes, downvotes) de los cursos calificados."""
+    return db.query(
+        db_models.Rating.course_id,
+        func.sum(case((db_models.Rating.is_upvote == True, 1), else_=0)),
+        func.sum(case((db_models.Rating.is_upvote == False, 1), else_=0))
+    ).filter(
+        db_models.Rating.course_id.isnot(None)
+    ).group_by(db_models.Rating.course_id).all()
+
+def get_courses_by_ids(db: Session, course_ids: list):
+    """Carga los cursos indicados con lo que serializa el schema Course, respetando el orden recibido."""
+    if not course_ids:
+        return []
+    courses = db.query(db_models.Course).options(
+        joinedload(db_models.Course.category).selectinload(db_models.Category.courses)
+    ).filter(db_models.Course.id.in_(course_ids)).all()
+    by_id = {course.id: course for course in courses}
+    return [by_id[course_id] for course_id in course_ids if course_id in by_id]
+
+def get_popular_course_ids(db: Session, exclude_ids: list, limit: int):
+    """
+    IDs de los `limit` cursos publicados con más inscriptos, sin los de `exclude_ids`.
+    Es lo que se recomienda mientras el modelo local todavía no está entrenado.
+    """
+    if limit <= 0:
+        return []
+    query = db.query(db_models.Course.id).outerjoin(
+        db_models.CourseEnrollment, db_models.CourseEnrollment.course_id == db_models.Course.id
+    ).filter(db_models.Course.status == 'published')
+    if exclude_ids:
+        query = query.filter(db_models.Course.id.notin_(exclude_ids))
+    rows = query.group_by(db_models.Course.id).order_by(
+        func.count(db_models.CourseEnrollment.user_id).desc(), db_models.Course.id
+    ).limit(limit).all()
+    return [course_id for course_id, in rows]
@@ -1,11 +1,16 @@
 # backend/app/repositories/reporting_repo.py
 
 from sqlalchemy.orm import Session, joinedload
-from app.repositories import enrollment_repo, progress_repo
+from sqlalchemy import func, and_, distinct, select
+from app.repositories import enrollment_repo
 from app.logic import course_logic
 from app.models.course import CourseWithProgress
 from app import db_models
 
+# Página del reporte de inscripciones con progreso (GET /admin/enrollments-detailed)
+ENROLLMENTS_REPORT_PAGE_SIZE = 50
+ENROLLMENTS_REPORT_MAX_PAGE_SIZE = 200
+
 def get_dashboard_stats(db: Session):
     """Calcula estadísticas generales de la plataforma."""
     total_users = db.query(db_models.User).count()
@@ -40,13 +45,11 @@ def get_enrolled_courses_with_progress(db: Session, user_id: int):
     """Obtiene los cursos en los que un usuario está inscrito y su progreso."""
     enrolled_courses = enrollment_repo.get_enrolled_courses(db, user_id=user_id)
 
+    progress_by_course = course_logic.calculate_courses_progress(db, enrolled_courses, user_id)
+
     courses_with_data = []
     for course in enrolled_courses:
-        total_modules = len(course.modules)
-        completed_modules = progress_repo.get_completed_modules_count(db, user_id, course.id)
-        percentage = round((completed_modules / total_modules) * 100) if total_modules > 0 else 0
-
-        total, earned = course_logic.calculate_star_rating(db, course, user_id)
+        progress = progress_by_course[course.id]
 
         course_data_dict = {
             "id": course.id,
@@ -55,9 +58,9 @@ def get_enrolled_courses_with_progress(db: Session, user_id: int):
             "instructor_id": course.instructor_id,
             "level": course.level,
             "category": course.category,
-            "total_stars": total,
-            "earned_stars": earned,
-            "completion_percentage": percentage,
+            "total_stars": progress["total_stars"],
+            "earned_stars": progress["earned_stars"],
+            "completion_percentage": progress["completion_percentage"],
             "creator_id": course.creator_id,
             "is_free": course.is_free,
             "price": course.price
@@ -96,59 +99,99 @@ def get_detailed_student_progress(db: Session, instructor_id: int):
     """
     Obtiene un reporte detallado del progreso de cada estudiante
     que es miembro de al menos una de las salas del instructor.
+
+    El reporte se resuelve en una sola consulta agregada: los totales de
+    módulos, los módulos completados y la sala de cada curso se calculan
+    con subconsultas agrupadas y se unen a las inscripciones de los alumnos.
     """
-    students_in_rooms = db.query(db_models.User).join(
-        db_models.RoomMember
-    ).join(db_models.Room).filter(
-        db_models.Room.instructor_id == instructor_id,
+    instructor_students = db.query(
+        db_models.RoomMember.user_id.label("user_id")
+    ).join(
+        db_models.Room, db_models.Room.id == db_models.RoomMember.room_id
+    ).filter(
+        db_models.Room.instructor_id == instructor_id
+    ).distinct().subquery()
+
+    module_totals = db.query(
+        db_models.Module.course_id.label("course_id"),
+        func.count(db_models.Module.id).label("total_modules")
+    ).group_by(db_models.Module.course_id).subquery()
+
+    completed_modules = db.query(
+        db_models.StudentProgress.user_id.label("user_id"),
+        db_models.Module.course_id.label("course_id"),
+        func.count(distinct(db_models.StudentProgress.module_id)).label("completed_modules")
+    ).join(
+        db_models.Module, db_models.Module.id == db_models.StudentProgress.module_id
+    ).filter(
+        db_models.StudentProgress.status == 'completed',
+        db_models.StudentProgress.user_id.in_(select(instructor_students.c.user_id))
+    ).group_by(db_models.StudentProgress.user_id, db_models.Module.course_id).subquery()
+
+    # Sala del instructor a la que pertenece cada curso (si hay varias, la primera por nombre)
+    course_rooms = db.query(
+        db_models.RoomCourse.course_id.label("course_id"),
+        func.min(db_models.Room.name).label("room_name")
+    ).join(
+        db_models.Room, db_models.Room.id == db_models.RoomCourse.room_id
+    ).filter(
+        db_models.Room.instructor_id == instructor_id
+    ).group_by(db_models.RoomCourse.course_id).subquery()
+
+    rows = db.query(
+        db_models.User.id,
+        db_models.User.username,
+        db_models.UserProfile.user_id,
+        db_models.UserProfile.first_name,
+        db_models.Course.title,
+        course_rooms.c.room_name,
+        module_totals.c.total_modules,
+        completed_modules.c.completed_modules
+    ).join(
+        instructor_students, instructor_students.c.user_id == db_models.User.id
+    ).outerjoin(
+        db_models.UserProfile, db_models.UserProfile.user_id == db_models.User.id
+    ).outerjoin(
+        db_models.CourseEnrollment, db_models.CourseEnrollment.user_id == db_models.User.id
+    ).outerjoin(
+        db_models.Course, db_models.Course.id == db_models.CourseEnrollment.course_id
+    ).outerjoin(
+        course_rooms, course_rooms.c.course_id == db_models.Course.id
+    ).outerjoin(
+        module_totals, module_totals.c.course_id == db_models.Course.id
+    ).outerjoin(
+        completed_modules, and_(
+            completed_modules.c.user_id == db_models.User.id,
+            completed_modules.c.course_id == db_models.Course.id
+        )
+    ).filter(
         db_models.User.role_id == 1
-    ).options(
-        joinedload(db_models.User.profile)  # <-- Carga explícitamente el perfil
-    ).distinct().all()
-
-    report = []
-    for student in students_in_rooms:
-        # --- CORRECCIÓN: Maneja el caso de que el perfil sea None ---
-        student_name = (student.profile.first_name if student.profile else student.username)
-
-        student_data = {
-            "student_id": student.id,
-            "student_name": student_name,
-            "enrollments": []
-        }
-
-        # Buscamos los cursos en los que el estudiante está inscrito
-        enrollments = db.query(db_models.CourseEnrollment).filter(
-            db_models.CourseEnrollment.user_id == student.id
-        ).all()
-
-        for enrollment in enrollments:
-            course = enrollment.course
-
-            # Verificamos si este curso pertenece a una de las salas del instructor
-            room = db.query(db_models.Room).join(db_models.RoomCourse).filter(
-                db_models.Room.instructor_id == instructor_id,
-                db_models.RoomCourse.course_id == course.id,
-            ).first()
-
-            # Calculamos el progreso para ese curso
-            total_modules = len(course.modules)
-            completed_modules = db.query(db_models.StudentProgress).filter(
-                db_models.StudentProgress.user_id == student.id,
-                db_models.StudentProgress.module_id.in_([m.id for m in course.modules]),
-                db_models.StudentProgress.status == 'completed'
-            ).count()
-            progress = round((completed_modules / total_modules) * 100) if total_modules > 0 else 0
-
-            student_data["enrollments"].append({
-                "course_title": course.title,
-                "room_name": room.name if room else "Sin Sala (Libre)",
-                "progress": progress
-            })
-
-        report.append(student_data)
+    ).order_by(db_models.User.id, db_models.Course.id).all()
+
+    report = {}
+    for (student_id, username, profile_user_id, first_name, course_title,
+         room_name, total_modules, completed) in rows:
+        student_data = report.get(student_id)
+        if student_data is None:
+            # --- CORRECCIÓN: Maneja el caso de que el perfil sea None ---
+            student_name = first_name if profile_user_id is not None else username
+            student_data = report[student_id] = {
+                "student_id": student_id,
+                "student_name": student_name,
+                "enrollments": []
+            }
+
+        # Alumno sin inscripciones: la fila del LEFT JOIN no trae curso
+        if course_title is None:
+            continue
+
+        student_data["enrollments"].append({
+            "course_title": course_title,
+            "room_name": room_name or "Sin Sala (Libre)",
+            "progress": course_logic.calculate_completion_percentage(completed or 0, total_modules or 0)
+        })
 
-    return report
+    return list(report.values())
 
 
 def get_all_rooms_summary(db: Session):
@@ -178,43 +221,103 @@ def get_all_rooms_summary(db: Session):
     return summary
 
 
-def get_courses_with_enrollments_and_progress(db: Session):
+def get_courses_with_enrollments_and_progress(db: Session, skip: int = 0, limit: int = ENROLLMENTS_REPORT_PAGE_SIZE):
     """
-    Obtiene todos los cursos, cargando los estudiantes inscritos y calculando
-    el progreso de cada uno en ese curso.
+    Obtiene una página de cursos (paginados por ID, como máximo
+    ENROLLMENTS_REPORT_MAX_PAGE_SIZE) con una lista de sus estudiantes
+    inscritos y el progreso de cada uno en ese curso.
+
+    Usa tres consultas por página, sin importar la cantidad de alumnos:
+    los cursos de la página, el total de módulos por curso y las inscripciones
+    con los módulos completados agrupados por (course_id, user_id).
     """
-    courses = db.query(db_models.Course).options(
-        joinedload(db_models.Course.enrollments).joinedload(db_models.CourseEnrollment.user).joinedload(
-            db_models.User.profile)
-    ).all()
+    courses = db.query(db_models.Course.id, db_models.Course.title)\
+        .order_by(db_models.Course.id)\
+        .offset(skip)\
+        .limit(min(limit, ENROLLMENTS_REPORT_MAX_PAGE_SIZE))\
+        .all()
+    return _build_courses_enrollment_report(db, courses)
+
+
+def iter_courses_with_enrollments_and_progress(db: Session, batch_size: int = 100):
+    """
+    Recorre el reporte de inscripciones curso por curso, cargando los cursos
+    en lotes de `batch_size` (paginación por ID) para no mantener todo el
+    reporte en memoria.
+    """
+    last_course_id = 0
+    while True:
+        courses = db.query(db_models.Course.id, db_models.Course.title).filter(
+            db_models.Course.id > last_course_id
+        ).order_by(db_models.Course.id).limit(batch_size).all()
+        if not courses:
+            return
+
+        yield from _build_courses_enrollment_report(db, courses)
+        last_course_id = courses[-1].id
+
+
+def _build_courses_enrollment_report(db: Session, courses: list):
+    """Arma el reporte de inscripciones y progreso para una lista de filas (id, title) de cursos."""
+    if not courses:
+        return []
+    course_ids = [course.id for course in courses]
+
+    total_modules_by_course = dict(db.query(
+        db_models.Module.course_id,
+        func.count(db_models.Module.id)
+    ).filter(
+        db_models.Module.course_id.in_(course_ids)
+    ).group_by(db_models.Module.course_id).all())
+
+    completed_modules = db.query(
+        db_models.StudentProgress.user_id.label("user_id"),
+        db_models.Module.course_id.label("course_id"),
+        func.count(distinct(db_models.StudentProgress.module_id)).label("completed_modules")
+    ).join(
+        db_models.Module, db_models.Module.id == db_models.StudentProgress.module_id
+    ).filter(
+        db_models.StudentProgress.status == 'completed',
+        db_models.Module.course_id.in_(course_ids)
+    ).group_by(db_models.StudentProgress.user_id, db_models.Module.course_id).subquery()
+
+    enrollment_rows = db.query(
+        db_models.CourseEnrollment.course_id,
+        db_models.User.id,
+        db_models.User.username,
+        db_models.User.email,
+        db_models.UserProfile.user_id,
+        db_models.UserProfile.first_name,
+        completed_modules.c.completed_modules
+    ).join(
+        db_models.User, db_models.User.id == db_models.CourseEnrollment.user_id
+    ).outerjoin(
+        db_models.UserProfile, db_models.UserProfile.user_id == db_models.User.id
+    ).outerjoin(
+        completed_modules, and_(
+            completed_modules.c.user_id == db_models.CourseEnrollment.user_id,
+            completed_modules.c.course_id == db_models.CourseEnrollment.course_id
+        )
+    ).filter(
+        db_models.CourseEnrollment.course_id.in_(course_ids)
+    ).order_by(db_models.CourseEnrollment.course_id, db_models.User.id).all()
+
+    students_by_course = {course_id: [] for course_id in course_ids}
+    for (course_id, student_id, username, email, profile_user_id,
+         first_name, completed) in enrollment_rows:
+        total_modules = total_modules_by_course.get(course_id, 0)
+        students_by_course[course_id].append({
+            "id": student_id,
+            "name": first_name if profile_user_id is not None else username,
+            "email": email,
+            "progress": course_logic.calculate_completion_percentage(completed or 0, total_modules)
+        })
 
-    report = []
-    for course in courses:
-        students_data = []
-        # Asegura que enrollments exista antes de iterar
-        if course.enrollments:
-            for enrollment in course.enrollments:
-                student = enrollment.user
-                if not student: continue  # Salta si no hay usuario
-
-                total_modules = len(course.modules)
-                completed_modules = db.query(db_models.StudentProgress).filter(
-                    db_models.StudentProgress.user_id == student.id,
-                    db_models.StudentProgress.module_id.in_([m.id for m in course.modules]),
-                    db_models.StudentProgress.status == 'completed'
-                ).count()
-                progress = round((completed_modules / total_modules) * 100) if total_modules > 0 else 0
-
-                students_data.append({
-                    "id": student.id,
-                    "name": student.profile.first_name if student.profile else student.username,
-                    "email": student.email,
-                    "progress": progress
-                })
-
-        report.append({
+    return [
+        {
             "id": course.id,
             "title": course.title,
-            "enrolled_students": students_data  # Siempre devuelve una lista
-        })
-    return report
\ No newline at end of file
+            "enrolled_students": students_by_course[course.id]  # Siempre devuelve una lista
+        }
+        for course in courses
+    ]
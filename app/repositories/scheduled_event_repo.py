@@ -1,11 +1,28 @@
 from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
 from app import db_models
+from app.repositories import event_invitation_repo, notification_repo
 from datetime import datetime
 from app.db_models import EventInvitation
 
-def create_scheduled_event(db: Session, room_id: int, creator_id: int, title: str, start_time: datetime, end_time: datetime, event_type: str):
+def create_scheduled_event(db: Session, room_id: int, creator_id: int, title: str, start_time: datetime, end_time: datetime, event_type: str,
+                           invited_user_ids: Optional[List[int]] = None, invitation_message: Optional[str] = None):
+    """
+    Crea el evento con sus invitaciones y, si hay `invitation_message`, una
+    notificación para cada invitado. Todo va en una sola transacción con inserts
+    de varias filas: la cantidad de commits no depende de la cantidad de invitados.
+    """
     db_event = db_models.ScheduledEvent(room_id=room_id, creator_id=creator_id, title=title, start_time=start_time, end_time=end_time, event_type=event_type)
     db.add(db_event)
+    db.flush() # Obtiene el ID del evento sin cerrar la transacción
+
+    invited_user_ids = list(dict.fromkeys(invited_user_ids or []))
+    event_invitation_repo.add_event_invitations(db, event_id=db_event.id, user_ids=invited_user_ids)
+    if invitation_message:
+        notification_repo.add_notifications(
+            db, user_ids=invited_user_ids, message=invitation_message, link_url=f"/calendar?event_id={db_event.id}"
+        )
+
     db.commit()
     db.refresh(db_event)
     return db_event
@@ -33,16 +50,15 @@ def update_scheduled_event(db: Session, event_id: int, event_data: dict):
         new_invited_ids = set(event_data.get("invited_user_ids", []))
 
         # Add new invitations
-        for user_id in new_invited_ids - current_invited_ids:
-            db_invitation = db_models.EventInvitation(event_id=event_id, user_id=user_id, status="pending")
-            db.add(db_invitation)
+        event_invitation_repo.add_event_invitations(db, event_id=event_id, user_ids=list(new_invited_ids - current_invited_ids))
 
         # Remove old invitations
-        for user_id in current_invited_ids - new_invited_ids:
+        removed_ids = current_invited_ids - new_invited_ids
+        if removed_ids:
             db.query(db_models.EventInvitation).filter(
                 db_models.EventInvitation.event_id == event_id,
-                db_models.EventInvitation.user_id == user_id
-            ).delete()
+                db_models.EventInvitation.user_id.in_(removed_ids)
+            ).delete(synchronize_session=False)
 
         db.commit()
         db.refresh(db_event)
@@ -0,0 +1,100 @@
+# backend/app/repositories/suggestion_repo.py
+
+import re
+from sqlalchemy import or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Query, Session
+from typing import List, Optional, Tuple
+from .. import db_models
+
+# innodb_ft_min_token_size por defecto: las palabras más cortas no están en el índice FULLTEXT
+FULLTEXT_MIN_TOKEN_SIZE = 3
+
+
+def get_all_topics(db: Session) -> List[Tuple[int, str]]:
+    """(id, topic) de todas las sugerencias, para construir el índice en memoria."""
+    return db.query(db_models.CourseSuggestion.id, db_models.CourseSuggestion.topic).all()
+
+
+def get_topics_after(db: Session, last_id: int, missing_ids: List[int] = ()) -> List[Tuple[int, str]]:
+    """
+    (id, topic) de las sugerencias con ID mayor a `last_id` o en `missing_ids`
+    (huecos que otra transacción pudo confirmar tarde), para poner al día el índice.
+    """
+    condition = db_models.CourseSuggestion.id > last_id
+    if missing_ids:
+        condition = or_(condition, db_models.CourseSuggestion.id.in_(missing_ids))
+    return db.query(db_models.CourseSuggestion.id, db_models.CourseSuggestion.topic)\
+        .filter(condition)\
+        .order_by(db_models.CourseSuggestion.id)\
+        .all()
+
+
+def create_suggestion(db: Session, topic: str) -> db_models.CourseSuggestion:
+    db_suggestion = db_models.CourseSuggestion(topic=topic)
+    db.add(db_suggestion)
+    db.commit()
+    db.refresh(db_suggestion)
+    return db_suggestion
+
+
+def search_suggestions(db: Session, query: str, skip: int = 0, limit: int = 20) -> List[db_models.CourseSuggestion]:
+    """
+    Busca sugerencias con el índice FULLTEXT del tema, en modo booleano y por
+    prefijo ("pyth" encuentra "Python"): deben aparecer todas las palabras.
+    Ordena por relevancia y luego por votos; solo trae la página pedida.
+    """
+    search_query = _search_query(db, query)
+    if search_query is None:
+        return []
+    return search_query.offset(skip).limit(limit).all()
+
+
+def _search_query(db: Session, query: str) -> Optional[Query]:
+    """Consulta ordenada de search_suggestions, o None si el texto no tiene palabras."""
+    words = re.findall(r"\w+", query.lower())
+    indexed_words = [word for word in words if len(word) >= FULLTEXT_MIN_TOKEN_SIZE]
+    CourseSuggestion = db_models.CourseSuggestion
+
+    if indexed_words:
+        relevance = match(
+            CourseSuggestion.topic,
+            against=" ".join(f"+{word}*" for word in indexed_words)
+        ).in_boolean_mode()
+        return db.query(CourseSuggestion)\
+            .filter(relevance > 0)\
+            .order_by(relevance.desc(), CourseSuggestion.votes.desc(), CourseSuggestion.id)
+    if words:
+        # Palabras demasiado cortas para el índice: se busca como subcadena
+        return db.query(CourseSuggestion)\
+            .filter(CourseSuggestion.topic.contains(query.strip(), autoescape=True))\
+            .order_by(CourseSuggestion.votes.desc(), CourseSuggestion.id)
+    return None
+
+
+def add_vote(db: Session, suggestion_id: int, course_threshold: int) -> Tuple[Optional[db_models.CourseSuggestion], bool]:
+    """
+    Suma un voto con un UPDATE atómico (votes = votes + 1), sin leer antes la fila,
+    así los votos concurrentes no se pisan. En la misma transacción marca la
+    sugerencia como 'course_created' si llegó a `course_threshold`: el UPDATE
+    condicional solo afecta una fila una vez, por lo que exactamente un voto
+    recibe `True` como "cruzó el umbral". Devuelve (sugerencia o None si no existe, cruzó).
+    """
+    CourseSuggestion = db_models.CourseSuggestion
+    updated = db.query(CourseSuggestion)\
+        .filter(CourseSuggestion.id == suggestion_id)\
+        .update({CourseSuggestion.votes: CourseSuggestion.votes + 1}, synchronize_session=False)
+    if not updated:
+        db.rollback()
+        return None, False
+
+    crossed_threshold = db.query(CourseSuggestion)\
+        .filter(
+            CourseSuggestion.id == suggestion_id,
+            CourseSuggestion.votes >= course_threshold,
+            CourseSuggestion.status != 'course_created'
+        )\
+        .update({CourseSuggestion.status: 'course_created'}, synchronize_session=False) == 1
+    db.commit()
+
+    return db.get(CourseSuggestion, suggestion_id, populate_existing=True), crossed_threshold
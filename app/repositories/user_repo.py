@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session, joinedload
 from app import db_models
 from app.models import user as user_schemas
 from app.core.hashing import get_password_hash
+from app.core import user_cache
 from app.repositories import role_repo, subscription_repo
 import secrets
 
@@ -20,6 +21,29 @@ def get_user_by_username(db: Session, username: str):
     return db.query(db_models.User).filter(db_models.User.username == username).first()
 
 
+def get_user_principal_by_username(db: Session, username: str):
+    """
+    Obtiene en una sola consulta (users JOIN roles) la versión compacta del usuario
+    que usan las dependencias de autenticación.
+    """
+    row = db.query(
+        db_models.User.id,
+        db_models.User.username,
+        db_models.User.is_active,
+        db_models.Role.name
+    ).join(
+        db_models.Role, db_models.Role.id == db_models.User.role_id
+    ).filter(db_models.User.username == username).first()
+
+    if row is None:
+        return None
+    user_id, user_name, is_active, role_name = row
+    return user_schemas.CurrentUser(
+        id=user_id, username=user_name, is_active=is_active,
+        role=user_schemas.CurrentUserRole(name=role_name)
+    )
+
+
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     """Obtiene una lista de todos los usuarios, incluyendo sus perfiles."""
     return db.query(db_models.User).options(joinedload(db_models.User.profile)).offset(skip).limit(limit).all()
@@ -59,6 +83,7 @@ def activate_user_by_token(db: Session, token: str):
         user.is_active = True
         user.verification_token = None  # El token se usa solo una vez
         db.commit()
+        user_cache.invalidate_cached_user(user.username)
         return user
     return None
 
@@ -82,6 +107,7 @@ def update_user(db: Session, user_id: int, user_update: user_schemas.UserUpdate)
 
     db.commit()
     db.refresh(db_user)
+    user_cache.invalidate_cached_user(db_user.username)
     return db_user
 
 
@@ -90,8 +116,10 @@ def delete_user(db: Session, user_id: int) -> bool:
     db_user = get_user_by_id(db, user_id)
     if not db_user:
         return False
+    username = db_user.username
     db.delete(db_user)
     db.commit()
+    user_cache.invalidate_cached_user(username)
     return True
 
 
@@ -1,9 +1,12 @@
 #backend/app/routers/admin.py
 
-from fastapi import APIRouter, Depends
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from app.database import SessionLocal
 from app.dependencies import get_db
 from app.security import instructor_required  # Se usa la dependencia que incluye a ambos roles
 from app.repositories import reporting_repo
@@ -46,6 +49,35 @@ def get_all_rooms_summary_endpoint(db: Session = Depends(get_db)):
     return reporting_repo.get_all_rooms_summary(db)
 
 @router.get("/enrollments-detailed")
-def get_enrollments_with_progress(db: Session = Depends(get_db)):
-    """Obtiene los cursos con una lista detallada de sus alumnos y el progreso de cada uno."""
-    return reporting_repo.get_courses_with_enrollments_and_progress(db)
\ No newline at end of file
+def get_enrollments_with_progress(
+    skip: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=reporting_repo.ENROLLMENTS_REPORT_MAX_PAGE_SIZE),
+    stream: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Obtiene los cursos con una lista detallada de sus alumnos y el progreso de cada uno,
+    paginados por `skip`/`limit` (por defecto ENROLLMENTS_REPORT_PAGE_SIZE cursos).
+
+    Con `stream=true` devuelve el reporte completo como NDJSON (un curso por
+    línea), generado por lotes para que el cliente pueda renderizarlo a medida
+    que llega; en ese modo no se admiten `skip` ni `limit`.
+    """
+    if stream:
+        if skip is not None or limit is not None:
+            raise HTTPException(status_code=400, detail="stream=true devuelve el reporte completo: no admite skip ni limit.")
+        return StreamingResponse(_stream_enrollments_report(), media_type="application/x-ndjson")
+    return reporting_repo.get_courses_with_enrollments_and_progress(
+        db, skip=skip or 0, limit=limit or reporting_repo.ENROLLMENTS_REPORT_PAGE_SIZE
+    )
+
+
+def _stream_enrollments_report():
+    # El generador abre su propia sesión: la de get_db se cierra antes
+    # de que termine de enviarse la respuesta.
+    db = SessionLocal()
+    try:
+        for course in reporting_repo.iter_courses_with_enrollments_and_progress(db):
+            yield json.dumps(course, ensure_ascii=False) + "\n"
+    finally:
+        db.close()
\ No newline at end of file
@@ -0,0 +1,81 @@
+# backend/app/routers/audio.py
+
+from email.utils import format_datetime
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import RedirectResponse, StreamingResponse
+
+from app.core.audio_storage import audio_storage, is_valid_key, is_content_addressed
+from app.core.http_cache import etag_matches
+from app.logic.media_logic import parse_byte_range, RangeNotSatisfiable
+
+router = APIRouter(
+    prefix="/audio",
+    tags=["Audio"]
+)
+
+# Los archivos con nombre = huella del contenido nunca cambian
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Audios antiguos nombrados por ID de módulo: se sobrescribían al regenerarlos
+LEGACY_CACHE_CONTROL = "public, max-age=3600"
+
+
+@router.api_route("/modules/{key}", methods=["GET", "HEAD"])
+def stream_module_audio(key: str, request: Request):
+    """
+    Sirve el audio de un módulo con soporte de Range (para adelantar/retroceder
+    en el reproductor), ETag/304 y caché de larga duración.
+    """
+    if not is_valid_key(key):
+        raise HTTPException(status_code=404, detail="Audio no encontrado.")
+    stored = audio_storage.stat(key)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Audio no encontrado.")
+
+    # Un object storage puede entregar el archivo directamente (URL firmada o CDN)
+    public_url = audio_storage.public_url(key)
+    if public_url:
+        return RedirectResponse(public_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    headers = {
+        "ETag": stored.etag,
+        "Last-Modified": format_datetime(stored.last_modified, usegmt=True),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if is_content_addressed(key) else LEGACY_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if etag_matches(request.headers.get("if-none-match"), stored.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get("range")
+    # If-Range: si el archivo cambió desde que el cliente lo pidió, va completo
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() not in (stored.etag, headers["Last-Modified"]):
+        range_header = None
+
+    try:
+        byte_range = parse_byte_range(range_header, stored.size)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{stored.size}"}
+        )
+
+    if byte_range is None:
+        start, end = 0, stored.size - 1
+        status_code = status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{stored.size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    # HEAD: mismas cabeceras, sin abrir el archivo
+    if request.method == "HEAD":
+        return Response(status_code=status_code, media_type="audio/mpeg", headers=headers)
+
+    return StreamingResponse(
+        audio_storage.iter_range(key, start, end),
+        status_code=status_code,
+        media_type="audio/mpeg",
+        headers=headers
+    )
@@ -4,13 +4,14 @@ import secrets
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr # <-- Se añade la importación
 
-from app.dependencies import get_db
-from app.security import authenticate_user, create_access_token
+from app.dependencies import get_db, get_async_db
+from app.security import authenticate_user_async, create_access_token
 from app.models.user import UserCreate, Token
 from app.services import email_service
-from app.repositories import user_repo
+from app.repositories import user_repo, async_user_repo
 
 router = APIRouter(
     prefix="/auth",
@@ -23,9 +24,9 @@ class RegisterResponse(BaseModel):
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -37,7 +38,7 @@ async def login_for_access_token(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user",
         )
-    user_repo.update_user_last_login(db, user_id=user.id)
+    await async_user_repo.update_user_last_login(db, user_id=user.id)
     access_token = create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
 
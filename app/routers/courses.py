@@ -1,6 +1,7 @@
 # backend/app/routers/courses.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
 from typing import List
 from sqlalchemy.orm import Session
 
@@ -8,14 +9,17 @@ from sqlalchemy.orm import Session
 from app.models.course import Course, CourseCreate, CourseDetail
 from app.models.module import ModuleResponse as Module
 from app.models.user import User as PydanticUser
+from app.models.generation_job import GenerationJob
 
 # --- Dependencias, Repositorios y Servicios ---
 from app.dependencies import get_db, get_course_service
 from app.services.course_service import CourseService
-from app.security import instructor_required, get_current_active_user, can_edit_course, is_course_creator
-from app.repositories import course_repo, progress_repo, enrollment_repo
+from app.services import pdf_service
+from app.security import instructor_required, admin_required, get_current_active_user, can_edit_course, is_course_creator
+from app.repositories import course_repo, progress_repo, enrollment_repo, generation_job_repo
+from app.core.task_queue import enqueue, GENERATE_FULL_COURSE_CONTENT
+from app.core.http_cache import etag_matches, text_etag
 
-from app.logic import course_logic
 from app.models.user import User as UserSchema
 
 router = APIRouter(
@@ -83,12 +87,81 @@ def read_course_detail(
 @router.get("/{course_id}/summary", response_model=str)
 async def get_course_summary(
         course_id: int,
+        request: Request,
+        response: Response,
         service: CourseService = Depends(get_course_service)
 ):
-    summary = await service.generate_course_summary(course_id)
-    if summary is None:
-        raise HTTPException(status_code=404, detail="Course not found")
-    return summary
+    """
+    Resumen del curso. Se sirve desde la base (solo se genera con IA la primera vez
+    o si cambió la descripción) y admite peticiones condicionales con If-None-Match.
+    """
+    course_summary = await service.get_course_summary(course_id)
+    if course_summary is None:
+        raise HTTPException(status_code=404, detail="Course not found or summary unavailable")
+
+    etag = text_etag(course_summary.summary)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return course_summary.summary
+
+
+@router.post("/{course_id}/summary/regenerate", response_model=str)
+async def regenerate_course_summary(
+        course_id: int,
+        response: Response,
+        service: CourseService = Depends(get_course_service),
+        current_user: PydanticUser = Depends(admin_required)
+):
+    """Vuelve a generar con IA el resumen persistido de un curso (solo administradores)."""
+    course_summary = await service.regenerate_course_summary(course_id)
+    if course_summary is None:
+        raise HTTPException(status_code=404, detail="Course not found or summary unavailable")
+    response.headers["ETag"] = text_etag(course_summary.summary)
+    return course_summary.summary
+
+
+@router.get("/{course_id}/download-pdf", response_class=FileResponse)
+async def download_course_pdf(
+        course_id: int,
+        request: Request,
+        db: Session = Depends(get_db),
+        current_user: UserSchema = Depends(get_current_active_user)
+):
+    """
+    Descarga el curso completo en un solo PDF con índice. Reutiliza el HTML
+    cacheado de cada módulo y solo vuelve a renderizar si cambió algún contenido.
+    """
+    db_course = course_repo.get_course_by_id(db, course_id)
+    if not db_course:
+        raise HTTPException(status_code=404, detail="Curso no encontrado.")
+
+    is_enrolled = enrollment_repo.is_enrolled(db, user_id=current_user.id, course_id=course_id)
+    is_instructor_or_admin = current_user.role.name in ['instructor', 'admin']
+    is_creator = db_course.creator_id == current_user.id
+    if not is_enrolled and not is_instructor_or_admin and not is_creator:
+        raise HTTPException(status_code=403, detail="No tienes permiso para descargar este curso.")
+
+    modules = [module for module in sorted(db_course.modules, key=lambda m: m.order_index) if module.content_data]
+    if not modules:
+        raise HTTPException(status_code=404, detail="El curso no tiene contenido disponible para descargar.")
+
+    content_hash = pdf_service.course_content_hash(db_course.title, modules)
+    headers = {"ETag": f'"{content_hash[:32]}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Se renderiza en el pool de procesos de PDF; FileResponse lo envía por bloques
+    pdf_path, _ = await pdf_service.get_course_pdf(db_course, modules)
+
+    return FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        filename=f"{db_course.title}.pdf",
+        headers=headers
+    )
 
 
 @router.post("/", response_model=Course, status_code=status.HTTP_201_CREATED)
@@ -141,22 +214,25 @@ async def delete_course(
     return
 
 
-@router.post("/{course_id}/generate-curriculum", response_model=List[Module])
-async def generate_course_curriculum(
+@router.post("/{course_id}/generate-curriculum", response_model=GenerationJob, status_code=status.HTTP_202_ACCEPTED)
+def generate_course_curriculum(
     # --- PARÁMETROS REORDENADOS ---
     # 1. Parámetros sin valor por defecto (vienen de la ruta)
     course_id: int,
+    response: Response,
     # 2. Parámetros con valor por defecto (vienen de la inyección de dependencias)
-    current_user: UserSchema = Depends(is_course_creator),
-    service: CourseService = Depends(get_course_service)
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(is_course_creator)
 ):
     """
-    Genera una currícula de módulos para un curso.
+    Encola la generación completa del curso (currícula, contenido, quizzes y audio).
+    Devuelve el trabajo creado; su avance se consulta en GET /jobs/{job_id}.
     """
-    modules = await service.generate_and_save_curriculum(course_id=course_id)
-    if modules is None:
-        raise HTTPException(status_code=500, detail="No se pudo generar la currícula.")
-    return modules
+    job = generation_job_repo.create_job(db, "course", created_by=current_user.id, course_id=course_id)
+    enqueue(GENERATE_FULL_COURSE_CONTENT, job.id)
+    db.refresh(job)
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
 
 
 @router.post("/modules/{module_id}/complete", status_code=status.HTTP_200_OK)
@@ -8,7 +8,7 @@ from app.dependencies import get_db
 from app.security import get_current_active_user
 from app.models.user import User as UserSchema
 from app.models.course import CourseWithProgress
-from app.repositories import enrollment_repo, progress_repo, course_repo  # Importa course_repo
+from app.repositories import enrollment_repo, course_repo  # Importa course_repo
 from app.logic import course_logic
 
 router = APIRouter(
@@ -49,13 +49,16 @@ def get_my_enrolled_courses(
         if course.id not in all_my_courses:
             all_my_courses[course.id] = course
 
+    # Progreso y estrellas de todos los cursos en consultas agrupadas;
+    # solo los cursos inscritos suman estrellas ganadas.
+    progress_by_course = course_logic.calculate_courses_progress(
+        db, list(all_my_courses.values()), current_user.id,
+        enrolled_course_ids={course.id for course in enrolled_courses}
+    )
+
     courses_with_data = []
     for course in all_my_courses.values():
-        total_modules = len(course.modules)
-        completed_modules = progress_repo.get_completed_modules_count(db, current_user.id, course.id)
-        percentage = round((completed_modules / total_modules) * 100) if total_modules > 0 else 0
-
-        total, earned = course_logic.calculate_star_rating(db, course, current_user.id)
+        progress = progress_by_course[course.id]
 
         # --- CORRECCIÓN: Construimos un diccionario primero ---
         course_data_dict = {
@@ -65,9 +68,9 @@ def get_my_enrolled_courses(
             "instructor_id": course.instructor_id,
             "level": course.level,
             "category": course.category,
-            "total_stars": total,
-            "earned_stars": earned,
-            "completion_percentage": percentage
+            "total_stars": progress["total_stars"],
+            "earned_stars": progress["earned_stars"],
+            "completion_percentage": progress["completion_percentage"]
         }
 
         # Ahora creamos el objeto Pydantic desde el diccionario completo
@@ -0,0 +1,37 @@
+# backend/app/routers/jobs.py
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.dependencies import get_db
+from app.models.generation_job import GenerationJob
+from app.models.user import User as UserSchema
+from app.repositories import generation_job_repo, enrollment_repo
+from app.security import get_current_active_user
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"]
+)
+
+
+@router.get("/{job_id}", response_model=GenerationJob)
+def read_generation_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_active_user)
+):
+    """
+    Estado de un trabajo de generación en segundo plano: etapa actual,
+    porcentaje de avance y error si falló. Pensado para consultarse periódicamente.
+    """
+    job = generation_job_repo.get_job_by_id(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado.")
+    # El audio de un módulo se comparte: quien se une a un trabajo en curso
+    # (ver generate_audio_for_module) puede seguirlo si está inscrito en el curso
+    is_shared_audio_job = job.job_type == 'module_audio' and job.course_id is not None and \
+        enrollment_repo.is_enrolled(db, user_id=current_user.id, course_id=job.course_id)
+    if job.created_by != current_user.id and current_user.role.name != 'admin' and not is_shared_audio_job:
+        raise HTTPException(status_code=403, detail="No tienes permiso para ver este trabajo.")
+    return job
@@ -1,6 +1,6 @@
 # backend/app/routers/learning_paths.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -16,7 +16,7 @@ from app.models.learning_path import (
 from app.models.user import User as UserSchema
 from app.models.course import Course as CourseSchema
 from app.security import get_current_active_user, instructor_required
-from app.services import ai_service
+from app.core.task_queue import enqueue, REFRESH_LEARNING_PATH_SUGGESTIONS
 
 router = APIRouter(
     prefix="/learning-paths",
@@ -24,6 +24,14 @@ router = APIRouter(
 )
 
 
+def _queue_suggestions_refresh(path_id: int):
+    """Encola el recálculo de las sugerencias; si el broker no responde, la petición sigue igual."""
+    try:
+        enqueue(REFRESH_LEARNING_PATH_SUGGESTIONS, path_id)
+    except Exception as e:
+        print(f"No se pudo encolar el recálculo de sugerencias de la ruta {path_id}: {e!r}")
+
+
 @router.get("/", response_model=List[LearningPathSchema])
 def read_all_learning_paths(db: Session = Depends(get_db)):
     return learning_path_repo.get_learning_paths(db)
@@ -32,6 +40,7 @@ def read_all_learning_paths(db: Session = Depends(get_db)):
 @router.get("/{path_id}", response_model=LearningPathDetail)
 def read_learning_path_details(
         path_id: int,
+        background_tasks: BackgroundTasks,
         db: Session = Depends(get_db),
         current_user: UserSchema = Depends(get_current_active_user)
 ):
@@ -39,20 +48,22 @@ def read_learning_path_details(
     if not db_path:
         raise HTTPException(status_code=404, detail="Ruta no encontrada.")
 
-    enrolled_course_ids = {e.course_id for e in current_user.enrollments}
+    sorted_associations = sorted(db_path.courses, key=lambda assoc: assoc.step)
+    # Estado del usuario en todos los cursos de la ruta con una sola consulta
+    enrolled_progress = progress_repo.get_enrolled_progress_for_courses(
+        db, current_user.id, [assoc.course_id for assoc in sorted_associations]
+    )
 
     courses_in_path = []
-    existing_titles = []
-    sorted_associations = sorted(db_path.courses, key=lambda assoc: assoc.step)
+    existing_titles = set()
 
     for assoc in sorted_associations:
         course = assoc.course
         user_status = "no_inscrito"
         if course.status == 'draft':
             user_status = 'en_desarrollo'
-        elif course.id in enrolled_course_ids:
-            completed_modules = progress_repo.get_completed_modules_count(db, current_user.id, course.id)
-            total_modules = len(course.modules)
+        elif course.id in enrolled_progress:
+            completed_modules, total_modules = enrolled_progress[course.id]
             user_status = 'terminado' if total_modules > 0 and completed_modules == total_modules else 'cursando'
 
         # Corrección del bug: Usar model_validate en lugar de __dict__
@@ -63,9 +74,17 @@ def read_learning_path_details(
             user_status=user_status
         )
         courses_in_path.append(course_with_status)
-        existing_titles.append(course.title)
-
-    suggested_titles = ai_service.suggest_missing_courses_for_path(db_path.title, existing_titles)
+        existing_titles.add(course.title.casefold())
+
+    # Sugerencias precalculadas en segundo plano; se omiten las que ya forman parte de la ruta.
+    suggested_titles = [
+        title for title in (db_path.suggestion.suggested_titles if db_path.suggestion else [])
+        if title.casefold() not in existing_titles
+    ]
+    # Las rutas que aún no las tienen (creadas antes de guardarlas) las piden una sola vez.
+    # Se encola después de responder: la visita no espera al broker (ni a la IA en modo eager).
+    if db_path.suggestion is None and learning_path_repo.mark_path_suggestions_requested(db, path_id):
+        background_tasks.add_task(_queue_suggestions_refresh, path_id)
 
     next_step = (courses_in_path[-1].step + 1) if courses_in_path else 1
     for i, title in enumerate(suggested_titles):
@@ -91,7 +110,9 @@ def create_learning_path(
         db: Session = Depends(get_db),
         current_user: UserSchema = Depends(instructor_required)
 ):
-    return learning_path_repo.create_learning_path(db=db, path=path_data)
+    db_path = learning_path_repo.create_learning_path(db=db, path=path_data)
+    _queue_suggestions_refresh(db_path.id)
+    return db_path
 
 
 @router.post("/{path_id}/courses", status_code=status.HTTP_201_CREATED)
@@ -102,9 +123,12 @@ def add_course_to_learning_path(
         current_user: UserSchema = Depends(instructor_required)
 ):
     """Añade un curso existente a una ruta de conocimiento en un paso específico."""
-    return learning_path_repo.add_course_to_path(
+    db_assoc = learning_path_repo.add_course_to_path(
         db, path_id, path_course.course_id, path_course.step
     )
+    # La lista de cursos cambió: las sugerencias de la IA se recalculan en segundo plano
+    _queue_suggestions_refresh(path_id)
+    return db_assoc
 
 
 @router.delete("/{path_id}", status_code=status.HTTP_204_NO_CONTENT)
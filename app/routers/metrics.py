@@ -0,0 +1,29 @@
+# backend/app/routers/metrics.py
+
+from fastapi import APIRouter, Depends
+
+from app.core.ai_cache import response_cache
+from app.core.pool_metrics import pool_stats
+from app.database import engine
+from app.security import admin_required
+
+router = APIRouter(
+    prefix="/internal/metrics",
+    tags=["Internal Metrics"],
+    dependencies=[Depends(admin_required)]
+)
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics():
+    """
+    Estado del pool de conexiones de la base de datos: conexiones en uso,
+    overflow y el histograma de espera por conexión, para dimensionar el pool.
+    """
+    return pool_stats.snapshot(engine.pool)
+
+
+@router.get("/ai-cache")
+def get_ai_cache_metrics():
+    """Aciertos, fallos y tamaño de la caché de respuestas de Gemini."""
+    return response_cache.stats()
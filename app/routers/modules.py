@@ -1,21 +1,21 @@
 # backend/app/routers/modules.py
 
 # --- FastAPI & SQLAlchemy ---
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse # Import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-import markdown # Import markdown
-from weasyprint import HTML # Import HTML from WeasyPrint
-import io # Import io
 
 # --- Modelos Pydantic ---
 from app.models.module import ModuleResponse as ModuleSchema
 from app.models.user import User as UserSchema
+from app.models.generation_job import GenerationJob
 
 # --- Dependencias, Repositorios y Servicios ---
-from app.dependencies import get_db, get_module_service
-from app.repositories import module_repo, enrollment_repo
-from app.services.module_service import ModuleService
+from app.dependencies import get_db
+from app.repositories import module_repo, enrollment_repo, generation_job_repo
+from app.services import pdf_service
+from app.core.http_cache import etag_matches
+from app.core.task_queue import enqueue, GENERATE_MODULE_CONTENT, GENERATE_MODULE_AUDIO
 from app.security import instructor_required, get_current_active_user, can_edit_module, is_enrolled_in_course_from_module
 
 router = APIRouter(
@@ -47,34 +47,55 @@ def read_module(
 
     return db_module
 
-@router.post("/{module_id}/generate-content", response_model=ModuleSchema)
-async def generate_content_for_module(
+@router.post("/{module_id}/generate-content", response_model=GenerationJob, status_code=202)
+def generate_content_for_module(
     module_id: int,
-    service: ModuleService = Depends(get_module_service),
+    response: Response,
+    db: Session = Depends(get_db),
     # Reemplaza 'instructor_required' con la nueva dependencia
     current_user: UserSchema = Depends(is_enrolled_in_course_from_module)
 ):
-    """Genera y guarda el contenido detallado para un módulo usando IA."""
-    updated_module = await service.generate_and_save_content(module_id)
-    if not updated_module:
-        raise HTTPException(status_code=500, detail="Failed to generate content")
-    return updated_module
-
-@router.post("/{module_id}/generate-audio", response_model=ModuleSchema)
-async def generate_audio_for_module(
+    """Encola la generación del contenido y el quiz de un módulo usando IA."""
+    db_module = module_repo.get_module_by_id(db, module_id=module_id)
+    if db_module is None:
+        raise HTTPException(status_code=404, detail="Módulo no encontrado")
+
+    job = generation_job_repo.create_job(
+        db, "module_content", created_by=current_user.id, course_id=db_module.course_id, module_id=module_id
+    )
+    enqueue(GENERATE_MODULE_CONTENT, job.id)
+    db.refresh(job)
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
+
+@router.post("/{module_id}/generate-audio", response_model=GenerationJob, status_code=202)
+def generate_audio_for_module(
     module_id: int,
-    service: ModuleService = Depends(get_module_service),
+    response: Response,
+    db: Session = Depends(get_db),
     current_user: UserSchema = Depends(get_current_active_user)
 ):
-    """Genera y guarda el audio para un módulo usando IA."""
-    updated_module = await service.generate_and_save_audio(module_id)
-    if not updated_module:
-        raise HTTPException(status_code=500, detail="Failed to generate audio")
-    return updated_module
+    """Encola la generación del audio de un módulo."""
+    db_module = module_repo.get_module_by_id(db, module_id=module_id)
+    if db_module is None:
+        raise HTTPException(status_code=404, detail="Módulo no encontrado")
+    if not db_module.content_data:
+        raise HTTPException(status_code=400, detail="El módulo no tiene contenido para generar audio.")
 
-@router.get("/{module_id}/download-pdf", response_class=StreamingResponse)
+    # Un segundo clic se une al trabajo que ya está en curso en lugar de generar otra vez
+    job, created = generation_job_repo.get_or_create_module_job(
+        db, "module_audio", created_by=current_user.id, course_id=db_module.course_id, module_id=module_id
+    )
+    if created:
+        enqueue(GENERATE_MODULE_AUDIO, job.id)
+        db.refresh(job)
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return job
+
+@router.get("/{module_id}/download-pdf", response_class=FileResponse)
 async def download_module_pdf(
     module_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: UserSchema = Depends(get_current_active_user)
 ):
@@ -95,57 +116,18 @@ async def download_module_pdf(
     if not db_module.content_data:
         raise HTTPException(status_code=404, detail="Contenido del módulo no disponible para descargar.")
 
-    # Convert Markdown to HTML
-    html_content = markdown.markdown(db_module.content_data)
-
-    # Basic HTML template for PDF
-    html_template = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{db_module.title}</title>
-        <style>
-            @page {{
-                @bottom-center {{
-                    content: "www.zeronacademy.com";
-                    color: #888;
-                    font-size: 10px;
-                }}
-            }}
-            body {{ font-family: sans-serif; margin: 20mm; }}
-            h1 {{ color: #333; }}
-            pre {{ background-color: #eee; padding: 10px; border-radius: 5px; overflow-x: auto; }}
-            .watermark {{
-                position: fixed;
-                top: 50%;
-                left: 50%;
-                transform: translate(-50%, -50%) rotate(-45deg);
-                color: rgba(0, 0, 0, 0.08);
-                font-size: 72px;
-                font-weight: bold;
-                white-space: nowrap;
-                z-index: 1000;
-                pointer-events: none;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="watermark">www.zeronacademy.com</div>
-        <h1>{db_module.title}</h1>
-        <p><strong>Descripción:</strong> {db_module.description}</p>
-        <hr/>
-        {html_content}
-    </body>
-    </html>
-    """
-
-    # Generate PDF
-    pdf_file = io.BytesIO()
-    HTML(string=html_template).write_pdf(pdf_file)
-    pdf_file.seek(0)
-
-    return StreamingResponse(
-        pdf_file,
+    # El ETag es la huella del contenido: se responde 304 sin tocar el PDF
+    content_hash = pdf_service.module_content_hash(db_module.title, db_module.description, db_module.content_data)
+    headers = {"ETag": f'"{content_hash[:32]}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    # Renderiza en el pool de procesos solo si no está en el caché de disco
+    pdf_path, _ = await pdf_service.get_module_pdf(db_module)
+
+    return FileResponse(
+        pdf_path,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=\"{db_module.title}.pdf\""}
+        filename=f"{db_module.title}.pdf",
+        headers=headers
     )
@@ -4,13 +4,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.services import ai_service
+from app.services.motivation_service import phrase_pool
 from app.dependencies import get_db
-from app.repositories import quiz_repo, progress_repo, module_repo, course_repo
-from app.security import get_current_active_user
+from app.repositories import quiz_repo, progress_repo, enrollment_repo
+from app.security import get_current_active_user, is_module_course_owner
 from app.models.user import User as UserSchema
-from app.models.quiz import QuizSchema, QuizSubmission, QuizResultDetailed, QuizStatus
-from app.logic import course_logic
+from app.models.quiz import QuizSchema, QuizSubmission, QuizResultDetailed, QuizStatus, QuizBulkSubmission, BulkQuizResult
+from app.logic import course_logic, quiz_logic
 
 router = APIRouter(
     prefix="/quizzes",
@@ -41,49 +41,78 @@ def submit_quiz(
 ):
     # Restriction removed: No limit on quiz attempts
 
-    correct_answers = quiz_repo.get_correct_answers_for_module(db, module_id)
-    score_count = 0
-    detailed_results = []
-    for q_id, user_opt_id in submission.answers.items():
-        correct_opt_id = correct_answers.get(int(q_id))
-        is_correct = (int(user_opt_id) == correct_opt_id)
-        if is_correct:
-            score_count += 1
-        detailed_results.append({
-            "question_id": int(q_id), "user_option_id": int(user_opt_id),
-            "correct_option_id": correct_opt_id, "is_correct": is_correct
-        })
-
-    total_questions = len(correct_answers)
-    final_score = round((score_count / total_questions) * 100) if total_questions > 0 else 0
-    passed = final_score >= 55
-
-    quiz_repo.create_quiz_attempt(db, user_id=current_user.id, module_id=module_id, score=final_score, passed=passed)
+    # Clave compilada y cacheada: normalmente no consulta la base
+    answer_key = quiz_repo.get_answer_key(db, module_id)
+    if answer_key is None:
+        raise HTTPException(status_code=404, detail="Módulo no encontrado.")
+
+    result = quiz_logic.grade_submission(answer_key, submission.answers)
+    final_score, passed = result["score"], result["passed"]
+
+    quiz_repo.create_quiz_attempt(
+        db, user_id=current_user.id, module_id=module_id, score=final_score, passed=passed,
+        course_id=answer_key.course_id
+    )
 
     if passed:
         progress_repo.mark_module_as_completed(db, user_id=current_user.id, module_id=module_id)
 
     # --- LÓGICA AÑADIDA Y CORREGIDA ---
-    motivational_phrase = ai_service.generate_motivational_phrase(final_score, passed)
+    motivational_phrase = phrase_pool.get_phrase(final_score, passed)
 
-    module = module_repo.get_module_by_id(db, module_id)
-    course = course_repo.get_course_by_id(db, module.course_id)
-    total_stars, earned_stars = course_logic.calculate_star_rating(db, course, current_user.id)
+    # Las estrellas ganadas solo cuentan para los alumnos inscritos en el curso
+    total_stars = course_logic.get_total_stars(answer_key.course_level)
+    earned_stars = 0
+    if enrollment_repo.is_enrolled(db, user_id=current_user.id, course_id=answer_key.course_id):
+        avg_score = quiz_repo.get_average_quiz_score(db, current_user.id, answer_key.course_id)
+        earned_stars = course_logic.get_earned_stars(total_stars, avg_score)
 
-    incorrect_count = total_questions - score_count
     return {
-        "score": final_score,
-        "passed": passed,
-        "total_questions": total_questions,
-        "correct_count": score_count,
-        "incorrect_count": incorrect_count,
-        "detailed_results": detailed_results,
+        **result,
         "motivational_phrase": motivational_phrase,
         "course_total_stars": total_stars,
         "course_earned_stars": earned_stars,
-        
     }
 
+
+@router.post("/module/{module_id}/submit-bulk", response_model=List[BulkQuizResult])
+def submit_quiz_bulk(
+        module_id: int,
+        bulk: QuizBulkSubmission,
+        db: Session = Depends(get_db),
+        current_user: UserSchema = Depends(is_module_course_owner)
+):
+    """
+    Corrige de una vez las entregas de un examen supervisado y guarda todos los
+    intentos en una sola transacción. Solo el instructor o creador del curso (o un
+    admin) puede cargarlas, y todos los alumnos deben estar inscritos en el curso.
+    """
+    answer_key = quiz_repo.get_answer_key(db, module_id)
+    if answer_key is None:
+        raise HTTPException(status_code=404, detail="Módulo no encontrado.")
+
+    user_ids = [item.user_id for item in bulk.submissions]
+    if len(set(user_ids)) != len(user_ids):
+        raise HTTPException(status_code=400, detail="Cada alumno puede aparecer una sola vez por envío.")
+    not_enrolled = set(user_ids) - enrollment_repo.get_enrolled_user_ids(db, answer_key.course_id, user_ids)
+    if not_enrolled:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Alumnos no inscritos en el curso: {sorted(not_enrolled)}"
+        )
+
+    results = []
+    for item in bulk.submissions:
+        result = quiz_logic.grade_submission(answer_key, item.answers)
+        results.append({"user_id": item.user_id, **result})
+
+    quiz_repo.create_graded_attempts(
+        db, module_id, answer_key.course_id,
+        [(result["user_id"], result["score"], result["passed"]) for result in results]
+    )
+    return results
+
+
 @router.get("/module/{module_id}/status", response_model=QuizStatus)
 def get_quiz_status(
     module_id: int,
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List
 
 from app.dependencies import get_db
 from app.security import get_current_active_user
 from app.models.user import User as UserSchema
-from app.models.rating import RatingCreate, RatingResponse, RatingCounts
+from app.models.rating import RatingCreate, RatingResponse, RatingCounts, CourseRatingCounts
 from app.repositories import rating_repo
 
 router = APIRouter(
@@ -93,3 +93,12 @@ def get_course_rating_counts_public(
         return RatingCounts(**counts, user_rating=None) # user_rating is not applicable for public counts
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/courses/counts", response_model=List[CourseRatingCounts])
+def get_courses_rating_counts_public(
+    course_ids: List[int] = Query(..., max_length=100),
+    db: Session = Depends(get_db)
+):
+    """Conteos de votos de varios cursos en una sola llamada (páginas de catálogo)."""
+    counts = rating_repo.get_course_rating_counts_bulk(db, course_ids)
+    return [CourseRatingCounts(course_id=course_id, **course_counts) for course_id, course_counts in counts.items()]
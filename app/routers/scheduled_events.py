@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.dependencies import get_db
-from app.repositories import scheduled_event_repo, room_repo, event_invitation_repo, notification_repo
+from app.repositories import scheduled_event_repo, room_repo
 from app.security import instructor_required, get_current_active_user
 from app.models.user import User as UserSchema
 from app.models.scheduled_event import ScheduledEvent, ScheduledEventCreate
@@ -20,21 +20,13 @@ def create_scheduled_event(
     if not room or room.instructor_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permiso para programar eventos en esta sala.")
 
+    # Evento, invitaciones y notificaciones en una sola transacción
     db_event = scheduled_event_repo.create_scheduled_event(
-        db, room_id=event.room_id, creator_id=current_user.id, title=event.title, start_time=event.start_time, end_time=event.end_time, event_type=event.event_type
+        db, room_id=event.room_id, creator_id=current_user.id, title=event.title, start_time=event.start_time, end_time=event.end_time, event_type=event.event_type,
+        invited_user_ids=event.invited_user_ids,
+        invitation_message=f"Has sido invitado al evento '{event.title}' en la sala '{room.name}'."
     )
 
-    # Create invitations for invited users
-    for user_id in event.invited_user_ids:
-        event_invitation_repo.create_event_invitation(db, event_id=db_event.id, user_id=user_id)
-        # Create a notification for the invited user
-        notification_repo.create_notification(
-            db,
-            user_id=user_id,
-            message=f"Has sido invitado al evento '{event.title}' en la sala '{room.name}'.",
-            link_url=f"/calendar?event_id={db_event.id}" # Assuming a link to the event in the calendar
-        )
-
     return db_event
 
 @router.get("/user-events", response_model=List[ScheduledEvent])
@@ -1,17 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
 from datetime import datetime
-import difflib # Re-added this import
 from app.security import get_current_active_user
 from app.models.user import User as PydanticUser # Assuming User model is in app.models.user
 
 from .. import db_models
+from ..core.suggestion_index import suggestion_index
 from ..dependencies import get_db
+from ..repositories import suggestion_repo
 
 router = APIRouter()
 
+# Similitud mínima (SequenceMatcher.ratio) para fusionar una sugerencia con otra existente
+MERGE_CUTOFF = 0.8
+# Votos con los que una sugerencia pasa a 'course_created'
+COURSE_CREATION_VOTES = 100
+
 # Pydantic models
 class CourseSuggestionBase(BaseModel):
     topic: str
@@ -35,30 +41,32 @@ def create_course_suggestion(suggestion: CourseSuggestionCreate, db: Session = D
     print(f"Received new course suggestion: {suggestion.topic}")
 
     # Merging logic: Check for similar existing suggestions
-    all_suggestions = db.query(db_models.CourseSuggestion).all()
-    new_topic_lower = suggestion.topic.lower()
-    
-    # Define a similarity cutoff for merging (e.g., 0.8 for strong similarity)
-    MERGE_CUTOFF = 0.8
-
-    for existing_sugg in all_suggestions:
-        # Use SequenceMatcher to calculate similarity ratio
-        similarity_ratio = difflib.SequenceMatcher(None, new_topic_lower, existing_sugg.topic.lower()).ratio()
-        
-        if similarity_ratio >= MERGE_CUTOFF:
-            print(f"Merging '{suggestion.topic}' with existing suggestion '{existing_sugg.topic}' (Similarity: {similarity_ratio:.2f})")
-            existing_sugg.votes += 1
-            db.commit()
-            db.refresh(existing_sugg)
-            return existing_sugg # Return the merged suggestion
+    _sync_suggestion_index(db)
+    # El índice compara los temas normalizados con SequenceMatcher.ratio() (ver SuggestionIndex)
+    best_match = suggestion_index.best_match(suggestion.topic, MERGE_CUTOFF)
+
+    if best_match:
+        best_match_id, best_ratio = best_match
+        # Fusionar cuenta como un voto para la sugerencia existente
+        merged = _vote(db, best_match_id)
+        if merged:
+            print(f"Merging '{suggestion.topic}' with existing suggestion '{merged.topic}' (Similarity: {best_ratio:.2f})")
+            return merged # Return the merged suggestion
 
     # If no similar suggestion found, create a new one
-    db_suggestion = db_models.CourseSuggestion(topic=suggestion.topic)
-    db.add(db_suggestion)
-    db.commit()
-    db.refresh(db_suggestion)
+    db_suggestion = suggestion_repo.create_suggestion(db, suggestion.topic)
+    suggestion_index.add(db_suggestion.id, db_suggestion.topic)
     return db_suggestion
 
+def _sync_suggestion_index(db: Session):
+    """Pone al día el índice de temas; la primera vez y cada tanto lo recarga con toda la tabla."""
+    if suggestion_index.needs_reload():
+        suggestion_index.reload(suggestion_repo.get_all_topics(db))
+    else:
+        suggestion_index.add_many(
+            suggestion_repo.get_topics_after(db, suggestion_index.last_id, suggestion_index.missing_ids())
+        )
+
 @router.get("/suggestions", response_model=List[CourseSuggestion])
 def get_course_suggestions(db: Session = Depends(get_db)):
     suggestions = db.query(db_models.CourseSuggestion).order_by(db_models.CourseSuggestion.votes.desc()).all()
@@ -66,33 +74,28 @@ def get_course_suggestions(db: Session = Depends(get_db)):
 
 @router.post("/suggestions/{suggestion_id}/vote", response_model=CourseSuggestion)
 def vote_for_suggestion(suggestion_id: int, db: Session = Depends(get_db)):
-    db_suggestion = db.query(db_models.CourseSuggestion).filter(db_models.CourseSuggestion.id == suggestion_id).first()
+    db_suggestion = _vote(db, suggestion_id)
     if not db_suggestion:
         raise HTTPException(status_code=404, detail="Suggestion not found.")
+    return db_suggestion
 
-    db_suggestion.votes += 1
-    db.commit()
-    db.refresh(db_suggestion)
+def _vote(db: Session, suggestion_id: int):
+    db_suggestion, crossed_threshold = suggestion_repo.add_vote(db, suggestion_id, COURSE_CREATION_VOTES)
 
     # Placeholder for AI course creation trigger
-    if db_suggestion.votes >= 100:
+    if crossed_threshold:
+        # Solo el voto que cruzó el umbral llega aquí, aunque haya votos concurrentes
         print(f"AI should create a course for: {db_suggestion.topic}")
         # In a real application, you would trigger an AI service here
-        db_suggestion.status = "course_created"
-        db.commit()
-        db.refresh(db_suggestion)
 
     return db_suggestion
 
 @router.get("/suggestions/search", response_model=List[CourseSuggestion])
-def search_course_suggestions(query: str, db: Session = Depends(get_db)):
-    query_lower = query.lower()
-    
-    # Filter suggestions where the topic (lowercase) contains the query (lowercase)
-    matched_suggestions = [
-        s for s in db.query(db_models.CourseSuggestion).all() 
-        if query_lower in s.topic.lower()
-    ]
-    
-    return matched_suggestions
-
+def search_course_suggestions(
+    query: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    # Búsqueda en la base (índice FULLTEXT), ordenada por relevancia y votos
+    return suggestion_repo.search_suggestions(db, query, skip=skip, limit=limit)
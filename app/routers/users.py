@@ -14,7 +14,7 @@ from app.models.user import User as PydanticUser, UserCreate
 # --- Repositorio y Dependencias ---
 from app.repositories import user_repo
 from app.dependencies import get_db, get_course_service
-from app.security import get_current_active_user, instructor_required, is_owner_or_instructor
+from app.security import get_current_active_user, get_current_active_user_async, instructor_required, is_owner_or_instructor
 from app.services.course_service import CourseService
 
 router = APIRouter(
@@ -26,7 +26,7 @@ router = APIRouter(
 
 # --- Ruta para obtener el usuario logueado ---
 @router.get("/me", response_model=UserSchema)
-async def read_users_me(current_user: UserSchema = Depends(get_current_active_user)):
+async def read_users_me(current_user: UserSchema = Depends(get_current_active_user_async)):
     """Obtiene los datos del usuario actualmente autenticado."""
     return current_user
 
@@ -85,7 +85,7 @@ def delete_existing_user(
 
 @router.get("/me/courses", response_model=List[CourseSchema])
 async def read_my_courses(
-    current_user: PydanticUser = Depends(get_current_active_user),
+    current_user: PydanticUser = Depends(get_current_active_user_async),
     service: CourseService = Depends(get_course_service)
 ):
     """Obtiene todos los cursos del instructor o admin actualmente logueado."""
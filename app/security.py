@@ -1,16 +1,18 @@
 # backend/app/security.py
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from app.core.hashing import verify_password
+from app.core.hashing import verify_password_async
 from app.config import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
-from app.dependencies import get_db
-from app.repositories import user_repo, course_repo, module_repo, enrollment_repo
-from app.models.user import User as PydanticUser
+from app.dependencies import get_db, get_async_db
+from app.repositories import user_repo, course_repo, module_repo, enrollment_repo, async_user_repo
+from app.models.user import User as PydanticUser, CurrentUser
+from app.core import user_cache
 
 # --- Configuración ---
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
@@ -29,14 +31,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 # --- Funciones de Autenticación y Dependencias ---
-def authenticate_user(db: Session, username: str, password: str):
-    user = user_repo.get_user_by_username(db, username=username)
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user_async(db: AsyncSession, username: str, password: str):
+    """Valida usuario y contraseña sin bloquear el event loop: consulta async y bcrypt en su pool de hilos."""
+    user = await async_user_repo.get_user_by_username(db, username=username)
+    if not user or not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def _get_username_from_token(token: str) -> str:
+    """Decodifica el JWT y devuelve el 'sub'; lanza 401 si el token no es válido."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -49,10 +53,27 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    return username
 
-    user = user_repo.get_user_by_username(db, username=username)
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> CurrentUser:
+    """
+    Devuelve la versión compacta del usuario autenticado (id, username, rol, activo).
+    Se guarda en una caché TTL por 'sub' del token, así las peticiones siguientes
+    no consultan la base; user_repo la invalida al actualizar, borrar o activar usuarios.
+    """
+    username = _get_username_from_token(token)
+    user = user_cache.get_cached_user(username)
     if user is None:
-        raise credentials_exception
+        user = user_repo.get_user_principal_by_username(db, username=username)
+        if user is not None:
+            user_cache.set_cached_user(user)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -60,6 +81,23 @@ async def get_current_active_user(current_user: PydanticUser = Depends(get_curre
     return current_user
 
 
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Igual que get_current_user pero con la sesión asíncrona (rol y perfil ya cargados)."""
+    username = _get_username_from_token(token)
+    user = await async_user_repo.get_user_by_username(db, username=username)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def get_current_active_user_async(current_user: PydanticUser = Depends(get_current_user_async)):
+    return current_user
+
+
 # --- ESTA ES LA FUNCIÓN CORREGIDA ---
 async def instructor_required(current_user: PydanticUser = Depends(get_current_active_user)):
     """
@@ -169,6 +207,27 @@ async def is_module_course_creator(
         raise HTTPException(status_code=403, detail="Solo el creador del curso o un administrador puede realizar esta acción.")
     return current_user
 
+async def is_module_course_owner(
+    module_id: int,
+    db: Session = Depends(get_db),
+    current_user: PydanticUser = Depends(get_current_active_user)
+):
+    """
+    Verifica si el usuario actual es el instructor o el creador del curso al que
+    pertenece el módulo, o si es admin.
+    """
+    module = module_repo.get_module_by_id(db, module_id)
+    if not module:
+        raise HTTPException(status_code=404, detail="Módulo no encontrado")
+
+    course = module.course
+    is_owner = current_user.id in (course.instructor_id, course.creator_id)
+    is_admin = current_user.role.name == "admin"
+
+    if not is_owner and not is_admin:
+        raise HTTPException(status_code=403, detail="Solo el instructor del curso o un administrador puede realizar esta acción.")
+    return current_user
+
 async def is_enrolled_in_course_from_module(
     module_id: int,
     db: Session = Depends(get_db),
@@ -1,53 +1,57 @@
 # backend/app/services/ai_service.py
 
 import google.generativeai as genai
+import asyncio
 import json
-from sqlalchemy.orm import Session
 from typing import List, Optional
-from app import db_models
-from app.repositories import course_repo
-from app.config import GOOGLE_API_KEY
-from gtts import gTTS
-import os
-import re
+from app.config import GOOGLE_API_KEY, AI_MAX_CONCURRENCY, AI_REQUEST_TIMEOUT_SECONDS, AI_MAX_RETRIES
+from app.core.ai_cache import response_cache, make_cache_key
+
+# Texto que devuelve generate_module_content_from_ai cuando la llamada falla
+MODULE_CONTENT_ERROR = "Error al generar contenido."
+
+MODEL_NAME = 'gemini-1.5-flash'
 
 # Configura la API key de forma segura al iniciar el servicio
 try:
     genai.configure(api_key=GOOGLE_API_KEY)
-    model = genai.GenerativeModel('gemini-1.5-flash')
+    model = genai.GenerativeModel(MODEL_NAME)
 except Exception as e:
     print(f"Error fatal al configurar la API de Google: {e}")
     model = None
 
-def generate_audio_from_text(text: str, module_id: int) -> Optional[str]:
-    """Genera un archivo de audio a partir de texto y lo guarda."""
-    if not text:
-        return None
 
-    try:
-        # Eliminar bloques de código (```...```)
-        processed_text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-        # Eliminar otros elementos de Markdown (encabezados, negritas, cursivas, listas)
-        processed_text = re.sub(r'[#*_-]', '', processed_text) # Elimina #, *, _, -
-        processed_text = re.sub(r'\[(.*?)\]\(.*\)', r'\1', processed_text) # Elimina enlaces [texto](url)
-        processed_text = re.sub(r'\n+', ' ', processed_text).strip() # Reemplaza múltiples saltos de línea con un espacio
-
-        # Crea el directorio si no existe
-        output_dir = "static/audio/modules"
-        os.makedirs(output_dir, exist_ok=True)
-
-        # Genera el nombre del archivo
-        file_path = os.path.join(output_dir, f"{module_id}.mp3")
-
-        # Crea el objeto gTTS y guarda el archivo
-        tts = gTTS(text=processed_text, lang='es')
-        tts.save(file_path)
-
-        # Devuelve la ruta del archivo para guardarla en la BD
-        return file_path
-    except Exception as e:
-        print(f"Error al generar el audio: {e}")
-        return None
+def _parse_json_response(text: str) -> dict:
+    """Limpia los bloques ```json``` de la respuesta y la parsea."""
+    return json.loads(text.strip().replace("```json", "").replace("```", ""))
+
+
+def _parse_curriculum_response(text: str) -> dict:
+    """Como _parse_json_response, pero una currícula sin módulos es un error (no se cachea)."""
+    data = _parse_json_response(text)
+    if not data.get("modules"):
+        raise ValueError("La respuesta no contiene módulos.")
+    return data
+
+
+def _generate_cached(prompt: str, parse=None, use_cache: bool = True, store: bool = True):
+    """
+    Llama a Gemini pasando antes por la caché de respuestas (clave: modelo + prompt).
+    Solo se guarda el texto de las respuestas que `parse` acepta, para no cachear
+    errores ni JSON inválido. Con use_cache=False se fuerza una respuesta nueva,
+    que reemplaza a la cacheada; con store=False no se guarda (llamadas que
+    nunca leen la caché).
+    """
+    key = make_cache_key(MODEL_NAME, prompt)
+    text = response_cache.get(key) if use_cache else None
+    if text is not None:
+        return parse(text) if parse else text
+
+    text = model.generate_content(prompt).text.strip()
+    result = parse(text) if parse else text
+    if store:
+        response_cache.set(key, text)
+    return result
 
 
 def generate_student_alert(student_name: str, course_title: str, progress_percentage: int) -> str:
@@ -70,9 +74,10 @@ def generate_student_alert(student_name: str, course_title: str, progress_percen
         return "Hubo un problema al generar el consejo de la IA. Por favor, inténtalo más tarde."
 
 
-def generate_curriculum_from_ai(course_title: str, course_description: str) -> dict:
+def generate_curriculum_from_ai(course_title: str, course_description: str, use_cache: bool = True) -> dict:
     """
     Usa Gemini para generar una currícula de curso en formato JSON, incluyendo diagramas Mermaid.
+    Con use_cache=False se pide una currícula nueva aunque haya una cacheada.
     """
     if not model: return {"modules": []}
     prompt = f"""
@@ -101,36 +106,89 @@ def generate_curriculum_from_ai(course_title: str, course_description: str) -> d
     """
 
     try:
-        response = model.generate_content(prompt)
-        # Limpia la respuesta para asegurar que sea solo JSON
-        cleaned_response = response.text.strip().replace("```json", "").replace("```", "")
-        return json.loads(cleaned_response)
+        return _generate_cached(prompt, parse=_parse_curriculum_response, use_cache=use_cache)
     except (json.JSONDecodeError, Exception) as e:
         print(f"Error al generar o parsear la currícula de la IA: {e}")
         return {"modules": []}  # Devuelve una estructura vacía en caso de error
 
 
-def generate_quiz_from_ai(module_title: str, module_description: str) -> dict:
-    """Usa Gemini para generar un quiz para un módulo en formato JSON."""
-    if not model: return {"questions": []}
-    prompt = f"""
+def _build_quiz_prompt(module_title: str, module_description: str) -> str:
+    return f"""
     Actúa como un experto en evaluación educativa. Para un módulo con el título "{module_title}" y descripción "{module_description}", crea un mini-quiz.
     Tu respuesta DEBE ser un objeto JSON válido y nada más, con una clave "questions" que sea un array.
     Cada pregunta debe tener "question_text" y un array "options" con 4 objetos.
     Cada opción debe tener "option_text" y "is_correct" (boolean, solo una true).
     Genera 5 preguntas.
     """
+
+
+def generate_quiz_from_ai(module_title: str, module_description: str) -> dict:
+    """Usa Gemini para generar un quiz para un módulo en formato JSON."""
+    if not model: return {"questions": []}
+    prompt = _build_quiz_prompt(module_title, module_description)
     try:
-        response = model.generate_content(prompt)
-        cleaned_response = response.text.strip().replace("```json", "").replace("```", "")
-        return json.loads(cleaned_response)
+        return _generate_cached(prompt, parse=_parse_json_response)
     except Exception as e:
         print(f"Error al generar quiz de IA: {e}")
         return {"questions": []}
 
 
-def generate_module_content_from_ai(module_title: str, module_description: str) -> str:
-    """Usa Gemini para generar el contenido de una lección en formato Markdown."""
+async def _generate_json_async(prompt: str) -> dict:
+    """
+    Llamada asíncrona a Gemini (con caché) que devuelve el JSON de la respuesta. Cada intento
+    tiene su propio timeout; los errores de red y el JSON inválido se reintentan
+    con backoff exponencial (1s, 2s, 4s...). Si se agotan los intentos, relanza el error.
+    """
+    key = make_cache_key(MODEL_NAME, prompt)
+    cached = await asyncio.to_thread(response_cache.get, key)
+    if cached is not None:
+        return _parse_json_response(cached)
+
+    for attempt in range(1, AI_MAX_RETRIES + 1):
+        try:
+            response = await asyncio.wait_for(model.generate_content_async(prompt), timeout=AI_REQUEST_TIMEOUT_SECONDS)
+            text = response.text.strip()
+            result = _parse_json_response(text)
+            await asyncio.to_thread(response_cache.set, key, text)
+            return result
+        except Exception as e:
+            if attempt == AI_MAX_RETRIES:
+                raise
+            print(f"Intento {attempt}/{AI_MAX_RETRIES} fallido en la llamada a Gemini: {e!r}. Reintentando...")
+            await asyncio.sleep(2 ** (attempt - 1))
+
+
+async def generate_quizzes_from_ai(modules: List[tuple]) -> dict:
+    """
+    Genera en paralelo los quizzes de varios módulos, con como máximo
+    AI_MAX_CONCURRENCY llamadas a Gemini en vuelo.
+
+    Recibe una lista de (module_id, title, description) y devuelve
+    {module_id: questions}; los módulos cuyo quiz falló quedan con una lista vacía.
+    """
+    if not model:
+        return {module_id: [] for module_id, _, _ in modules}
+
+    semaphore = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+
+    async def _generate(module_id: int, title: str, description: str):
+        async with semaphore:
+            try:
+                quiz_content = await _generate_json_async(_build_quiz_prompt(title, description))
+                return module_id, quiz_content.get("questions", [])
+            except Exception as e:
+                print(f"Error al generar quiz de IA para el módulo {module_id}: {e!r}")
+                return module_id, []
+
+    results = await asyncio.gather(*(_generate(*module) for module in modules))
+    return dict(results)
+
+
+def generate_module_content_from_ai(module_title: str, module_description: str, use_cache: bool = True) -> str:
+    """
+    Usa Gemini para generar el contenido de una lección en formato Markdown.
+    Con use_cache=False se pide un contenido nuevo aunque haya uno cacheado.
+    """
     prompt = f"""
     Actúa como un educador experto en tecnología. Escribe el contenido completo para una lección de un curso.
 
@@ -147,15 +205,14 @@ def generate_module_content_from_ai(module_title: str, module_description: str)
     No incluyas el título principal del módulo en tu respuesta, solo el contenido de la lección.
     """
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return _generate_cached(prompt, use_cache=use_cache)
     except Exception as e:
         print(f"Error al generar el contenido del módulo: {e}")
-        return "Error al generar contenido."
+        return MODULE_CONTENT_ERROR
 
 
-def generate_course_summary_from_ai(title: str, description: str) -> str:
-    """Genera un resumen de objetivos del curso en formato Markdown."""
+def generate_course_summary_from_ai(title: str, description: str, use_cache: bool = True) -> Optional[str]:
+    """Genera un resumen de objetivos del curso en formato Markdown. Devuelve None si falla."""
     prompt = f"""
     Actúa como un asesor académico. Para un curso con el siguiente título y descripción, redacta un resumen atractivo y conciso.
 
@@ -169,10 +226,10 @@ def generate_course_summary_from_ai(title: str, description: str) -> str:
     - Un párrafo corto describiendo el perfil del estudiante ideal.
     """
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return _generate_cached(prompt, use_cache=use_cache)
     except Exception as e:
-        return f"Error al generar el resumen: {e}"
+        print(f"Error al generar el resumen del curso: {e}")
+        return None
 
 
 def suggest_missing_courses_for_path(path_title: str, existing_courses: List[str]) -> List[str]:
@@ -197,62 +254,59 @@ def suggest_missing_courses_for_path(path_title: str, existing_courses: List[str
     }}
     """
     try:
-        response = model.generate_content(prompt)
-        cleaned_response = response.text.strip().replace("```json", "").replace("```", "")
-        data = json.loads(cleaned_response)
+        data = _generate_cached(prompt, parse=_parse_json_response)
         return data.get("suggested_courses", [])
     except Exception as e:
         print(f"Error al sugerir cursos: {e}")
         return []
 
 
-def get_course_recommendations(db: Session, enrolled_titles: List[str]) -> List[db_models.Course]:
+def rerank_course_recommendations(enrolled_titles: List[str], candidate_titles: List[str]) -> List[str]:
     """
-    Basado en los cursos de un alumno, la IA recomienda otros cursos de la plataforma.
+    Re-ranker opcional del recomendador local: la IA ordena los candidatos ya
+    preseleccionados según los cursos del alumno. Devuelve [] si falla.
     """
-    # Obtenemos todos los cursos disponibles que no está tomando el alumno
-    all_courses = course_repo.get_all_courses(db)
-    available_courses = [c for c in all_courses if c.title not in enrolled_titles]
-    available_titles = [c.title for c in available_courses]
-
-    if not available_courses:
+    if not candidate_titles:
         return []
 
     prompt = f"""
     Actúa como un orientador académico en una plataforma de e-learning de tecnología.
     Un estudiante está actualmente inscrito en los siguientes cursos: {', '.join(enrolled_titles)}.
-    La lista de otros cursos disponibles en la plataforma es: {', '.join(available_titles)}.
+    Estos son los cursos candidatos para recomendarle: {', '.join(candidate_titles)}.
 
-    Basado en sus intereses actuales, recomienda 2 o 3 cursos de la lista de disponibles que serían el siguiente paso lógico en su aprendizaje.
+    Ordena los candidatos del más al menos adecuado como siguiente paso lógico en su aprendizaje.
 
-    Tu respuesta DEBE ser un objeto JSON válido y nada más, con una clave "recommendations" que sea un array de strings con los títulos exactos de los cursos que recomiendas.
+    Tu respuesta DEBE ser un objeto JSON válido y nada más, con una clave "recommendations" que sea un array de strings con los títulos exactos de los candidatos, en orden.
     Ejemplo:
     {{
       "recommendations": ["Docker", "Introducción a la IA con Gemini"]
     }}
     """
     try:
-        response = model.generate_content(prompt)
-        cleaned_response = response.text.strip().replace("```json", "").replace("```", "")
-        data = json.loads(cleaned_response)
-        recommended_titles = data.get("recommendations", [])
-
-        # Devolvemos los objetos de curso completos de los cursos recomendados
-        return [c for c in available_courses if c.title in recommended_titles]
+        data = _generate_cached(prompt, parse=_parse_json_response)
+        return [title for title in data.get("recommendations", []) if title in candidate_titles]
     except Exception as e:
-        print(f"Error al generar recomendaciones: {e}")
+        print(f"Error al reordenar recomendaciones: {e}")
         return []
 
 
-def generate_motivational_phrase(score: int, passed: bool) -> str:
-    """Genera una frase motivadora basada en el resultado del quiz."""
+def generate_motivational_phrases(min_score: int, max_score: int, passed: bool, count: int) -> List[str]:
+    """
+    Genera de una vez varias frases motivadoras para un rango de puntajes del quiz.
+    Alimenta el pool de frases (motivation_service); devuelve [] si falla.
+    """
     if passed:
-        prompt = f"Actúa como un tutor motivador. Escribe una frase corta (máximo 20 palabras) felicitando a un estudiante por aprobar un quiz con un {score}%."
+        prompt = f"Actúa como un tutor motivador. Escribe {count} frases cortas y distintas entre sí (máximo 20 palabras cada una) felicitando a un estudiante por aprobar un quiz con un puntaje de entre {min_score}% y {max_score}%."
     else:
-        prompt = f"Actúa como un tutor comprensivo. Escribe una frase corta (máximo 20 palabras) animando a un estudiante que no aprobó un quiz con un {score}%, motivándolo a repasar y volver a intentarlo."
+        prompt = f"Actúa como un tutor comprensivo. Escribe {count} frases cortas y distintas entre sí (máximo 20 palabras cada una) animando a un estudiante que no aprobó un quiz con un puntaje de entre {min_score}% y {max_score}%, motivándolo a repasar y volver a intentarlo."
+    prompt += """
+    Tu respuesta DEBE ser un objeto JSON válido y nada más, con una clave "phrases" que sea un array de strings.
+    No menciones un porcentaje concreto en las frases."""
 
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception:
-        return "¡Sigue esforzándote!"
\ No newline at end of file
+        # Sin caché de respuestas: cada refresco del pool debe traer frases nuevas
+        data = _generate_cached(prompt, parse=_parse_json_response, use_cache=False, store=False)
+        return [phrase.strip() for phrase in data.get("phrases", []) if isinstance(phrase, str) and phrase.strip()]
+    except Exception as e:
+        print(f"Error al generar frases motivadoras: {e}")
+        return []
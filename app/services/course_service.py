@@ -1,13 +1,54 @@
 # backend/app/services/course_service.py
 
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.repositories import course_repo, progress_repo, quiz_repo
+from app.core.task_queue import enqueue, REFRESH_COURSE_SUMMARY
+from app.repositories import async_course_repo, async_progress_repo, course_repo
+from app import db_models
+from app.logic import course_logic
 from app.models import course as course_schemas
 from app.services import ai_service
 
+# Resúmenes que se están generando en este proceso, por (curso, huella): las visitas
+# simultáneas a un curso sin resumen esperan la misma llamada a la IA
+_summary_in_flight: Dict[Tuple[int, str], asyncio.Future] = {}
+# Resúmenes desactualizados cuyo recálculo ya se encoló desde este proceso: se vuelve
+# a pedir recién pasado el TTL (por si el broker no respondió o el worker falló)
+_refresh_requested = TTLCache(maxsize=1024, ttl=300)
+_refresh_lock = threading.Lock()
+
+
+def queue_course_summary_refresh(course_id: int):
+    """Encola el recálculo del resumen; si el broker no responde, la petición sigue igual."""
+    try:
+        enqueue(REFRESH_COURSE_SUMMARY, course_id)
+    except Exception as e:
+        print(f"No se pudo encolar el recálculo del resumen del curso {course_id}: {e!r}")
+
+
+def refresh_course_summary(db: Session, course_id: int):
+    """
+    Tarea del worker: regenera el resumen persistido si el título o la descripción
+    cambiaron desde que se generó. Los cursos sin resumen se generan en la primera visita.
+    """
+    row = course_repo.get_course_with_summary(db, course_id)
+    if row is None:
+        return
+    title, description, stored = row
+    source_hash = course_logic.summary_source_hash(title, description)
+    if stored is None or stored.source_hash == source_hash:
+        return
+    summary = ai_service.generate_course_summary_from_ai(title, description)
+    if summary is not None:
+        course_repo.save_course_summary(db, course_id, summary, source_hash)
+
 
 class CourseService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
     async def find_one_with_progress(self, course_id: int, user_id: int):
@@ -15,54 +56,88 @@ class CourseService:
         pass
 
     async def create_new_course(self, course: course_schemas.CourseCreate, instructor_id: int):
-        return course_repo.create_course(self.db, course, instructor_id)
+        return await async_course_repo.create_instructor_course(self.db, course, instructor_id)
 
-    async def generate_and_save_curriculum(self, course_id: int):
+    async def get_course_summary(self, course_id: int) -> Optional[db_models.CourseSummary]:
         """
-        Genera la currícula para un curso, y luego genera un quiz para cada
-        nuevo módulo creado.
+        Devuelve el resumen persistido del curso. Si cambiaron el título o la
+        descripción, sirve el anterior mientras el worker genera el nuevo; solo
+        llama a la IA en la petición si el curso todavía no tiene resumen.
         """
-        db_course = course_repo.get_course_by_id(self.db, course_id)
-        if not db_course:
+        row = await async_course_repo.get_course_with_summary(self.db, course_id)
+        if row is None:
             return None
 
-        # Paso 1: Genera y guarda los módulos
-        print(f"--- [Paso 1] Obteniendo currícula de la IA para el curso: '{db_course.title}' ---")
-        curriculum_data = ai_service.generate_curriculum_from_ai(db_course.title, db_course.description)
-        modules_data = curriculum_data.get("modules", [])
-
-        if not modules_data:
-            print("!!! La IA no devolvió módulos. Abortando.")
-            return []
-
-        course_repo.add_modules_to_course(self.db, course_id, modules_data)
-        updated_course = course_repo.get_course_by_id(self.db, course_id)
-
-        # Paso 2: Itera sobre cada nuevo módulo para crear su quiz
-        print(f"--- [Paso 2] Iniciando generación de quizzes para {len(updated_course.modules)} módulos ---")
-        for module in updated_course.modules:
-            print(f"Generando quiz para el módulo: '{module.title}' (ID: {module.id})")
-            quiz_content = ai_service.generate_quiz_from_ai(module.title, module.description)
-            if quiz_content and quiz_content.get("questions"):
-                quiz_repo.create_quiz_for_module(self.db, module.id, quiz_content["questions"])
-                print(f"-> Quiz para '{module.title}' creado con éxito.")
-            else:
-                print(f"-> !!! No se pudo generar quiz para '{module.title}'.")
-
-        return updated_course.modules
+        title, description, stored = row
+        source_hash = course_logic.summary_source_hash(title, description)
+        if stored is None:
+            return await self._generate_missing_summary(course_id, title, description, source_hash)
+        if stored.source_hash != source_hash:
+            self._request_refresh(course_id, source_hash)
+        return stored
+
+    async def regenerate_course_summary(self, course_id: int) -> Optional[db_models.CourseSummary]:
+        """Fuerza una nueva generación del resumen (acción de administrador)."""
+        row = await async_course_repo.get_course_with_summary(self.db, course_id)
+        if row is None:
+            return None
+        title, description, _ = row
+        summary = await asyncio.to_thread(ai_service.generate_course_summary_from_ai, title, description, False)
+        if summary is None:
+            return None
+        return await async_course_repo.save_course_summary(
+            self.db, course_id, summary, course_logic.summary_source_hash(title, description)
+        )
+
+    async def _generate_missing_summary(self, course_id: int, title: str, description: str, source_hash: str):
+        key = (course_id, source_hash)
+        future = _summary_in_flight.get(key)
+        is_owner = future is None
+        if is_owner:
+            # La llamada a Gemini es bloqueante: se ejecuta fuera del event loop
+            future = asyncio.ensure_future(
+                asyncio.to_thread(ai_service.generate_course_summary_from_ai, title, description)
+            )
+            _summary_in_flight[key] = future
+            future.add_done_callback(lambda _: _summary_in_flight.pop(key, None))
+
+        # shield: si un cliente se desconecta, la generación sigue para los demás que la esperan
+        summary = await asyncio.shield(future)
+        if summary is None:
+            return None
+        if is_owner:
+            return await async_course_repo.save_course_summary(self.db, course_id, summary, source_hash)
+        # Lo guarda la petición que inició la generación
+        return db_models.CourseSummary(course_id=course_id, summary=summary, source_hash=source_hash)
+
+    @staticmethod
+    def _request_refresh(course_id: int, source_hash: str):
+        """Encola (una vez por huella y proceso) el recálculo de un resumen desactualizado, sin esperar al broker."""
+        with _refresh_lock:
+            if (course_id, source_hash) in _refresh_requested:
+                return
+            _refresh_requested[(course_id, source_hash)] = True
+        asyncio.get_running_loop().run_in_executor(None, queue_course_summary_refresh, course_id)
 
     # --- El resto de tus funciones de servicio ---
     async def find_all(self):
-        return course_repo.get_all_courses(self.db)
+        return await async_course_repo.get_all_courses(self.db)
 
     async def mark_module_completed(self, user_id: int, module_id: int):
-        return progress_repo.mark_module_as_completed(self.db, user_id, module_id)
+        return await async_progress_repo.mark_module_as_completed(self.db, user_id, module_id)
 
     async def find_courses_by_instructor(self, instructor_id: int):
-        return course_repo.get_courses_by_instructor_id(self.db, instructor_id)
+        return await async_course_repo.get_courses_by_instructor_id(self.db, instructor_id)
 
     async def update_existing_course(self, course_id: int, course_update: course_schemas.CourseCreate, user_id: int):
-        return course_repo.update_course(self.db, course_id, course_update, user_id)
+        updated = await async_course_repo.update_course(self.db, course_id, course_update, user_id)
+        if updated:
+            # Si cambiaron el título o la descripción, el resumen se regenera en el worker
+            stored = await self.db.get(db_models.CourseSummary, course_id)
+            source_hash = course_logic.summary_source_hash(updated.title, updated.description)
+            if stored is not None and stored.source_hash != source_hash:
+                self._request_refresh(course_id, source_hash)
+        return updated
 
     async def delete_existing_course(self, course_id: int, user_id: int):
-        return course_repo.delete_course(self.db, course_id, user_id)
\ No newline at end of file
+        return await async_course_repo.delete_course(self.db, course_id, user_id)
\ No newline at end of file
@@ -0,0 +1,148 @@
+# backend/app/services/generation_pipeline.py
+
+import asyncio
+import time
+from sqlalchemy.orm import Session
+from app import db_models
+from app.config import GENERATION_STAGE_MAX_RETRIES, GENERATION_STAGE_RETRY_DELAY_SECONDS
+from app.core.audio_storage import module_audio_url
+from app.repositories import course_repo, module_repo, quiz_repo, generation_job_repo
+from app.services import ai_service, tts_service
+
+
+STAGE_CURRICULUM = "curriculum"
+STAGE_CONTENT = "content"
+STAGE_QUIZ = "quiz"
+STAGE_AUDIO = "audio"
+
+# Etapas que recorre cada tipo de trabajo, en orden
+JOB_STAGES = {
+    "course": [STAGE_CURRICULUM, STAGE_CONTENT, STAGE_QUIZ, STAGE_AUDIO],
+    "module_content": [STAGE_CONTENT, STAGE_QUIZ],
+    "module_audio": [STAGE_AUDIO],
+}
+
+
+class StageError(Exception):
+    """Una etapa no produjo resultado (p. ej. la IA devolvió un error); se reintenta."""
+
+
+def run_job(db: Session, job_id: int):
+    """
+    Ejecuta todas las etapas de un trabajo de generación, actualizando su estado
+    y progreso en generation_jobs. Cada etapa se reintenta por separado; si agota
+    los reintentos el trabajo queda 'failed' y no se ejecutan las siguientes.
+
+    En un trabajo de curso las etapas solo procesan lo que falta: la currícula se
+    omite si el curso ya tiene módulos y las demás saltean los módulos que ya
+    tienen contenido, quiz o audio. Así una reentrega de la tarea, un reintento o
+    un segundo pedido de generación del mismo curso no duplican módulos.
+    """
+    job = generation_job_repo.get_job_by_id(db, job_id)
+    if not job or job.status == 'completed':
+        return job
+
+    stages = JOB_STAGES[job.job_type]
+    for index, stage in enumerate(stages):
+        generation_job_repo.update_job_stage(db, job, stage, progress=int(index * 100 / len(stages)))
+        try:
+            _run_stage_with_retries(db, job, stage)
+        except Exception as e:
+            db.rollback()
+            generation_job_repo.fail_job(db, job, str(e))
+            return job
+
+    generation_job_repo.complete_job(db, job)
+    return job
+
+
+def _run_stage_with_retries(db: Session, job: db_models.GenerationJob, stage: str):
+    for attempt in range(1, GENERATION_STAGE_MAX_RETRIES + 1):
+        try:
+            STAGE_HANDLERS[stage](db, job)
+            return
+        except Exception as e:
+            db.rollback()
+            if attempt == GENERATION_STAGE_MAX_RETRIES:
+                raise
+            print(f"Etapa '{stage}' del trabajo {job.id} falló (intento {attempt}/{GENERATION_STAGE_MAX_RETRIES}): {e!r}. Reintentando...")
+            time.sleep(GENERATION_STAGE_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+
+
+def _target_modules(db: Session, job: db_models.GenerationJob):
+    """Módulos sobre los que trabaja el job: el módulo indicado o todos los del curso."""
+    query = db.query(db_models.Module)
+    if job.module_id is not None:
+        return query.filter(db_models.Module.id == job.module_id).all()
+    return query.filter(db_models.Module.course_id == job.course_id).order_by(db_models.Module.order_index).all()
+
+
+def _generate_curriculum(db: Session, job: db_models.GenerationJob):
+    course = course_repo.get_course_by_id(db, job.course_id)
+    if not course:
+        raise StageError(f"El curso {job.course_id} no existe.")
+    # La currícula ya existe (reentrega, reintento o segundo pedido): se conserva
+    if course_repo.course_has_modules(db, job.course_id):
+        return
+
+    # Si el curso ya se había generado y quedó sin módulos, es una regeneración
+    # pedida explícitamente: se pide una currícula nueva en lugar de la cacheada
+    regenerating = generation_job_repo.has_previous_completed_job(db, job)
+    curriculum_data = ai_service.generate_curriculum_from_ai(
+        course.title, course.description, use_cache=not regenerating
+    )
+    modules_data = curriculum_data.get("modules", [])
+    if not modules_data:
+        raise StageError("La IA no devolvió módulos.")
+    # Se vuelve a comprobar con el curso bloqueado: otro trabajo pudo guardarla mientras tanto
+    course_repo.add_modules_to_empty_course(db, job.course_id, modules_data)
+
+
+def _generate_content(db: Session, job: db_models.GenerationJob):
+    # En el pipeline del curso solo se completan los módulos sin contenido;
+    # un trabajo de módulo regenera siempre su contenido.
+    only_missing = job.module_id is None
+    for module in _target_modules(db, job):
+        if only_missing and module.content_data:
+            continue
+        # Un trabajo de módulo es una regeneración: no debe devolver el texto cacheado
+        content = ai_service.generate_module_content_from_ai(
+            module.title, module.description, use_cache=only_missing
+        )
+        if content == ai_service.MODULE_CONTENT_ERROR:
+            raise StageError(f"No se pudo generar el contenido del módulo {module.id}.")
+        module_repo.update_module_content(db, module.id, content)
+
+
+def _generate_quizzes(db: Session, job: db_models.GenerationJob):
+    modules = [module for module in _target_modules(db, job) if not module.questions]
+    if not modules:
+        return
+
+    quizzes = asyncio.run(ai_service.generate_quizzes_from_ai(
+        [(module.id, module.title, module.description) for module in modules]
+    ))
+    generated = {module_id: questions for module_id, questions in quizzes.items() if questions}
+    quiz_repo.create_quizzes_for_modules(db, generated)
+
+    if len(generated) < len(modules):
+        raise StageError(f"No se pudo generar el quiz de {len(modules) - len(generated)} módulo(s).")
+
+
+def _generate_audio(db: Session, job: db_models.GenerationJob):
+    only_missing = job.module_id is None
+    for module in _target_modules(db, job):
+        if not module.content_data or (only_missing and module.content_audio_url):
+            continue
+        audio_key = tts_service.synthesize_module_audio(module.content_data)
+        if not audio_key:
+            raise StageError(f"No se pudo generar el audio del módulo {module.id}.")
+        module_repo.update_module_audio(db, module.id, module_audio_url(audio_key))
+
+
+STAGE_HANDLERS = {
+    STAGE_CURRICULUM: _generate_curriculum,
+    STAGE_CONTENT: _generate_content,
+    STAGE_QUIZ: _generate_quizzes,
+    STAGE_AUDIO: _generate_audio,
+}
@@ -0,0 +1,22 @@
+# backend/app/services/learning_path_service.py
+
+from sqlalchemy.orm import Session
+from app.repositories import learning_path_repo
+from app.services import ai_service
+
+
+def refresh_path_suggestions(db: Session, path_id: int):
+    """
+    Pide a la IA los cursos que faltan en una ruta y los guarda. Se ejecuta en segundo
+    plano (worker.refresh_learning_path_suggestions) cada vez que cambia la lista de cursos.
+    Si la IA no devuelve sugerencias se conservan las anteriores.
+    """
+    db_path = learning_path_repo.get_learning_path_by_id(db, path_id)
+    if not db_path:
+        return None
+
+    existing_titles = [assoc.course.title for assoc in sorted(db_path.courses, key=lambda assoc: assoc.step)]
+    suggested_titles = ai_service.suggest_missing_courses_for_path(db_path.title, existing_titles)
+    if not suggested_titles:
+        return db_path.suggestion
+    return learning_path_repo.save_path_suggestions(db, path_id, suggested_titles)
@@ -0,0 +1,93 @@
+# backend/app/services/motivation_service.py
+
+import random
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from app.config import MOTIVATION_PHRASES_PER_BUCKET, MOTIVATION_REFRESH_SECONDS
+from app.services import ai_service
+
+# Rangos de puntaje (mín, máx, aprobado) con su propio pool de frases.
+# Se aprueba con 55 o más, igual que en submit_quiz.
+SCORE_BUCKETS: List[Tuple[int, int, bool]] = [
+    (0, 24, False),
+    (25, 54, False),
+    (55, 69, True),
+    (70, 84, True),
+    (85, 99, True),
+    (100, 100, True),
+]
+
+# Frases de respaldo: se sirven hasta el primer refresco y si la IA falla
+_DEFAULT_PHRASES = {
+    False: [
+        "¡Sigue esforzándote! Repasa el módulo y vuelve a intentarlo.",
+        "Cada intento te acerca a la meta. ¡No te rindas!",
+        "Equivocarse también es aprender. Repasa y vuelve con todo.",
+    ],
+    True: [
+        "¡Felicitaciones, aprobaste! Sigue así.",
+        "¡Buen trabajo! Tu esfuerzo está dando resultados.",
+        "¡Excelente! Un paso más en tu camino de aprendizaje.",
+    ],
+}
+
+
+class MotivationalPhrasePool:
+    """
+    Frases motivadoras pregeneradas por rango de puntaje, servidas desde memoria.
+    Cuando el pool vence, un hilo de fondo pide frases nuevas a la IA (una llamada
+    por rango) mientras se siguen sirviendo las anteriores.
+    """
+
+    def __init__(self, refresh_seconds: int = MOTIVATION_REFRESH_SECONDS, phrases_per_bucket: int = MOTIVATION_PHRASES_PER_BUCKET):
+        self.refresh_seconds = refresh_seconds
+        self.phrases_per_bucket = phrases_per_bucket
+        self._pool: Dict[Tuple[int, int, bool], List[str]] = {
+            bucket: list(_DEFAULT_PHRASES[bucket[2]]) for bucket in SCORE_BUCKETS
+        }
+        self._refreshed_at = None
+        self._refresh_lock = threading.Lock()
+
+    def get_phrase(self, score: int, passed: bool) -> str:
+        """Frase al azar del rango del puntaje. No hace E/S."""
+        self._refresh_if_stale()
+        return random.choice(self._pool[_bucket_for(score, passed)])
+
+    def refresh(self):
+        """Regenera las frases de todos los rangos; un rango que falla conserva las suyas."""
+        pool = dict(self._pool)
+        for bucket in SCORE_BUCKETS:
+            min_score, max_score, passed = bucket
+            phrases = ai_service.generate_motivational_phrases(min_score, max_score, passed, self.phrases_per_bucket)
+            if phrases:
+                pool[bucket] = phrases
+        self._pool = pool
+        self._refreshed_at = time.monotonic()
+
+    def _refresh_if_stale(self):
+        stale = self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.refresh_seconds
+        if stale and self._refresh_lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error al refrescar las frases motivadoras: {e!r}")
+        finally:
+            self._refresh_lock.release()
+
+
+def _bucket_for(score: int, passed: bool) -> Tuple[int, int, bool]:
+    for bucket in SCORE_BUCKETS:
+        min_score, max_score, bucket_passed = bucket
+        if bucket_passed == passed and min_score <= score <= max_score:
+            return bucket
+    # Puntaje fuera de rango: el rango más cercano con el mismo resultado
+    candidates = [bucket for bucket in SCORE_BUCKETS if bucket[2] == passed]
+    return min(candidates, key=lambda bucket: min(abs(score - bucket[0]), abs(score - bucket[1])))
+
+
+phrase_pool = MotivationalPhrasePool()
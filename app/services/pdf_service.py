@@ -0,0 +1,211 @@
+# backend/app/services/pdf_service.py
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import markdown
+
+from app.config import PDF_RENDER_WORKERS
+from app.core.pdf_cache import module_pdf_path, module_fragment_path, course_pdf_path, remove_superseded_files
+
+# Cambiar la plantilla cambia la huella de todos los PDFs cacheados
+PDF_TEMPLATE_VERSION = "1"
+
+_PDF_STYLE = """
+        @page {
+            @bottom-center {
+                content: "www.zeronacademy.com";
+                color: #888;
+                font-size: 10px;
+            }
+        }
+        body { font-family: sans-serif; margin: 20mm; }
+        h1 { color: #333; }
+        pre { background-color: #eee; padding: 10px; border-radius: 5px; overflow-x: auto; }
+        .watermark {
+            position: fixed;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%) rotate(-45deg);
+            color: rgba(0, 0, 0, 0.08);
+            font-size: 72px;
+            font-weight: bold;
+            white-space: nowrap;
+            z-index: 1000;
+            pointer-events: none;
+        }
+"""
+
+# Índice con número de página y cada módulo en una página nueva (solo en el PDF del curso)
+_COURSE_STYLE = """
+        .toc ol { padding-left: 0; list-style-position: inside; }
+        .toc li { margin: 6px 0; }
+        .toc a { color: #333; text-decoration: none; }
+        .toc a::after { content: leader('.') target-counter(attr(href), page); }
+        .module { page-break-before: always; }
+"""
+
+# WeasyPrint tarda cientos de ms por documento y no libera el GIL: se renderiza en
+# procesos aparte. 'spawn' evita heredar por fork los hilos y conexiones del servidor.
+_pdf_executor = ProcessPoolExecutor(
+    max_workers=PDF_RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+)
+# Renders en curso por archivo: peticiones simultáneas del mismo PDF esperan el mismo render
+_in_flight: Dict[str, asyncio.Future] = {}
+
+
+def module_content_hash(title: str, description, content: str) -> str:
+    """Huella de todo lo que aparece en el PDF de un módulo."""
+    source = f"{PDF_TEMPLATE_VERSION}\x00{title}\x00{description or ''}\x00{content}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def render_module_fragment(title: str, description, content: str) -> str:
+    """HTML del cuerpo de un módulo (título, descripción y contenido en Markdown)."""
+    return f"""
+        <h1>{title}</h1>
+        <p><strong>Descripción:</strong> {description}</p>
+        <hr/>
+        {markdown.markdown(content)}
+    """
+
+
+def wrap_pdf_document(title: str, body: str, extra_style: str = "") -> str:
+    """Documento HTML completo con el estilo y la marca de agua de los PDFs."""
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{title}</title>
+        <style>{_PDF_STYLE}{extra_style}</style>
+    </head>
+    <body>
+        <div class="watermark">www.zeronacademy.com</div>
+        {body}
+    </body>
+    </html>
+    """
+
+
+def write_pdf_atomically(html: str, path: str):
+    """Escribe el PDF en un temporal y lo renombra: nunca se sirve un archivo a medias."""
+    # WeasyPrint (y Pango) se cargan solo en los procesos que renderizan, no en la API
+    from weasyprint import HTML
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        HTML(string=html).write_pdf(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load_or_render_fragment(module_id: int, content_hash: str, title: str, description, content: str) -> str:
+    """Cuerpo HTML del módulo desde el caché de disco; el Markdown se convierte una vez por huella."""
+    path = module_fragment_path(module_id, content_hash)
+    try:
+        with open(path, encoding="utf-8") as fragment_file:
+            return fragment_file.read()
+    except FileNotFoundError:
+        pass
+
+    fragment = render_module_fragment(title, description, content)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fragment_file:
+        fragment_file.write(fragment)
+    os.replace(tmp_path, path)
+    return fragment
+
+
+def _render_module_pdf(path: str, module_id: int, content_hash: str, title: str, description, content: str):
+    """Se ejecuta en el pool de procesos: Markdown -> HTML -> PDF en `path`."""
+    fragment = _load_or_render_fragment(module_id, content_hash, title, description, content)
+    write_pdf_atomically(wrap_pdf_document(title, fragment), path)
+
+
+def _render_course_pdf(path: str, course_id: int, course_title: str, modules: List[tuple]):
+    """
+    Se ejecuta en el pool de procesos: arma un único PDF con índice a partir de los
+    fragmentos cacheados de cada módulo. `modules` son tuplas
+    (id, huella, título, descripción, contenido) en el orden del curso.
+    """
+    toc_items = []
+    sections = []
+    for module_id, content_hash, title, description, content in modules:
+        toc_items.append(f'<li><a href="#module-{module_id}">{title}</a></li>')
+        fragment = _load_or_render_fragment(module_id, content_hash, title, description, content)
+        sections.append(f'<section class="module" id="module-{module_id}">{fragment}</section>')
+
+    body = f"""
+        <h1>{course_title}</h1>
+        <nav class="toc">
+            <h2>Índice</h2>
+            <ol>{"".join(toc_items)}</ol>
+        </nav>
+        {"".join(sections)}
+    """
+    write_pdf_atomically(wrap_pdf_document(course_title, body, _COURSE_STYLE), path)
+    # Libera el espacio de las versiones anteriores del PDF del curso
+    remove_superseded_files(f"course_{course_id}_*.pdf", keep=path)
+
+
+async def get_module_pdf(module) -> Tuple[str, str]:
+    """
+    Devuelve (ruta del PDF, huella de contenido) del módulo. Si no está en el
+    caché de disco, lo renderiza en el pool de procesos sin bloquear el event loop.
+    """
+    content_hash = module_content_hash(module.title, module.description, module.content_data)
+    path = module_pdf_path(module.id, content_hash)
+    if not os.path.exists(path):
+        await _run_render(
+            path, _render_module_pdf, path, module.id, content_hash, module.title, module.description, module.content_data
+        )
+    return path, content_hash
+
+
+def course_content_hash(course_title: str, modules: list) -> str:
+    """Huella del PDF del curso: su título y la huella de cada módulo, en orden."""
+    module_hashes = [
+        f"{module.id}:{module_content_hash(module.title, module.description, module.content_data)}"
+        for module in modules
+    ]
+    source = f"{PDF_TEMPLATE_VERSION}\x00{course_title}\x00" + "\x00".join(module_hashes)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+async def get_course_pdf(course, modules: list) -> Tuple[str, str]:
+    """
+    Devuelve (ruta del PDF, huella) del curso completo con los `modules` indicados,
+    ya ordenados. Solo se renderiza si el contenido cambió desde el último export.
+    """
+    content_hash = course_content_hash(course.title, modules)
+    path = course_pdf_path(course.id, content_hash)
+    if not os.path.exists(path):
+        module_rows = [
+            (
+                module.id,
+                module_content_hash(module.title, module.description, module.content_data),
+                module.title,
+                module.description,
+                module.content_data,
+            )
+            for module in modules
+        ]
+        await _run_render(path, _render_course_pdf, path, course.id, course.title, module_rows)
+    return path, content_hash
+
+
+async def _run_render(path: str, render, *args):
+    future = _in_flight.get(path)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_pdf_executor, render, *args)
+        _in_flight[path] = future
+        future.add_done_callback(lambda _: _in_flight.pop(path, None))
+    # shield: si un cliente se desconecta, el render sigue para los demás que lo esperan
+    await asyncio.shield(future)
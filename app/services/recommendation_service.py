@@ -0,0 +1,209 @@
+# backend/app/services/recommendation_service.py
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import RECOMMENDER_REFRESH_SECONDS, RECOMMENDER_NEIGHBORS, RECOMMENDER_LLM_RERANK
+from app.database import SessionLocal
+from app.repositories import recommendation_repo
+from app.services import ai_service
+
+LEVEL_INDEX = {"basico": 0, "intermedio": 1, "avanzado": 2}
+
+# Peso de cada señal en la similitud ítem-ítem: manda la co-inscripción; categoría
+# y nivel desempatan y cubren los cursos nuevos, que todavía no tienen alumnos
+COOCCURRENCE_WEIGHT = 0.85
+CATEGORY_WEIGHT = 0.1
+LEVEL_WEIGHT = 0.05
+# Cuánto modula la calificación del curso (thumbs up/down) el puntaje final
+RATING_WEIGHT = 0.3
+# Candidatos que se envían a Gemini cuando se usa como re-ranker
+RERANK_CANDIDATES = 10
+
+
+@dataclass
+class _RecommenderModel:
+    course_ids: np.ndarray        # (n,) ID de cada curso
+    index: dict                   # course_id -> posición
+    published: np.ndarray         # (n,) bool
+    neighbor_idx: np.ndarray      # (n, k) vecinos más similares de cada curso
+    neighbor_scores: np.ndarray   # (n, k) similitud con cada vecino
+    quality: np.ndarray           # (n,) calificación suavizada en [0, 1]
+    popularity: np.ndarray        # (n,) inscriptos normalizados en [0, 1]
+
+
+class CourseRecommender:
+    """
+    Recomendador ítem-ítem en memoria. La similitud combina co-inscripciones (coseno
+    sobre course_enrollments), misma categoría y cercanía de nivel; de cada curso se
+    guardan solo sus k vecinos más similares. Recomendar es sumar los vecinos de los
+    cursos del alumno, ponderar por calificación y tomar el top: microsegundos, sin E/S.
+
+    El modelo se entrena con tres consultas agregadas, siempre en un hilo de fondo:
+    al arrancar (warm_up) y cada vez que tiene más de RECOMMENDER_REFRESH_SECONDS.
+    """
+
+    def __init__(self, neighbors: int = RECOMMENDER_NEIGHBORS, refresh_seconds: int = RECOMMENDER_REFRESH_SECONDS,
+                 session_factory=SessionLocal):
+        self.neighbors = neighbors
+        self.refresh_seconds = refresh_seconds
+        self.session_factory = session_factory
+        self._model = None
+        self._built_at = 0.0
+        self._build_lock = threading.Lock()
+
+    def fit(self, db: Session):
+        """Entrena el modelo desde la base y lo reemplaza de forma atómica."""
+        features = recommendation_repo.get_course_features(db)
+        n = len(features)
+        course_ids = np.array([course_id for course_id, _, _, _ in features], dtype=np.int64)
+        index = {course_id: i for i, course_id in enumerate(course_ids.tolist())}
+        categories = np.array([-1 if category_id is None else category_id for _, category_id, _, _ in features], dtype=np.int64)
+        levels = np.array([LEVEL_INDEX.get(level, 0) for _, _, level, _ in features], dtype=np.float32)
+        published = np.array([status == 'published' for _, _, _, status in features], dtype=bool)
+
+        # Matriz densa n x n: solo existe durante el entrenamiento (4 bytes por par de cursos)
+        cooccurrence = np.zeros((n, n), dtype=np.float32)
+        for course_a, course_b, users in recommendation_repo.get_enrollment_cooccurrence(db):
+            if course_a in index and course_b in index:
+                cooccurrence[index[course_a], index[course_b]] = users
+        enrolled = np.diag(cooccurrence).copy()
+        norms = np.sqrt(np.outer(enrolled, enrolled))
+        cosine = np.divide(cooccurrence, norms, out=np.zeros_like(cooccurrence), where=norms > 0)
+
+        same_category = (categories[:, None] == categories[None, :]) & (categories[:, None] != -1)
+        level_similarity = 1.0 - np.abs(levels[:, None] - levels[None, :]) / 2.0
+        similarity = (
+            COOCCURRENCE_WEIGHT * cosine
+            + CATEGORY_WEIGHT * same_category
+            + LEVEL_WEIGHT * level_similarity
+        ).astype(np.float32)
+        np.fill_diagonal(similarity, -np.inf)
+
+        k = min(self.neighbors, max(n - 1, 0))
+        if k:
+            neighbor_idx = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            neighbor_scores = np.take_along_axis(similarity, neighbor_idx, axis=1)
+        else:
+            neighbor_idx = np.empty((n, 0), dtype=np.int64)
+            neighbor_scores = np.empty((n, 0), dtype=np.float32)
+
+        upvotes = np.zeros(n, dtype=np.float32)
+        downvotes = np.zeros(n, dtype=np.float32)
+        for course_id, course_upvotes, course_downvotes in recommendation_repo.get_course_rating_totals(db):
+            if course_id in index:
+                upvotes[index[course_id]] = course_upvotes or 0
+                downvotes[index[course_id]] = course_downvotes or 0
+        # Suavizado de Laplace: un curso sin votos vale 0.5
+        quality = (upvotes + 1) / (upvotes + downvotes + 2)
+        popularity = np.log1p(enrolled)
+        if n and popularity.max() > 0:
+            popularity /= popularity.max()
+
+        self._model = _RecommenderModel(
+            course_ids=course_ids, index=index, published=published,
+            neighbor_idx=neighbor_idx, neighbor_scores=neighbor_scores,
+            quality=quality, popularity=popularity
+        )
+        self._built_at = time.monotonic()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._model is not None
+
+    def warm_up(self):
+        """
+        Entrena el modelo en un hilo de fondo, salvo que ya haya un entrenamiento en
+        curso. Devuelve el hilo lanzado (o None) para quien quiera esperarlo.
+        """
+        if not self._build_lock.acquire(blocking=False):
+            return None
+        thread = threading.Thread(target=self._refresh_in_background, daemon=True)
+        thread.start()
+        return thread
+
+    def ensure_fresh(self):
+        """
+        Si el modelo no existe o venció, lo reconstruye en segundo plano; la petición
+        nunca espera el entrenamiento y mientras tanto se usa el modelo anterior.
+        """
+        if self._model is None or time.monotonic() - self._built_at > self.refresh_seconds:
+            self.warm_up()
+
+    def _refresh_in_background(self):
+        db = self.session_factory()
+        try:
+            self.fit(db)
+        except Exception as e:
+            print(f"Error al reconstruir el recomendador de cursos: {e!r}")
+        finally:
+            db.close()
+            self._build_lock.release()
+
+    def recommend(self, enrolled_course_ids: List[int], limit: int = 3) -> List[int]:
+        """IDs de los `limit` cursos publicados más recomendables que el alumno aún no toma."""
+        model = self._model
+        if model is None or not len(model.course_ids):
+            return []
+
+        enrolled_idx = [model.index[course_id] for course_id in enrolled_course_ids if course_id in model.index]
+        scores = np.zeros(len(model.course_ids), dtype=np.float32)
+        if enrolled_idx:
+            np.add.at(scores, model.neighbor_idx[enrolled_idx].ravel(), model.neighbor_scores[enrolled_idx].ravel())
+            scores /= len(enrolled_idx)
+        # La popularidad desempata (y es lo único que cuenta para un alumno sin cursos)
+        scores += 0.01 * model.popularity
+        scores *= (1 - RATING_WEIGHT) + RATING_WEIGHT * model.quality
+
+        scores[~model.published] = -np.inf
+        scores[enrolled_idx] = -np.inf
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if not len(candidates) or limit <= 0:
+            return []
+
+        limit = min(limit, len(candidates))
+        top = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return model.course_ids[top].tolist()
+
+
+course_recommender = CourseRecommender()
+
+
+def warm_up():
+    """Para el arranque de la aplicación: entrena el recomendador sin bloquear."""
+    course_recommender.warm_up()
+
+
+def get_course_recommendations(db: Session, enrolled_courses: list, limit: int = 3):
+    """
+    Recomienda cursos al alumno con el recomendador local. Si RECOMMENDER_LLM_RERANK
+    está activo, Gemini solo reordena los mejores candidatos locales. Mientras el
+    modelo se entrena (proceso recién iniciado) se recomiendan los más populares.
+    """
+    course_recommender.ensure_fresh()
+    enrolled_ids = [course.id for course in enrolled_courses]
+
+    if not course_recommender.is_ready:
+        return recommendation_repo.get_courses_by_ids(
+            db, recommendation_repo.get_popular_course_ids(db, enrolled_ids, limit)
+        )
+
+    if not RECOMMENDER_LLM_RERANK:
+        return recommendation_repo.get_courses_by_ids(db, course_recommender.recommend(enrolled_ids, limit))
+
+    candidates = recommendation_repo.get_courses_by_ids(
+        db, course_recommender.recommend(enrolled_ids, RERANK_CANDIDATES)
+    )
+    ranked_titles = ai_service.rerank_course_recommendations(
+        [course.title for course in enrolled_courses], [course.title for course in candidates]
+    )
+    position = {title: i for i, title in enumerate(ranked_titles)}
+    # Los que la IA no menciona conservan el orden local, detrás de los elegidos
+    candidates.sort(key=lambda course: position.get(course.title, len(position)))
+    return candidates[:limit]
@@ -0,0 +1,141 @@
+# backend/app/services/tts_service.py
+
+import hashlib
+import io
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from gtts import gTTS
+
+from app.config import TTS_BACKEND, TTS_LANGUAGE, TTS_CHUNK_MAX_CHARS, TTS_MAX_CONCURRENCY
+from app.core.audio_storage import audio_storage
+
+
+class GTTSBackend:
+    """Google Translate TTS. Cada llamada es una o más peticiones HTTP lentas."""
+    name = "gtts"
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class FakeTTSBackend:
+    """Backend local para tests: bytes deterministas por fragmento, sin red."""
+    name = "fake"
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        return f"FAKE-MP3[{lang}]:{text}\n".encode("utf-8")
+
+
+def build_tts_backend():
+    if TTS_BACKEND == "fake":
+        return FakeTTSBackend()
+    return GTTSBackend()
+
+
+tts_backend = build_tts_backend()
+
+# Fragmentos sintetizados en paralelo, acotado para no saturar el servicio de TTS
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_MAX_CONCURRENCY, thread_name_prefix="tts")
+# Síntesis en curso por huella: un segundo pedido del mismo texto espera al primero
+_in_flight: Dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def strip_markdown(text: str) -> str:
+    """Deja solo el texto a leer en voz alta."""
+    # Eliminar bloques de código (```...```)
+    processed_text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
+    # Eliminar otros elementos de Markdown (encabezados, negritas, cursivas, listas)
+    processed_text = re.sub(r'[#*_-]', '', processed_text) # Elimina #, *, _, -
+    processed_text = re.sub(r'\[(.*?)\]\(.*\)', r'\1', processed_text) # Elimina enlaces [texto](url)
+    return re.sub(r'\n+', ' ', processed_text).strip() # Reemplaza múltiples saltos de línea con un espacio
+
+
+def split_into_chunks(text: str, max_chars: int = TTS_CHUNK_MAX_CHARS) -> List[str]:
+    """
+    Agrupa oraciones completas en fragmentos de hasta `max_chars` caracteres, para
+    que los cortes entre fragmentos caigan en pausas naturales. Una oración más
+    larga que el límite se corta por palabras.
+    """
+    chunks = []
+    current = ""
+    for sentence in re.split(r'(?<=[.!?;:])\s+', text):
+        pieces = [sentence]
+        if len(sentence) > max_chars:
+            pieces, piece = [], ""
+            for word in sentence.split():
+                if piece and len(piece) + 1 + len(word) > max_chars:
+                    pieces.append(piece)
+                    piece = word
+                else:
+                    piece = f"{piece} {word}".strip()
+            pieces.append(piece)
+
+        for piece in pieces:
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def audio_content_hash(text: str) -> str:
+    """Huella del audio: mismo texto, idioma y backend producen el mismo archivo."""
+    source = f"{tts_backend.name}\x00{TTS_LANGUAGE}\x00{text}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def synthesize_module_audio(content: str) -> Optional[str]:
+    """
+    Genera el audio de la lección y devuelve su clave en audio_storage, o None si
+    falla. La clave es la huella del texto: si ya existe no se vuelve a sintetizar,
+    y dos pedidos simultáneos del mismo texto comparten la síntesis.
+    """
+    if not content:
+        return None
+    text = strip_markdown(content)
+    if not text:
+        return None
+
+    content_hash = audio_content_hash(text)
+    key = f"{content_hash}.mp3"
+    if audio_storage.exists(key):
+        return key
+
+    with _in_flight_lock:
+        future = _in_flight.get(content_hash)
+        owner = future is None
+        if owner:
+            future = Future()
+            _in_flight[content_hash] = future
+
+    if not owner:
+        return future.result()
+
+    try:
+        result = _synthesize_to_storage(text, key)
+    except Exception as e:
+        print(f"Error al generar el audio: {e}")
+        result = None
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(content_hash, None)
+    future.set_result(result)
+    return result
+
+
+def _synthesize_to_storage(text: str, key: str) -> str:
+    # Los fragmentos se sintetizan en paralelo y se concatenan en orden: los MP3
+    # son secuencias de frames independientes, así que el resultado es un MP3 válido
+    chunks = split_into_chunks(text)
+    audio_parts = list(_tts_executor.map(lambda chunk: tts_backend.synthesize(chunk, TTS_LANGUAGE), chunks))
+    audio_storage.save(key, b"".join(audio_parts))
+    return key
@@ -0,0 +1,28 @@
+# backend/rebuild_course_progress.py
+import sys
+
+# Asegúrate de que el script pueda encontrar la carpeta 'app'
+sys.path.append('.')
+
+from app import db_models
+from app.database import SessionLocal, engine
+from app.repositories import progress_repo
+
+
+def main():
+    """
+    Crea (si no existe) y reconstruye la tabla user_course_progress a partir
+    de student_progress, quiz_attempts y course_enrollments.
+    """
+    db_models.UserCourseProgress.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        total_rows = progress_repo.rebuild_course_progress_summaries(db)
+    finally:
+        db.close()
+
+    print(f"\n✅ Resumen de progreso reconstruido: {total_rows} filas.")
+
+if __name__ == "__main__":
+    main()
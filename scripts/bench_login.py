@@ -0,0 +1,107 @@
+# backend/scripts/bench_login.py
+"""
+Mide la latencia del login con bcrypt: verificación en el event loop (como era
+antes) contra verificación en el pool de hilos de app.core.hashing.
+
+Simula N logins simultáneos sobre un mismo proceso y reporta logins por segundo,
+la latencia p50/p95 de cada login y la latencia p50/p99 de las peticiones ajenas
+al login (una cada 5 ms, como un GET /courses) que llegan durante la ráfaga.
+
+    python scripts/bench_login.py --logins 32 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Asegúrate de que el script pueda encontrar la carpeta 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REQUEST_INTERVAL_SECONDS = 0.005
+# Respuesta típica de un endpoint de lectura, para darle algo de trabajo al handler
+_PAYLOAD = [{"id": i, "title": f"Curso {i}", "level": "basico"} for i in range(50)]
+
+
+async def _unrelated_traffic(stop: asyncio.Event, latencies: list):
+    """
+    Peticiones ajenas al login que llegan a intervalos fijos. La latencia se mide
+    desde la llegada prevista, así incluye el tiempo que el loop estuvo bloqueado.
+    """
+    loop = asyncio.get_running_loop()
+    pending = []
+
+    async def request(arrived_at: float):
+        await asyncio.sleep(0)  # el handler cede el loop una vez, como al esperar la base
+        json.dumps(_PAYLOAD)
+        latencies.append(loop.time() - arrived_at)
+
+    arrival = loop.time() + REQUEST_INTERVAL_SECONDS
+    while not stop.is_set():
+        await asyncio.sleep(max(arrival - loop.time(), 0))
+        # Si el loop estuvo bloqueado, atiende todas las que llegaron mientras tanto
+        while arrival <= loop.time():
+            pending.append(asyncio.create_task(request(arrival)))
+            arrival += REQUEST_INTERVAL_SECONDS
+    await asyncio.gather(*pending)
+
+
+async def _run_logins(verify, logins: int, password: str, hashed: str):
+    latencies = []
+    # Todas las peticiones llegan a la vez: la latencia incluye la espera en la cola
+    started = time.perf_counter()
+
+    async def login():
+        assert await verify(password, hashed)
+        latencies.append(time.perf_counter() - started)
+
+    stop, other_latencies = asyncio.Event(), []
+    traffic = asyncio.create_task(_unrelated_traffic(stop, other_latencies))
+    await asyncio.gather(*(login() for _ in range(logins)))
+    total = time.perf_counter() - started
+    stop.set()
+    await traffic
+    return total, latencies, other_latencies
+
+
+def _percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(max(int(len(values) * fraction + 0.5) - 1, 0), len(values) - 1)] if values else 0.0
+
+
+def _report(label: str, total: float, latencies: list, other_latencies: list):
+    print(
+        f"{label:<22} {len(latencies) / total:6.1f} logins/s | "
+        f"login p50 {statistics.median(latencies) * 1000:7.1f} ms, p95 {_percentile(latencies, 0.95) * 1000:7.1f} ms | "
+        f"otras peticiones ({len(other_latencies)}) p50 {_percentile(other_latencies, 0.5) * 1000:6.1f} ms, "
+        f"p99 {_percentile(other_latencies, 0.99) * 1000:6.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="logins simultáneos")
+    parser.add_argument("--workers", type=int, default=None, help="hilos de bcrypt (PASSWORD_HASH_WORKERS)")
+    args = parser.parse_args()
+    if args.workers:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+
+    from app.core import hashing
+    from app.config import PASSWORD_HASH_WORKERS
+
+    password = "contraseña-de-prueba"
+    hashed = hashing.get_password_hash(password)
+
+    async def verify_inline(plain, hashed_password):
+        # Comportamiento anterior: bcrypt dentro del handler async
+        return hashing.verify_password(plain, hashed_password)
+
+    print(f"{args.logins} logins simultáneos, {PASSWORD_HASH_WORKERS} hilos de bcrypt, {os.cpu_count()} CPUs\n")
+    _report("bcrypt en el event loop", *asyncio.run(_run_logins(verify_inline, args.logins, password, hashed)))
+    _report("bcrypt en el pool", *asyncio.run(_run_logins(hashing.verify_password_async, args.logins, password, hashed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# backend/scripts/bench_recommend.py
+"""
+Mide el recomendador local de cursos (recommendation_service.CourseRecommender):
+tiempo de entrenamiento (fit) y de CourseRecommender.recommend por alumno, con
+cursos, alumnos e inscripciones sintéticos en SQLite en memoria.
+
+    python scripts/bench_recommend.py --courses 200 2000 --students 20000 --calls 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Asegúrate de que el script pueda encontrar la carpeta 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LEVELS = ["basico", "intermedio", "avanzado"]
+CATEGORIES = 20
+
+
+def seed(engine, courses: int, students: int, per_student: int, seed_value: int = 7):
+    from sqlalchemy import insert
+    from app import db_models
+    from app.database import Base
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed_value)
+    # Pocos cursos concentran la mayoría de las inscripciones, como en producción
+    weights = [1 / (rank + 1) for rank in range(courses)]
+    enrollments = {}
+    for user_id in range(1, students + 1):
+        chosen = set(rng.choices(range(1, courses + 1), weights=weights, k=per_student))
+        enrollments[user_id] = sorted(chosen)
+
+    with engine.begin() as conn:
+        conn.execute(insert(db_models.Category.__table__),
+                     [{"id": i, "name": f"Categoría {i}"} for i in range(1, CATEGORIES + 1)])
+        conn.execute(insert(db_models.Course.__table__), [
+            {"id": i, "title": f"Curso {i}", "level": rng.choice(LEVELS),
+             "category_id": rng.randint(1, CATEGORIES), "status": "published" if rng.random() < 0.9 else "draft"}
+            for i in range(1, courses + 1)
+        ])
+        rows = [{"user_id": user_id, "course_id": course_id}
+                for user_id, course_ids in enrollments.items() for course_id in course_ids]
+        for start in range(0, len(rows), 5000):
+            conn.execute(insert(db_models.CourseEnrollment.__table__), rows[start:start + 5000])
+    return enrollments
+
+
+def run(courses: int, students: int, per_student: int, calls: int):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.services.recommendation_service import CourseRecommender
+
+    engine = create_engine("sqlite://")
+    try:
+        enrollments = seed(engine, courses, students, per_student)
+        session_factory = sessionmaker(bind=engine)
+        recommender = CourseRecommender(session_factory=session_factory)
+
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            recommender.fit(db)
+            fit_ms = (time.perf_counter() - started) * 1000
+        finally:
+            db.close()
+
+        rng = random.Random(courses)
+        users = [enrollments[rng.randint(1, students)] for _ in range(calls)]
+        started = time.perf_counter()
+        for enrolled in users:
+            recommender.recommend(enrolled, limit=3)
+        recommend_us = (time.perf_counter() - started) / calls * 1_000_000
+    finally:
+        engine.dispose()
+
+    print(f"{courses:>6} cursos, {students:>7} alumnos | fit: {fit_ms:9.1f} ms | recommend: {recommend_us:8.1f} µs/llamada")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--per-student", type=int, default=4, help="inscripciones por alumno (con repetición)")
+    parser.add_argument("--calls", type=int, default=10_000, help="llamadas a recommend por tamaño")
+    args = parser.parse_args()
+
+    for courses in args.courses:
+        run(courses, args.students, args.per_student, args.calls)
+
+
+if __name__ == "__main__":
+    main()
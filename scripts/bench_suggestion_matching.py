@@ -0,0 +1,109 @@
+# backend/scripts/bench_suggestion_matching.py
+"""
+Compara la búsqueda de la sugerencia más parecida (fusión de sugerencias de
+cursos, MERGE_CUTOFF) con SuggestionIndex contra la comparación con difflib
+sobre toda la tabla, con 10k y 100k temas sintéticos. Verifica además que ambas
+elijan la misma sugerencia con el mismo ratio.
+
+    python scripts/bench_suggestion_matching.py --sizes 10000 100000 --queries 50
+"""
+import argparse
+import difflib
+import os
+import random
+import string
+import sys
+import time
+
+# Asegúrate de que el script pueda encontrar la carpeta 'app'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = [
+    "introducción", "a", "python", "avanzado", "datos", "con", "para", "de", "redes", "neuronales",
+    "machine", "learning", "desarrollo", "web", "react", "django", "seguridad", "informática",
+    "bases", "sql", "diseño", "ux", "marketing", "digital", "finanzas", "personales", "java",
+    "docker", "kubernetes", "cloud", "aws", "estadística", "análisis", "excel", "power", "bi",
+    "fotografía", "inglés", "técnico", "gestión", "proyectos", "ágiles", "scrum", "linux", "git",
+]
+
+
+def make_topics(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    topics = set()
+    while len(topics) < count:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(2, 7))]
+        if rng.random() < 0.3:
+            words.append(f"nivel {rng.randint(1, 500)}")
+        topics.add(" ".join(words).capitalize())
+    return sorted(topics)
+
+
+def make_query(rng: random.Random, topics: list) -> str:
+    """Un tema existente con errores de tipeo y espacios de más, o uno nuevo."""
+    if rng.random() < 0.3:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6)))
+    chars = list(rng.choice(topics))
+    for _ in range(rng.randint(0, 3)):
+        chars[rng.randrange(len(chars))] = rng.choice(string.ascii_lowercase)
+    return "  ".join("".join(chars).split(" ")) if rng.random() < 0.3 else "".join(chars)
+
+
+def brute_force(topic: str, rows: list, cutoff: float):
+    """Comportamiento anterior: ratio contra todas las sugerencias (con la misma normalización)."""
+    from app.core.suggestion_index import normalize_topic
+
+    normalized = normalize_topic(topic)
+    best, best_ratio = None, 0.0
+    for suggestion_id, existing in rows:
+        ratio = difflib.SequenceMatcher(None, normalized, normalize_topic(existing)).ratio()
+        if ratio >= cutoff and ratio > best_ratio:
+            best, best_ratio = suggestion_id, ratio
+    return (best, best_ratio) if best is not None else None
+
+
+def run(size: int, queries: int, brute_queries: int, cutoff: float):
+    from app.core.suggestion_index import SuggestionIndex
+
+    rows = list(enumerate(make_topics(size), 1))
+    index = SuggestionIndex()
+    started = time.perf_counter()
+    index.reload(rows)
+    index.best_match("calentamiento", cutoff)  # consolida los arrays
+    build = time.perf_counter() - started
+
+    rng = random.Random(size)
+    sample = [make_query(rng, [topic for _, topic in rows]) for _ in range(queries)]
+
+    started = time.perf_counter()
+    results = [index.best_match(query, cutoff) for query in sample]
+    index_ms = (time.perf_counter() - started) / queries * 1000
+
+    checked = sample[:brute_queries]
+    started = time.perf_counter()
+    expected = [brute_force(query, rows, cutoff) for query in checked]
+    brute_ms = (time.perf_counter() - started) / max(len(checked), 1) * 1000
+
+    mismatches = sum(1 for got, want in zip(results, expected) if got != want)
+    matched = sum(1 for result in results if result)
+    print(
+        f"{size:>7} temas | índice: carga {build * 1000:7.0f} ms, {index_ms:7.2f} ms/consulta | "
+        f"difflib sobre la tabla: {brute_ms:8.1f} ms/consulta | "
+        f"fusiones {matched}/{queries} | diferencias {mismatches}/{len(checked)}"
+    )
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--brute-queries", type=int, default=20, help="consultas verificadas con difflib")
+    parser.add_argument("--cutoff", type=float, default=0.8)
+    args = parser.parse_args()
+
+    mismatches = sum(run(size, args.queries, args.brute_queries, args.cutoff) for size in args.sizes)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# backend/tests/test_admin.py
+
+import json
+
+import pytest
+
+from app.routers import admin
+
+from conftest import current_user, make_client, seed_enrolled_courses
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    db = session_factory()
+    seed_enrolled_courses(db, course_count=5, students_per_course=2)
+    db.close()
+    # El reporte en streaming abre su propia sesión
+    monkeypatch.setattr(admin, "SessionLocal", session_factory)
+    return make_client(session_factory, admin.router, user=current_user(1000, "instructor"))
+
+
+def test_streamed_report_is_one_course_per_line(client):
+    response = client.get("/admin/enrollments-detailed", params={"stream": "true"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    courses = [json.loads(line) for line in response.text.splitlines()]
+    assert [course["id"] for course in courses] == [1, 2, 3, 4, 5]
+    assert [student["progress"] for student in courses[0]["enrolled_students"]] == [50, 50]
+
+
+@pytest.mark.parametrize("params", [{"skip": 2}, {"limit": 2}, {"skip": 0, "limit": 10}])
+def test_streamed_report_rejects_paging(client, params):
+    response = client.get("/admin/enrollments-detailed", params={"stream": "true", **params})
+
+    assert response.status_code == 400
+
+
+def test_report_page_limit_is_capped(client):
+    assert [course["id"] for course in client.get("/admin/enrollments-detailed", params={"skip": 1, "limit": 2}).json()] == [2, 3]
+    assert client.get("/admin/enrollments-detailed", params={"limit": 10_000}).status_code == 422
@@ -0,0 +1,77 @@
+# backend/tests/test_ai_cache.py
+
+import json
+import sqlite3
+
+import pytest
+
+from app.core import ai_cache
+from app.services import ai_service
+
+
+class FakeModel:
+    """Modelo de Gemini que devuelve respuestas numeradas y cuenta las llamadas."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        text = self.responses[min(len(self.prompts), len(self.responses)) - 1]
+        return type("Response", (), {"text": text})()
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path, monkeypatch):
+    cache = ai_cache.SQLiteResponseCache(path=str(tmp_path / "ai_cache.sqlite3"))
+    monkeypatch.setattr(ai_service, "response_cache", cache)
+    return cache
+
+
+def test_sqlite_cache_closes_its_connections(sqlite_cache, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(ai_cache.sqlite3, "connect", tracking_connect)
+    sqlite_cache.set("clave", "valor")
+    assert sqlite_cache.get("clave") == "valor"
+    assert sqlite_cache.stats()["entries"] == 1
+
+    assert len(opened) == 3
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_motivational_phrases_are_not_written_to_the_cache(sqlite_cache, monkeypatch):
+    monkeypatch.setattr(ai_service, "model", FakeModel([json.dumps({"phrases": ["¡Muy bien!"]})]))
+
+    assert ai_service.generate_motivational_phrases(80, 100, True, 1) == ["¡Muy bien!"]
+    assert sqlite_cache.stats()["entries"] == 0
+
+
+def test_module_content_regeneration_bypasses_and_replaces_the_cache(sqlite_cache, monkeypatch):
+    model = FakeModel(["Versión 1", "Versión 2"])
+    monkeypatch.setattr(ai_service, "model", model)
+
+    assert ai_service.generate_module_content_from_ai("Variables", "Tipos") == "Versión 1"
+    assert ai_service.generate_module_content_from_ai("Variables", "Tipos") == "Versión 1"
+    assert ai_service.generate_module_content_from_ai("Variables", "Tipos", use_cache=False) == "Versión 2"
+    # La versión regenerada reemplaza a la cacheada
+    assert ai_service.generate_module_content_from_ai("Variables", "Tipos") == "Versión 2"
+    assert len(model.prompts) == 2
+
+
+def test_empty_curriculum_is_not_cached(sqlite_cache, monkeypatch):
+    modules = {"modules": [{"title": "Intro", "order_index": 1}]}
+    monkeypatch.setattr(ai_service, "model", FakeModel([json.dumps({"modules": []}), json.dumps(modules)]))
+
+    # El reintento de la etapa vuelve a llamar a la IA en lugar de leer la respuesta vacía
+    assert ai_service.generate_curriculum_from_ai("Python", "Desde cero") == {"modules": []}
+    assert ai_service.generate_curriculum_from_ai("Python", "Desde cero") == modules
@@ -0,0 +1,28 @@
+# backend/tests/test_audio_storage.py
+
+import pytest
+
+from app.core.audio_storage import AudioStorage, LocalAudioStorage
+
+
+def test_backend_missing_a_method_cannot_be_created():
+    class IncompleteStorage(AudioStorage):
+        backend = "incompleto"
+
+        def stat(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteStorage()
+
+
+def test_local_storage_serves_byte_ranges(tmp_path):
+    storage = LocalAudioStorage(root=str(tmp_path))
+    data = bytes(range(256)) * 1024
+
+    storage.save("modulo_1.mp3", data)
+
+    assert storage.stat("modulo_1.mp3").size == len(data)
+    assert b"".join(storage.iter_range("modulo_1.mp3", 100, 70_000)) == data[100:70_001]
+    assert storage.exists("modulo_2.mp3") is False
+    assert list(tmp_path.iterdir()) == [tmp_path / "modulo_1.mp3"]
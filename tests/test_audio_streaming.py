@@ -0,0 +1,124 @@
+# backend/tests/test_audio_streaming.py
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.audio_storage import LocalAudioStorage
+from app.logic.media_logic import parse_byte_range, RangeNotSatisfiable
+from app.routers import audio
+
+KEY = "a" * 64 + ".mp3"
+DATA = bytes(range(256)) * 4  # 1024 bytes
+SIZE = len(DATA)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-499", (0, 499)),
+    ("bytes=500-", (500, SIZE - 1)),
+    ("bytes=-500", (SIZE - 500, SIZE - 1)),
+    ("bytes=-5000", (0, SIZE - 1)),
+    ("bytes=1000-5000", (1000, SIZE - 1)),
+    (" bytes = 10-20", (10, 20)),
+    # Se responde el recurso completo
+    (None, None),
+    ("", None),
+    ("bytes=0-10,20-30", None),
+    ("items=0-10", None),
+    ("bytes=abc-10", None),
+    ("bytes=10", None),
+    ("bytes=20-10", None),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, SIZE) == expected
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=-0", SIZE),
+    ("bytes=1024-", SIZE),
+    ("bytes=5000-6000", SIZE),
+    ("bytes=-500", 0),
+    ("bytes=0-", 0),
+])
+def test_parse_byte_range_not_satisfiable(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(header, size)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = LocalAudioStorage(root=str(tmp_path))
+    storage.save(KEY, DATA)
+    monkeypatch.setattr(audio, "audio_storage", storage)
+    return storage
+
+
+@pytest.fixture
+def client(storage):
+    app = FastAPI()
+    app.include_router(audio.router)
+    return TestClient(app)
+
+
+def test_range_request_returns_206_with_content_range(client):
+    response = client.get(f"/audio/modules/{KEY}", headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 100-199/{SIZE}"
+    assert response.headers["Content-Length"] == "100"
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.content == DATA[100:200]
+
+
+def test_unsatisfiable_range_returns_416(client):
+    response = client.get(f"/audio/modules/{KEY}", headers={"Range": f"bytes={SIZE}-"})
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{SIZE}"
+    assert response.content == b""
+
+
+def test_stale_if_range_returns_the_whole_file(client):
+    response = client.get(f"/audio/modules/{KEY}", headers={"Range": "bytes=0-9", "If-Range": '"otra-version"'})
+
+    assert response.status_code == 200
+    assert "Content-Range" not in response.headers
+    assert response.headers["Content-Length"] == str(SIZE)
+    assert response.content == DATA
+
+
+def test_matching_if_range_honours_the_range(client, storage):
+    etag = storage.stat(KEY).etag
+
+    response = client.get(f"/audio/modules/{KEY}", headers={"Range": "bytes=-10", "If-Range": etag})
+
+    assert response.status_code == 206
+    assert response.content == DATA[-10:]
+
+
+def test_matching_etag_returns_304(client, storage):
+    response = client.get(f"/audio/modules/{KEY}", headers={"If-None-Match": storage.stat(KEY).etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("range_header, status_code, length", [
+    (None, 200, SIZE),
+    ("bytes=100-199", 206, 100),
+])
+def test_head_has_the_get_headers_without_reading_the_file(client, storage, monkeypatch, range_header, status_code, length):
+    headers = {"Range": range_header} if range_header else {}
+    get_response = client.get(f"/audio/modules/{KEY}", headers=headers)
+
+    def fail(*args):
+        raise AssertionError("HEAD no debe leer el archivo")
+
+    monkeypatch.setattr(storage, "iter_range", fail)
+    head_response = client.head(f"/audio/modules/{KEY}", headers=headers)
+
+    assert head_response.status_code == get_response.status_code == status_code
+    assert head_response.content == b""
+    assert head_response.headers["Content-Length"] == str(length)
+    for name in ("Content-Type", "Content-Range", "ETag", "Last-Modified", "Cache-Control", "Accept-Ranges"):
+        assert head_response.headers.get(name) == get_response.headers.get(name)
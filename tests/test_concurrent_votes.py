@@ -0,0 +1,106 @@
+# backend/tests/test_concurrent_votes.py
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app import db_models
+from app.database import Base
+from app.repositories import rating_repo, suggestion_repo
+
+from conftest import seed_roles_and_instructor, add_student
+
+THREADS = 8
+VOTES_PER_THREAD = 25
+THRESHOLD = 100
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """SQLite en archivo: cada hilo con su propia conexión, como el pool de la app."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'votes.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(params=["sqlite", "mysql"])
+def concurrent_engine(request):
+    return request.getfixturevalue("file_engine" if request.param == "sqlite" else "mysql_engine")
+
+
+def _run_in_threads(engine, work):
+    """Ejecuta `work(db, thread_number)` en THREADS hilos a la vez, cada uno con su sesión."""
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def run(thread_number):
+        db = Session()
+        try:
+            barrier.wait()
+            work(db, thread_number)
+        except Exception as error:  # se revisa en el hilo principal
+            errors.append(error)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_concurrent_votes_are_all_counted_and_cross_the_threshold_once(concurrent_engine):
+    Session = sessionmaker(bind=concurrent_engine)
+    with Session() as db:
+        db.add(db_models.CourseSuggestion(id=1, topic="Rust para backend"))
+        db.commit()
+
+    crossings = []
+
+    def vote(db, thread_number):
+        for _ in range(VOTES_PER_THREAD):
+            _, crossed = suggestion_repo.add_vote(db, 1, THRESHOLD)
+            crossings.append(crossed)
+
+    _run_in_threads(concurrent_engine, vote)
+
+    with Session() as db:
+        suggestion = db.get(db_models.CourseSuggestion, 1)
+        assert suggestion.votes == THREADS * VOTES_PER_THREAD
+        assert suggestion.status == "course_created"
+    assert crossings.count(True) == 1
+
+
+def test_concurrent_ratings_keep_one_row_per_user_and_target(mysql_engine):
+    Session = sessionmaker(bind=mysql_engine)
+    with Session() as db:
+        instructor_id = seed_roles_and_instructor(db)
+        for user_id in (1, 2):
+            add_student(db, user_id)
+        db.add(db_models.Course(id=1, title="Python", level="basico", category_id=1, instructor_id=instructor_id))
+        db.add(db_models.Module(id=10, course_id=1, title="Variables", order_index=1))
+        db.commit()
+
+    def rate(db, thread_number):
+        # Mismo usuario votando a la vez el curso y el módulo, cambiando el voto
+        for round_number in range(VOTES_PER_THREAD):
+            user_id = 1 + thread_number % 2
+            is_upvote = (thread_number + round_number) % 2 == 0
+            rating_repo.create_or_update_rating(db, user_id, 1, None, is_upvote)
+            rating_repo.create_or_update_rating(db, user_id, None, 10, is_upvote)
+
+    _run_in_threads(mysql_engine, rate)
+
+    with Session() as db:
+        rows = db.query(
+            db_models.Rating.user_id, db_models.Rating.course_id, db_models.Rating.module_id, func.count()
+        ).group_by(db_models.Rating.user_id, db_models.Rating.course_id, db_models.Rating.module_id).all()
+        assert set(rows) == {(1, 1, None, 1), (1, None, 10, 1), (2, 1, None, 1), (2, None, 10, 1)}
+        counts = rating_repo.get_rating_counts(db, course_id=1)
+        assert counts["upvotes"] + counts["downvotes"] == 2
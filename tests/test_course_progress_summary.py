@@ -0,0 +1,95 @@
+# backend/tests/test_course_progress_summary.py
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import db_models
+from app.repositories import progress_repo, quiz_repo
+
+from conftest import seed_roles_and_instructor, add_student
+
+STUDENTS = (1, 2)
+MODULES = (10, 11, 12)
+
+
+@pytest.fixture(params=[False, True], ids=["sin_autoflush", "con_autoflush"])
+def db(engine, request):
+    """El resumen debe dar lo mismo con o sin autoflush en la sesión."""
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=request.param)()
+    instructor_id = seed_roles_and_instructor(session)
+    for user_id in STUDENTS:
+        add_student(session, user_id)
+    session.add(db_models.Course(id=1, title="Python", level="basico", category_id=1, instructor_id=instructor_id))
+    for order_index, module_id in enumerate(MODULES):
+        session.add(db_models.Module(id=module_id, course_id=1, title=f"Módulo {module_id}", order_index=order_index))
+    for user_id in STUDENTS:
+        session.add(db_models.CourseEnrollment(user_id=user_id, course_id=1))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _summaries(db):
+    db.expire_all()
+    return {
+        (row.user_id, row.course_id): (row.completed_modules, row.total_modules, row.quiz_attempts, row.quiz_score_sum)
+        for row in db.query(db_models.UserCourseProgress).all()
+    }
+
+
+def _assert_matches_rebuild(db):
+    incremental = _summaries(db)
+    progress_repo.rebuild_course_progress_summaries(db)
+    # La reconstrucción también crea filas para los inscritos sin actividad
+    rebuilt = _summaries(db)
+    assert incremental == {key: rebuilt[key] for key in incremental}
+    return incremental
+
+
+def _add_raw_history(db):
+    """Actividad anterior al resumen: la fila se calcula desde estos datos crudos."""
+    db.add(db_models.QuizAttempt(user_id=1, module_id=10, score=40.0, passed=False))
+    db.add(db_models.StudentProgress(user_id=1, module_id=11, status='completed'))
+    db.commit()
+
+
+@pytest.mark.parametrize("existing_row", [False, True], ids=["sin_fila", "con_fila"])
+def test_quiz_attempt_is_counted_once(db, existing_row):
+    _add_raw_history(db)
+    if existing_row:
+        progress_repo.rebuild_course_progress_summaries(db)
+
+    quiz_repo.create_quiz_attempt(db, user_id=1, module_id=10, score=90.0, passed=True)
+    quiz_repo.create_quiz_attempt(db, user_id=1, module_id=12, score=60.0, passed=True, course_id=1)
+
+    summaries = _assert_matches_rebuild(db)
+    assert summaries[(1, 1)] == (1, 3, 3, 190.0)
+
+
+@pytest.mark.parametrize("existing_row", [False, True], ids=["sin_fila", "con_fila"])
+def test_repeated_completion_is_counted_once(db, existing_row):
+    _add_raw_history(db)
+    if existing_row:
+        progress_repo.rebuild_course_progress_summaries(db)
+
+    progress_repo.mark_module_as_completed(db, user_id=1, module_id=10)
+    progress_repo.mark_module_as_completed(db, user_id=1, module_id=10)
+    progress_repo.mark_module_as_completed(db, user_id=1, module_id=11)
+
+    summaries = _assert_matches_rebuild(db)
+    assert summaries[(1, 1)] == (2, 3, 1, 40.0)
+
+
+@pytest.mark.parametrize("existing_row", [False, True], ids=["sin_fila", "con_fila"])
+def test_graded_attempts_match_the_rebuild(db, existing_row):
+    _add_raw_history(db)
+    if existing_row:
+        progress_repo.rebuild_course_progress_summaries(db)
+
+    quiz_repo.create_graded_attempts(db, module_id=10, course_id=1, graded=[(1, 80.0, True), (2, 30.0, False)])
+    # Segunda entrega del mismo módulo: el alumno 1 ya lo tenía aprobado
+    quiz_repo.create_graded_attempts(db, module_id=10, course_id=1, graded=[(1, 100.0, True), (2, 70.0, True)])
+
+    summaries = _assert_matches_rebuild(db)
+    assert summaries[(1, 1)] == (2, 3, 3, 220.0)
+    assert summaries[(2, 1)] == (1, 3, 2, 100.0)
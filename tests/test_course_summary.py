@@ -0,0 +1,169 @@
+# backend/tests/test_course_summary.py
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import db_models
+from app.database import Base
+from app.dependencies import get_async_db
+from app.routers import courses
+from app.services import ai_service, course_service
+from app.services.course_service import CourseService
+
+from conftest import seed_roles_and_instructor, add_student, current_user, make_client
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Misma base SQLite en archivo para la sesión síncrona y la asíncrona (aiosqlite)."""
+    path = tmp_path / "courses.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    async_session_factory = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    db = session_factory()
+    instructor_id = seed_roles_and_instructor(db)
+    add_student(db, 1)
+    db.add(db_models.Course(id=1, title="Python", description="Desde cero", level="basico",
+                            category_id=1, instructor_id=instructor_id))
+    db.commit()
+    db.close()
+
+    yield session_factory, async_session_factory
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+
+@pytest.fixture
+def ai_calls(monkeypatch):
+    calls = []
+
+    def fake_summary(title, description, use_cache=True):
+        calls.append((title, description, use_cache))
+        time.sleep(0.05)
+        return f"### {title}: {description} (v{len(calls)})"
+
+    monkeypatch.setattr(ai_service, "generate_course_summary_from_ai", fake_summary)
+    course_service._refresh_requested.clear()
+    return calls
+
+
+@pytest.fixture
+def refresh_requests(monkeypatch):
+    requested = []
+    monkeypatch.setattr(course_service, "queue_course_summary_refresh", requested.append)
+    return requested
+
+
+def _client(databases, user=None):
+    session_factory, async_session_factory = databases
+    client = make_client(session_factory, courses.router, user=user)
+
+    async def _get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    client.app.dependency_overrides[get_async_db] = _get_async_db
+    return client
+
+
+def _wait_for(requested, count=1):
+    # El encolado corre en el pool de hilos del event loop, sin demorar la respuesta
+    deadline = time.monotonic() + 2
+    while len(requested) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_summary_is_generated_once_and_revalidated_with_304(databases, ai_calls):
+    client = _client(databases)
+
+    first = client.get("/courses/1/summary")
+    again = client.get("/courses/1/summary", headers={"If-None-Match": first.headers["ETag"]})
+    weak = client.get("/courses/1/summary", headers={"If-None-Match": f'"otro", W/{first.headers["ETag"]}'})
+
+    assert first.status_code == 200
+    assert first.json().startswith("### Python")
+    assert again.status_code == weak.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert len(ai_calls) == 1
+
+
+def test_concurrent_first_visits_share_one_generation(databases, ai_calls):
+    _, async_session_factory = databases
+
+    async def visit():
+        async with async_session_factory() as db:
+            return await CourseService(db).get_course_summary(1)
+
+    async def visits():
+        return await asyncio.gather(*(visit() for _ in range(5)))
+
+    results = asyncio.run(visits())
+
+    assert len(ai_calls) == 1
+    assert {result.summary for result in results} == {"### Python: Desde cero (v1)"}
+
+
+def test_description_change_serves_the_stale_summary_and_regenerates_in_the_worker(
+        databases, ai_calls, refresh_requests):
+    session_factory, _ = databases
+    client = _client(databases, user=current_user(1000, "instructor"))
+    old = client.get("/courses/1/summary")
+
+    updated = client.put("/courses/1", json={"title": "Python", "description": "Para datos", "category_id": 1, "level": "basico"})
+    assert updated.status_code == 200
+    _wait_for(refresh_requests)
+
+    # Mientras el worker no termina, las visitas no llaman a la IA y reciben el resumen anterior
+    for _ in range(3):
+        stale = client.get("/courses/1/summary", headers={"If-None-Match": old.headers["ETag"]})
+        assert stale.status_code == 304
+    assert len(ai_calls) == 1
+    assert refresh_requests == [1]
+
+    db = session_factory()
+    course_service.refresh_course_summary(db, 1)
+    course_service.refresh_course_summary(db, 1)  # reentrega: ya está al día
+    db.close()
+
+    fresh = client.get("/courses/1/summary", headers={"If-None-Match": old.headers["ETag"]})
+    assert fresh.status_code == 200
+    assert fresh.json() == "### Python: Para datos (v2)"
+    assert fresh.headers["ETag"] != old.headers["ETag"]
+    assert ai_calls[1:] == [("Python", "Para datos", True)]
+
+
+def test_update_without_changes_does_not_request_a_refresh(databases, ai_calls, refresh_requests):
+    client = _client(databases, user=current_user(1000, "instructor"))
+    client.get("/courses/1/summary")
+
+    client.put("/courses/1", json={"title": "Python", "description": "Desde cero", "category_id": 1, "level": "intermedio"})
+    time.sleep(0.1)
+
+    assert refresh_requests == []
+
+
+@pytest.mark.parametrize("user, status_code", [
+    (current_user(1, "student"), 403),
+    (current_user(1000, "instructor"), 403),
+    (current_user(9999, "admin"), 200),
+])
+def test_regenerate_is_admin_only(databases, ai_calls, user, status_code):
+    client = _client(databases, user=user)
+    client.get("/courses/1/summary")
+
+    response = client.post("/courses/1/summary/regenerate")
+
+    assert response.status_code == status_code
+    if status_code == 200:
+        assert response.json() == "### Python: Desde cero (v2)"
+        assert ai_calls[-1] == ("Python", "Desde cero", False)
+    else:
+        assert len(ai_calls) == 1
@@ -0,0 +1,142 @@
+# backend/tests/test_generation_pipeline.py
+
+import pytest
+
+import worker
+from app import db_models
+from app.core.task_queue import celery_app
+from app.repositories import generation_job_repo
+from app.routers import courses, jobs
+from app.services import ai_service, generation_pipeline, tts_service
+
+from conftest import seed_roles_and_instructor, current_user, make_client
+
+CURRICULUM = {
+    "modules": [
+        {"title": "Introducción", "description": "Qué es Python", "order_index": 0},
+        {"title": "Variables", "description": "Tipos básicos", "order_index": 1},
+    ]
+}
+
+
+def _course_job(db):
+    instructor_id = seed_roles_and_instructor(db)
+    db.add(db_models.Course(id=1, title="Python", description="Desde cero", level="basico",
+                            category_id=1, instructor_id=instructor_id))
+    db.commit()
+    return generation_job_repo.create_job(db, "course", created_by=instructor_id, course_id=1)
+
+
+def _module_titles(db):
+    return [title for (title,) in db.query(db_models.Module.title).filter(
+        db_models.Module.course_id == 1
+    ).order_by(db_models.Module.order_index)]
+
+
+def test_curriculum_stage_does_not_duplicate_modules_on_redelivery(db, monkeypatch):
+    calls = []
+
+    def fake_curriculum(title, description, use_cache=True):
+        calls.append(title)
+        return CURRICULUM
+
+    monkeypatch.setattr(ai_service, "generate_curriculum_from_ai", fake_curriculum)
+    job = _course_job(db)
+
+    generation_pipeline._generate_curriculum(db, job)
+    # Reentrega de la tarea, reintento o segundo POST de generate-curriculum
+    generation_pipeline._generate_curriculum(db, job)
+    second_job = generation_job_repo.create_job(db, "course", created_by=job.created_by, course_id=1)
+    generation_pipeline._generate_curriculum(db, second_job)
+
+    assert _module_titles(db) == ["Introducción", "Variables"]
+    # Con la currícula ya guardada no se vuelve a llamar a la IA
+    assert calls == ["Python"]
+
+
+def test_curriculum_is_not_saved_if_another_job_saved_it_first(db, monkeypatch):
+    job = _course_job(db)
+
+    def curriculum_saved_meanwhile(title, description, use_cache=True):
+        # Otro trabajo del mismo curso guarda su currícula mientras esta se genera
+        db.add(db_models.Module(course_id=1, title="De otro trabajo", order_index=0))
+        db.commit()
+        return CURRICULUM
+
+    monkeypatch.setattr(ai_service, "generate_curriculum_from_ai", curriculum_saved_meanwhile)
+    generation_pipeline._generate_curriculum(db, job)
+
+    assert _module_titles(db) == ["De otro trabajo"]
+
+
+QUIZ = [{"question_text": "¿Qué imprime print(1)?", "options": [
+    {"option_text": "1", "is_correct": True}, {"option_text": "0", "is_correct": False},
+]}]
+
+
+@pytest.fixture
+def eager_pipeline(session_factory, monkeypatch):
+    """Pipeline completo por la API, con Celery en modo eager y la IA/TTS simulados."""
+    assert celery_app.conf.task_always_eager and celery_app.conf.broker_url == "memory://"
+    monkeypatch.setattr(worker, "session_factory", session_factory)
+    monkeypatch.setattr(generation_pipeline, "GENERATION_STAGE_RETRY_DELAY_SECONDS", 0)
+    monkeypatch.setattr(ai_service, "generate_curriculum_from_ai", lambda title, description, use_cache=True: CURRICULUM)
+    monkeypatch.setattr(ai_service, "generate_module_content_from_ai",
+                        lambda title, description, use_cache=True: f"# {title}\n\nContenido.")
+
+    async def fake_quizzes(modules):
+        return {module_id: QUIZ for module_id, _, _ in modules}
+
+    monkeypatch.setattr(ai_service, "generate_quizzes_from_ai", fake_quizzes)
+    monkeypatch.setattr(tts_service, "synthesize_module_audio", lambda text: f"{abs(hash(text)):x}.mp3")
+
+    db = session_factory()
+    instructor_id = seed_roles_and_instructor(db)
+    db.add(db_models.Course(id=1, title="Python", description="Desde cero", level="basico",
+                            category_id=1, instructor_id=instructor_id, creator_id=instructor_id))
+    db.commit()
+    db.close()
+    return make_client(session_factory, courses.router, jobs.router, user=current_user(instructor_id, "instructor"))
+
+
+def _post_and_poll(client):
+    response = client.post("/courses/1/generate-curriculum")
+    assert response.status_code == 202
+    location = response.headers["Location"]
+    assert location == f"/jobs/{response.json()['id']}"
+
+    for _ in range(50):
+        job = client.get(location).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+    raise AssertionError(f"El trabajo no terminó: {job}")
+
+
+def test_generate_curriculum_runs_the_pipeline_and_reports_the_job(eager_pipeline, session_factory):
+    job = _post_and_poll(eager_pipeline)
+
+    assert job["status"] == "completed"
+    assert job["stage"] == generation_pipeline.STAGE_AUDIO
+    assert job["progress"] == 100
+    assert job["error"] is None
+
+    db = session_factory()
+    modules = db.query(db_models.Module).filter_by(course_id=1).order_by(db_models.Module.order_index).all()
+    assert [module.title for module in modules] == ["Introducción", "Variables"]
+    assert all(module.content_data and module.questions and module.content_audio_url for module in modules)
+    db.close()
+
+
+def test_failed_stage_is_reported_with_its_stage_and_progress(eager_pipeline, monkeypatch):
+    monkeypatch.setattr(ai_service, "generate_quizzes_from_ai", _no_quizzes)
+
+    job = _post_and_poll(eager_pipeline)
+
+    assert job["status"] == "failed"
+    assert job["stage"] == generation_pipeline.STAGE_QUIZ
+    assert job["progress"] == 50
+    assert "quiz" in job["error"]
+
+
+async def _no_quizzes(modules):
+    return {module_id: [] for module_id, _, _ in modules}
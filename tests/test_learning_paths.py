@@ -0,0 +1,79 @@
+# backend/tests/test_learning_paths.py
+
+from types import SimpleNamespace
+
+from fastapi import BackgroundTasks
+
+from app import db_models
+from app.repositories import learning_path_repo
+from app.routers import learning_paths
+from app.services import ai_service, learning_path_service
+
+from conftest import seed_roles_and_instructor, add_student
+
+
+def _seed_path(db):
+    instructor_id = seed_roles_and_instructor(db)
+    add_student(db, 1)
+    db.add(db_models.Course(id=1, title="Python", level="basico", category_id=1, instructor_id=instructor_id))
+    db.add(db_models.LearningPath(id=1, title="Ciencia de datos"))
+    db.add(db_models.LearningPathCourse(path_id=1, course_id=1, step=1))
+    db.commit()
+    return SimpleNamespace(id=1)
+
+
+def _view(db, user):
+    background_tasks = BackgroundTasks()
+    detail = learning_paths.read_learning_path_details(1, background_tasks, db=db, current_user=user)
+    return detail, background_tasks
+
+
+def test_missing_suggestions_are_queued_once_after_the_response(db, monkeypatch):
+    user = _seed_path(db)
+    queued = []
+    monkeypatch.setattr(learning_paths, "enqueue", lambda task_name, path_id: queued.append((task_name, path_id)))
+
+    detail, background_tasks = _view(db, user)
+    # El encolado queda para después de la respuesta
+    assert queued == []
+    assert [task.func for task in background_tasks.tasks] == [learning_paths._queue_suggestions_refresh]
+    assert [course.title for course in detail.courses] == ["Python"]
+
+    # Las visitas siguientes no vuelven a encolar, aunque la IA todavía no haya respondido
+    for _ in range(3):
+        _, later_tasks = _view(db, user)
+        assert later_tasks.tasks == []
+
+    marker = db.get(db_models.LearningPathSuggestion, 1)
+    assert marker.suggested_titles == [] and marker.generated_at is None
+
+
+def test_empty_ai_answer_does_not_requeue(db, monkeypatch):
+    user = _seed_path(db)
+    monkeypatch.setattr(ai_service, "suggest_missing_courses_for_path", lambda title, courses: [])
+    _view(db, user)
+
+    learning_path_service.refresh_path_suggestions(db, 1)
+
+    _, background_tasks = _view(db, user)
+    assert background_tasks.tasks == []
+
+
+def test_broker_outage_does_not_break_the_view(db, monkeypatch):
+    user = _seed_path(db)
+
+    def broker_down(task_name, path_id):
+        raise ConnectionError("broker no disponible")
+
+    monkeypatch.setattr(learning_paths, "enqueue", broker_down)
+    detail, background_tasks = _view(db, user)
+    for task in background_tasks.tasks:
+        task.func(*task.args, **task.kwargs)
+
+    assert detail.title == "Ciencia de datos"
+
+
+def test_only_one_of_concurrent_views_registers_the_request(db):
+    _seed_path(db)
+    assert learning_path_repo.mark_path_suggestions_requested(db, 1) is True
+    assert learning_path_repo.mark_path_suggestions_requested(db, 1) is False
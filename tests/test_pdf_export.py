@@ -0,0 +1,197 @@
+# backend/tests/test_pdf_export.py
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import db_models
+from app.core import pdf_cache
+from app.repositories import module_repo
+from app.routers import courses, modules
+from app.services import pdf_service
+
+from conftest import seed_roles_and_instructor, current_user, make_client
+
+INSTRUCTOR = current_user(1000, "instructor")
+
+
+class FakeRenderer:
+    """Reemplaza a WeasyPrint: guarda el HTML recibido como si fuera el PDF."""
+
+    def __init__(self):
+        self.documents = []
+        self._lock = threading.Lock()
+
+    def __call__(self, html, path):
+        time.sleep(0.05)
+        with self._lock:
+            self.documents.append(html)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as pdf_file:
+            pdf_file.write(html)
+        os.replace(tmp_path, path)
+
+
+@pytest.fixture
+def renderer(tmp_path, monkeypatch):
+    renderer = FakeRenderer()
+    # Hilos en lugar del pool de procesos, para que el reemplazo de WeasyPrint aplique
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(pdf_service, "_pdf_executor", executor)
+    monkeypatch.setattr(pdf_service, "write_pdf_atomically", renderer)
+    yield renderer
+    executor.shutdown()
+
+
+@pytest.fixture
+def fragments(monkeypatch):
+    """Módulos cuyo Markdown se convirtió a HTML, en orden."""
+    rendered = []
+    render = pdf_service.render_module_fragment
+
+    def counting_render(title, description, content):
+        rendered.append(title)
+        return render(title, description, content)
+
+    monkeypatch.setattr(pdf_service, "render_module_fragment", counting_render)
+    return rendered
+
+
+@pytest.fixture
+def seeded(db):
+    instructor_id = seed_roles_and_instructor(db)
+    db.add(db_models.Course(id=1, title="Python", level="basico", category_id=1, instructor_id=instructor_id))
+    # order_index invertido respecto del ID: el índice sigue el orden del curso
+    db.add_all([
+        db_models.Module(id=10, course_id=1, title="Funciones", order_index=1, content_data="## def"),
+        db_models.Module(id=11, course_id=1, title="Variables", order_index=0, content_data="## x = 1"),
+        db_models.Module(id=12, course_id=1, title="Sin contenido", order_index=2),
+    ])
+    db.commit()
+    return db
+
+
+def _cached(tmp_path, pattern):
+    return sorted(path.name for path in tmp_path.glob(pattern))
+
+
+def test_course_pdf_has_a_table_of_contents_in_course_order(seeded, session_factory, renderer, fragments):
+    client = make_client(session_factory, courses.router, user=INSTRUCTOR)
+
+    response = client.get("/courses/1/download-pdf")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    html = response.text
+    assert html.index('<a href="#module-11">Variables</a>') < html.index('<a href="#module-10">Funciones</a>')
+    assert '<section class="module" id="module-11">' in html
+    assert "Sin contenido" not in html
+    assert "target-counter(attr(href), page)" in html
+    assert fragments == ["Variables", "Funciones"]
+
+
+def test_course_pdf_reuses_module_fragments(seeded, session_factory, renderer, fragments, tmp_path):
+    client = make_client(session_factory, courses.router, user=INSTRUCTOR)
+    first = client.get("/courses/1/download-pdf")
+
+    module_repo.update_module_content(seeded, 10, "## def nueva()")
+    second = client.get("/courses/1/download-pdf")
+
+    # Solo se convierte el Markdown del módulo que cambió
+    assert fragments == ["Variables", "Funciones", "Funciones"]
+    assert len(renderer.documents) == 2
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert "def nueva()" in second.text
+    # La versión anterior del curso se conserva: una descarga en curso puede estar enviándola
+    assert len(_cached(tmp_path, "course_1_*.pdf")) == 2
+
+
+def test_course_pdf_answers_304_without_rendering(seeded, session_factory, renderer):
+    client = make_client(session_factory, courses.router, user=INSTRUCTOR)
+    first = client.get("/courses/1/download-pdf")
+
+    again = client.get("/courses/1/download-pdf", headers={"If-None-Match": first.headers["ETag"]})
+    cached = client.get("/courses/1/download-pdf")
+
+    assert again.status_code == 304
+    assert again.content == b""
+    assert cached.status_code == 200
+    assert cached.headers["ETag"] == first.headers["ETag"]
+    assert len(renderer.documents) == 1
+
+
+def test_old_versions_are_pruned_only_after_the_grace_period(renderer, tmp_path):
+    now = time.time()
+    for name, age in [("course_1_a.pdf", 3600), ("course_1_b.pdf", 30), ("course_1_c.pdf", 5), ("course_1_d.pdf", 0)]:
+        path = tmp_path / name
+        path.write_text(name)
+        os.utime(path, (now - age, now - age))
+
+    pdf_cache.remove_superseded_files("course_1_*.pdf", keep=str(tmp_path / "course_1_d.pdf"))
+
+    # d es la vigente y c la anterior; b todavía no cumplió la gracia y a sí
+    assert _cached(tmp_path, "course_1_*.pdf") == ["course_1_b.pdf", "course_1_c.pdf", "course_1_d.pdf"]
+
+
+def test_concurrent_module_downloads_share_one_render(seeded, renderer):
+    module = seeded.get(db_models.Module, 10)
+
+    async def downloads():
+        return await asyncio.gather(*(pdf_service.get_module_pdf(module) for _ in range(8)))
+
+    results = asyncio.run(downloads())
+
+    assert len({path for path, _ in results}) == 1
+    assert len(renderer.documents) == 1
+    assert pdf_service._in_flight == {}
+
+
+def test_module_pdf_is_served_from_disk_on_the_second_download(seeded, session_factory, renderer):
+    client = make_client(session_factory, modules.router, user=INSTRUCTOR)
+
+    first = client.get("/modules/10/download-pdf")
+    second = client.get("/modules/10/download-pdf")
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert len(renderer.documents) == 1
+
+
+def test_module_pdf_answers_304_for_a_matching_etag(seeded, session_factory, renderer):
+    client = make_client(session_factory, modules.router, user=INSTRUCTOR)
+    etag = client.get("/modules/10/download-pdf").headers["ETag"]
+
+    response = client.get("/modules/10/download-pdf", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert len(renderer.documents) == 1
+
+
+def test_content_change_renders_a_new_version_and_prunes_old_ones(seeded, session_factory, renderer, tmp_path):
+    client = make_client(session_factory, modules.router, user=INSTRUCTOR)
+    etags = [client.get("/modules/10/download-pdf").headers["ETag"]]
+
+    for content in ("## v2", "## v3"):
+        # Versiones anteriores ya fuera del período de gracia (conservando su orden)
+        for path in tmp_path.glob("module_10_*"):
+            old = path.stat().st_mtime - 3600
+            os.utime(path, (old, old))
+        module_repo.update_module_content(seeded, 10, content)
+        response = client.get("/modules/10/download-pdf")
+        assert f"<h2>{content[3:]}</h2>" in response.text
+        etags.append(response.headers["ETag"])
+
+    assert len(set(etags)) == 3
+    assert len(renderer.documents) == 3
+    # Quedan la versión vigente y la anterior (PDF y fragmento); la primera se borró
+    first_hash = etags[0].strip('"')
+    assert len(_cached(tmp_path, "module_10_*.pdf")) == 2
+    assert len(_cached(tmp_path, "module_10_*.html")) == 2
+    assert not any(name.startswith(f"module_10_{first_hash}") for name in _cached(tmp_path, "module_10_*"))
@@ -0,0 +1,108 @@
+# backend/tests/test_quizzes.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app import db_models
+from app.core import answer_key_cache
+from app.models.quiz import QuizSubmission
+from app.repositories import quiz_repo
+from app.routers import quizzes
+from app.security import is_module_course_owner
+
+from conftest import seed_roles_and_instructor, add_student
+
+
+def _user(user_id, role):
+    return SimpleNamespace(id=user_id, role=SimpleNamespace(name=role))
+
+
+@pytest.fixture
+def course_with_quiz(db, monkeypatch):
+    instructor_id = seed_roles_and_instructor(db)
+    db.add(db_models.User(id=2000, username="otro", email="otro@example.com", hashed_password="x", role_id=2))
+    add_student(db, 1)
+    add_student(db, 2)
+    db.add(db_models.User(id=3000, username="creador", email="creador@example.com", hashed_password="x", role_id=1))
+    db.add(db_models.Course(id=1, title="Python", level="avanzado", category_id=1,
+                            instructor_id=instructor_id, creator_id=3000))
+    db.add(db_models.Module(id=10, course_id=1, title="Variables", order_index=1))
+    question = db_models.Question(id=1, module_id=10, question_text="¿2 + 2?")
+    question.options = [
+        db_models.Option(id=1, option_text="4", is_correct=True),
+        db_models.Option(id=2, option_text="5", is_correct=False),
+    ]
+    db.add(question)
+    db.add(db_models.CourseEnrollment(user_id=1, course_id=1))
+    db.commit()
+
+    answer_key_cache.invalidate_answer_key(10)
+    monkeypatch.setattr(quizzes.phrase_pool, "get_phrase", lambda score, passed: "¡Bien!")
+    return instructor_id
+
+
+def test_submit_quiz_awards_stars_only_to_enrolled_students(db, course_with_quiz):
+    submission = QuizSubmission(answers={1: 1})
+
+    enrolled = quizzes.submit_quiz(10, submission, db=db, current_user=_user(1, "student"))
+    not_enrolled = quizzes.submit_quiz(10, submission, db=db, current_user=_user(2, "student"))
+
+    assert enrolled["score"] == not_enrolled["score"] == 100
+    assert enrolled["course_total_stars"] == not_enrolled["course_total_stars"] > 0
+    assert enrolled["course_earned_stars"] == enrolled["course_total_stars"]
+    assert not_enrolled["course_earned_stars"] == 0
+
+
+@pytest.mark.parametrize("user", [_user(1000, "instructor"), _user(3000, "student"), _user(9999, "admin")])
+def test_bulk_grading_allowed_for_course_owner_or_admin(db, course_with_quiz, user):
+    assert asyncio.run(is_module_course_owner(10, db=db, current_user=user)) is user
+
+
+@pytest.mark.parametrize("user", [_user(2000, "instructor"), _user(1, "student")])
+def test_bulk_grading_forbidden_for_other_instructors(db, course_with_quiz, user):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(is_module_course_owner(10, db=db, current_user=user))
+    assert error.value.status_code == 403
+
+
+def test_bulk_grading_endpoint_uses_the_ownership_check():
+    route = next(route for route in quizzes.router.routes if route.path.endswith("/submit-bulk"))
+    dependencies = [dependency.call for dependency in route.dependant.dependencies]
+    assert is_module_course_owner in dependencies
+
+
+def _add_question_from_worker(db, question_id, module_id, correct_option_id):
+    """Inserta como el worker de Celery: en otro proceso, sin invalidar la caché de la API."""
+    question = db_models.Question(id=question_id, module_id=module_id, question_text="¿Otra?")
+    question.options = [
+        db_models.Option(id=correct_option_id, option_text="Sí", is_correct=True),
+        db_models.Option(id=correct_option_id + 1, option_text="No", is_correct=False),
+    ]
+    db.add(question)
+    db.commit()
+
+
+def test_empty_answer_key_is_not_cached(db, course_with_quiz):
+    db.add(db_models.Module(id=11, course_id=1, title="Funciones", order_index=2))
+    db.commit()
+    answer_key_cache.invalidate_answer_key(11)
+
+    assert quiz_repo.get_answer_key(db, 11).total_questions == 0
+    assert answer_key_cache.get_cached_answer_key(11) is None
+
+    _add_question_from_worker(db, question_id=5, module_id=11, correct_option_id=50)
+
+    answer_key = quiz_repo.get_answer_key(db, 11)
+    assert answer_key.total_questions == 1
+    assert answer_key_cache.get_cached_answer_key(11) is answer_key
+
+
+def test_answer_key_with_questions_is_served_from_cache(db, course_with_quiz, query_counter):
+    first = quiz_repo.get_answer_key(db, 10)
+    query_counter.reset()
+
+    assert quiz_repo.get_answer_key(db, 10) is first
+    assert query_counter.count == 0
@@ -0,0 +1,114 @@
+# backend/tests/test_rating_counts.py
+
+import pytest
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app import db_models
+from app.core import rating_counts_cache
+from app.repositories import rating_repo
+
+from conftest import seed_roles_and_instructor, add_student
+
+
+class SQLiteUpsert:
+    """
+    Sustituto de mysql_insert para SQLite: traduce on_duplicate_key_update a
+    ON CONFLICT DO UPDATE. La atomicidad real del upsert se prueba contra MySQL
+    en test_concurrent_votes.py.
+    """
+
+    def __init__(self, table):
+        self._stmt = sqlite_insert(table)
+
+    def values(self, **values):
+        self._stmt = self._stmt.values(**values)
+        return self
+
+    @property
+    def inserted(self):
+        return self._stmt.excluded
+
+    def on_duplicate_key_update(self, **values):
+        return self._stmt.on_conflict_do_update(set_=values)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    rating_counts_cache._cache.clear()
+    yield
+    rating_counts_cache._cache.clear()
+
+
+@pytest.fixture
+def seeded(db, monkeypatch):
+    monkeypatch.setattr(rating_repo, "mysql_insert", SQLiteUpsert)
+    instructor_id = seed_roles_and_instructor(db)
+    for user_id in (1, 2, 3):
+        add_student(db, user_id)
+    for course_id in (1, 2, 3):
+        db.add(db_models.Course(id=course_id, title=f"Curso {course_id}", level="basico",
+                                category_id=1, instructor_id=instructor_id))
+    db.add(db_models.Module(id=10, course_id=1, title="Variables", order_index=0))
+    db.add_all([
+        db_models.Rating(user_id=1, course_id=1, is_upvote=True),
+        db_models.Rating(user_id=2, course_id=1, is_upvote=False),
+        db_models.Rating(user_id=1, course_id=2, is_upvote=True),
+        db_models.Rating(user_id=1, module_id=10, is_upvote=True),
+    ])
+    db.commit()
+    return db
+
+
+def test_repeated_counts_are_served_from_cache(seeded, query_counter):
+    first = rating_repo.get_rating_counts(seeded, course_id=1)
+    assert query_counter.count == 1
+
+    query_counter.reset()
+    again = rating_repo.get_rating_counts(seeded, course_id=1)
+    again["upvotes"] = 99  # la copia devuelta no altera el caché
+    third = rating_repo.get_rating_counts(seeded, course_id=1)
+
+    assert first == third == {"upvotes": 1, "downvotes": 1}
+    assert query_counter.count == 0
+
+
+def test_vote_invalidates_the_target_and_the_global_counts(seeded, query_counter):
+    rating_repo.get_rating_counts(seeded, course_id=1)
+    rating_repo.get_rating_counts(seeded, course_id=2)
+    rating_repo.get_rating_counts(seeded, module_id=10)
+    assert rating_repo.get_global_rating_counts(seeded) == {"upvotes": 3, "downvotes": 1}
+
+    rating = rating_repo.create_or_update_rating(seeded, user_id=2, course_id=1, module_id=None, is_upvote=True)
+    assert rating.is_upvote is True
+
+    query_counter.reset()
+    # Los demás objetivos siguen en caché
+    assert rating_repo.get_rating_counts(seeded, course_id=2) == {"upvotes": 1, "downvotes": 0}
+    assert rating_repo.get_rating_counts(seeded, module_id=10) == {"upvotes": 1, "downvotes": 0}
+    assert query_counter.count == 0
+
+    # El voto cambiado se ve en el curso y en el global
+    assert rating_repo.get_rating_counts(seeded, course_id=1) == {"upvotes": 2, "downvotes": 0}
+    assert rating_repo.get_global_rating_counts(seeded) == {"upvotes": 4, "downvotes": 0}
+    assert query_counter.count == 2
+    assert seeded.query(db_models.Rating).filter_by(user_id=2, course_id=1).count() == 1
+
+
+def test_bulk_counts_use_one_group_by_and_default_to_zero(seeded, query_counter):
+    rating_repo.get_rating_counts(seeded, course_id=2)
+    query_counter.reset()
+
+    counts = rating_repo.get_course_rating_counts_bulk(seeded, [1, 2, 3, 1])
+
+    assert counts == {
+        1: {"upvotes": 1, "downvotes": 1},
+        2: {"upvotes": 1, "downvotes": 0},
+        3: {"upvotes": 0, "downvotes": 0},
+    }
+    # El curso 2 ya estaba en caché: solo se consultan 1 y 3, en una sentencia
+    assert query_counter.count == 1
+    assert "GROUP BY" in query_counter.statements[0]
+
+    query_counter.reset()
+    assert rating_repo.get_course_rating_counts_bulk(seeded, [3, 1]) == {3: counts[3], 1: counts[1]}
+    assert query_counter.count == 0
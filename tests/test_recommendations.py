@@ -0,0 +1,130 @@
+# backend/tests/test_recommendations.py
+
+import threading
+
+import pytest
+
+from app import db_models
+from app.services import ai_service, recommendation_service
+from app.services.recommendation_service import CourseRecommender
+
+from conftest import seed_roles_and_instructor, add_student
+
+# id: (título, categoría, estado)
+COURSES = {
+    1: ("Python", 1, "published"),
+    2: ("Django", 1, "published"),
+    3: ("Flask", 1, "published"),
+    4: ("FastAPI", 1, "draft"),
+    5: ("Figma", 2, "published"),
+    6: ("Photoshop", 2, "published"),
+}
+# Curso -> alumnos inscriptos. Django comparte más alumnos con Python que Flask;
+# el borrador FastAPI es el más co-inscripto y Photoshop el más popular sin relación
+ENROLLMENTS = {
+    1: [10, 11, 12, 13],
+    2: [10, 11, 12],
+    3: [13],
+    4: [10, 11, 12, 13],
+    6: [20, 21, 22, 23, 24],
+}
+
+
+@pytest.fixture
+def seeded(db):
+    instructor_id = seed_roles_and_instructor(db)
+    db.add(db_models.Category(id=2, name="Diseño"))
+    for course_id, (title, category_id, status) in COURSES.items():
+        db.add(db_models.Course(id=course_id, title=title, level="basico", status=status,
+                                category_id=category_id, instructor_id=instructor_id))
+    for user_id in sorted({user_id for users in ENROLLMENTS.values() for user_id in users}):
+        add_student(db, user_id)
+    for course_id, users in ENROLLMENTS.items():
+        db.add_all([db_models.CourseEnrollment(user_id=user_id, course_id=course_id) for user_id in users])
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def recommender(seeded, session_factory, monkeypatch):
+    recommender = CourseRecommender(neighbors=5, session_factory=session_factory)
+    monkeypatch.setattr(recommendation_service, "course_recommender", recommender)
+    return recommender
+
+
+def _fitted(recommender):
+    recommender.warm_up().join()
+    assert recommender.is_ready
+    return recommender
+
+
+def test_enrolled_and_unpublished_courses_are_excluded(recommender):
+    recommended = _fitted(recommender).recommend([1], limit=10)
+
+    assert 1 not in recommended
+    assert 4 not in recommended
+    assert sorted(recommended) == [2, 3, 5, 6]
+
+
+def test_cooccurrence_ranks_first_and_category_breaks_ties(recommender):
+    recommended = _fitted(recommender).recommend([1], limit=10)
+
+    # Django (3 alumnos en común) > Flask (1) > cursos de otra categoría
+    assert recommended[:2] == [2, 3]
+    # Figma no tiene alumnos en común con Python, pero es de otra categoría igual que
+    # Photoshop: solo la popularidad los desempata
+    assert recommended[2:] == [6, 5]
+
+
+def test_category_outranks_popularity_without_shared_students(recommender):
+    # Photoshop no comparte alumnos con nadie: Figma (misma categoría, sin inscriptos)
+    # va antes que Python, el más popular de los demás
+    assert _fitted(recommender).recommend([6], limit=2) == [5, 1]
+
+
+def test_cold_process_serves_popular_courses_without_waiting_for_the_model(recommender, seeded, monkeypatch):
+    release, fitted = threading.Event(), threading.Event()
+    fit = recommender.fit
+
+    def slow_fit(db):
+        release.wait(5)
+        fit(db)
+        fitted.set()
+
+    monkeypatch.setattr(recommender, "fit", slow_fit)
+    enrolled = [seeded.get(db_models.Course, 1)]
+
+    cold = recommendation_service.get_course_recommendations(seeded, enrolled, limit=3)
+
+    # Más inscriptos primero, sin el curso del alumno ni el borrador
+    assert [course.id for course in cold] == [6, 2, 3]
+    assert not recommender.is_ready
+    # El entrenamiento en curso no se lanza dos veces
+    assert recommender.warm_up() is None
+
+    release.set()
+    assert fitted.wait(5)
+    warm = recommendation_service.get_course_recommendations(seeded, enrolled, limit=3)
+    assert [course.id for course in warm] == [2, 3, 6]
+
+
+def test_llm_rerank_only_reorders_local_candidates(recommender, seeded, monkeypatch):
+    _fitted(recommender)
+    seen = {}
+
+    def fake_rerank(enrolled_titles, candidate_titles):
+        seen["candidates"] = candidate_titles
+        # La IA inventa un curso y menciona el borrador: ninguno debe aparecer
+        return ["Kotlin", "FastAPI", "Figma", "Flask"]
+
+    monkeypatch.setattr(recommendation_service, "RECOMMENDER_LLM_RERANK", True)
+    monkeypatch.setattr(ai_service, "rerank_course_recommendations", fake_rerank)
+
+    recommended = recommendation_service.get_course_recommendations(
+        seeded, [seeded.get(db_models.Course, 1)], limit=3
+    )
+
+    assert seen["candidates"] == ["Django", "Flask", "Photoshop", "Figma"]
+    # Los elegidos por la IA primero; el resto conserva el orden local
+    assert [course.title for course in recommended] == ["Figma", "Flask", "Django"]
+
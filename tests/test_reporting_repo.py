@@ -0,0 +1,149 @@
+# backend/tests/test_reporting_repo.py
+
+from app import db_models
+from app.repositories import reporting_repo
+
+from conftest import seed_roles_and_instructor, add_student, seed_enrolled_courses
+
+
+def _seed_instructor_rooms(db):
+    instructor_id = seed_roles_and_instructor(db)
+    db.add(db_models.User(id=2000, username="otro", email="otro@example.com", hashed_password="x", role_id=2))
+    db.add_all([
+        db_models.Room(id=1, name="Sala B", instructor_id=instructor_id, join_code="B1"),
+        db_models.Room(id=2, name="Sala A", instructor_id=instructor_id, join_code="A1"),
+        db_models.Room(id=3, name="Sala ajena", instructor_id=2000, join_code="X1"),
+    ])
+    db.add_all([
+        db_models.Course(id=1, title="Python", level="basico", category_id=1, instructor_id=instructor_id),
+        db_models.Course(id=2, title="SQL", level="intermedio", category_id=1, instructor_id=instructor_id),
+        db_models.Course(id=3, title="Libre", level="avanzado", category_id=1),
+    ])
+    db.add_all([db_models.Module(id=10 + k, course_id=1, title=f"Py {k}", order_index=k) for k in range(4)])
+    db.add_all([db_models.Module(id=20 + k, course_id=2, title=f"SQL {k}", order_index=k) for k in range(3)])
+    # El curso 1 está en dos salas del instructor: se informa la primera por nombre
+    db.add_all([
+        db_models.RoomCourse(room_id=1, course_id=1),
+        db_models.RoomCourse(room_id=2, course_id=1),
+        db_models.RoomCourse(room_id=1, course_id=2),
+        db_models.RoomCourse(room_id=3, course_id=3),
+    ])
+
+    add_student(db, 1, first_name="Ana")
+    add_student(db, 2)
+    add_student(db, 3, first_name="Sin cursos")
+    add_student(db, 4, first_name="De otra sala")
+    db.add_all([
+        db_models.RoomMember(room_id=1, user_id=1),
+        db_models.RoomMember(room_id=2, user_id=1),
+        db_models.RoomMember(room_id=2, user_id=2),
+        db_models.RoomMember(room_id=1, user_id=3),
+        db_models.RoomMember(room_id=3, user_id=4),
+        # Los instructores miembros de una sala no son alumnos del reporte
+        db_models.RoomMember(room_id=1, user_id=2000),
+    ])
+    db.add_all([
+        db_models.CourseEnrollment(user_id=1, course_id=1),
+        db_models.CourseEnrollment(user_id=1, course_id=2),
+        db_models.CourseEnrollment(user_id=2, course_id=3),
+        db_models.CourseEnrollment(user_id=4, course_id=1),
+    ])
+    db.add_all([
+        db_models.StudentProgress(user_id=1, module_id=10, status="completed"),
+        db_models.StudentProgress(user_id=1, module_id=11, status="completed"),
+        # Un módulo completado dos veces cuenta una sola vez
+        db_models.StudentProgress(user_id=1, module_id=11, status="completed"),
+        db_models.StudentProgress(user_id=1, module_id=12, status="in_progress"),
+        db_models.StudentProgress(user_id=1, module_id=20, status="completed"),
+        db_models.StudentProgress(user_id=4, module_id=10, status="completed"),
+    ])
+    db.commit()
+    return instructor_id
+
+
+def test_detailed_student_progress_runs_one_query(db, query_counter):
+    instructor_id = _seed_instructor_rooms(db)
+    query_counter.reset()
+
+    report = reporting_repo.get_detailed_student_progress(db, instructor_id=instructor_id)
+
+    assert query_counter.count == 1
+    assert report == [
+        {
+            "student_id": 1,
+            "student_name": "Ana",
+            "enrollments": [
+                {"course_title": "Python", "room_name": "Sala A", "progress": 50},
+                {"course_title": "SQL", "room_name": "Sala B", "progress": 33},
+            ],
+        },
+        {
+            "student_id": 2,
+            "student_name": "alumno2",
+            "enrollments": [
+                {"course_title": "Libre", "room_name": "Sin Sala (Libre)", "progress": 0},
+            ],
+        },
+        {"student_id": 3, "student_name": "Sin cursos", "enrollments": []},
+    ]
+
+
+def test_detailed_student_progress_query_count_does_not_grow_with_students(db, query_counter):
+    instructor_id = _seed_instructor_rooms(db)
+    for user_id in range(100, 300):
+        add_student(db, user_id)
+        db.add(db_models.RoomMember(room_id=1, user_id=user_id))
+        db.add(db_models.CourseEnrollment(user_id=user_id, course_id=user_id % 2 + 1))
+    db.commit()
+    query_counter.reset()
+
+    report = reporting_repo.get_detailed_student_progress(db, instructor_id=instructor_id)
+
+    assert query_counter.count == 1
+    assert len(report) == 3 + 200
+
+
+def test_enrollments_report_page_query_count_does_not_grow(db, query_counter):
+    seed_enrolled_courses(db, course_count=3, students_per_course=2)
+    query_counter.reset()
+    small = reporting_repo.get_courses_with_enrollments_and_progress(db)
+    small_count = query_counter.count
+
+    for course_id in range(4, 31):
+        db.add(db_models.Course(id=course_id, title=f"Curso {course_id}", level="basico", category_id=1))
+    for user_id in range(100, 250):
+        add_student(db, user_id)
+        db.add(db_models.CourseEnrollment(user_id=user_id, course_id=user_id % 30 + 1))
+    db.commit()
+    query_counter.reset()
+    large = reporting_repo.get_courses_with_enrollments_and_progress(db)
+
+    assert small_count == query_counter.count == 3
+    assert len(small) == 3 and len(large) == 30
+    assert small[0]["enrolled_students"][0]["progress"] == 50
+    assert sum(len(course["enrolled_students"]) for course in large) == 3 * 2 + 150
+
+
+def test_enrollments_report_page_is_bounded(db):
+    seed_enrolled_courses(db, course_count=reporting_repo.ENROLLMENTS_REPORT_MAX_PAGE_SIZE + 10, students_per_course=0)
+
+    default_page = reporting_repo.get_courses_with_enrollments_and_progress(db)
+    huge_page = reporting_repo.get_courses_with_enrollments_and_progress(db, skip=5, limit=10_000)
+
+    assert [course["id"] for course in default_page] == list(range(1, reporting_repo.ENROLLMENTS_REPORT_PAGE_SIZE + 1))
+    assert len(huge_page) == reporting_repo.ENROLLMENTS_REPORT_MAX_PAGE_SIZE
+    assert huge_page[0]["id"] == 6
+
+
+def test_streamed_report_walks_courses_by_id_in_batches(db, query_counter):
+    seed_enrolled_courses(db, course_count=5, students_per_course=3)
+    query_counter.reset()
+
+    courses = list(reporting_repo.iter_courses_with_enrollments_and_progress(db, batch_size=2))
+
+    assert [course["id"] for course in courses] == [1, 2, 3, 4, 5]
+    assert all(len(course["enrolled_students"]) == 3 for course in courses)
+    course_queries = [statement for statement in query_counter.statements if "FROM courses" in statement]
+    # Tres lotes y una última consulta vacía, cada uno desde el último ID leído
+    assert len(course_queries) == 4
+    assert all("courses.id >" in statement for statement in course_queries)
@@ -0,0 +1,67 @@
+# backend/tests/test_scheduled_events.py
+
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app import db_models
+from app.repositories import scheduled_event_repo
+
+from conftest import seed_roles_and_instructor, add_student
+
+STUDENTS = list(range(1, 41))
+
+
+def _seed_room(db):
+    instructor_id = seed_roles_and_instructor(db)
+    for user_id in STUDENTS:
+        add_student(db, user_id)
+    db.add(db_models.Room(id=1, name="Python avanzado", instructor_id=instructor_id, join_code="PY1"))
+    db.commit()
+    return instructor_id
+
+
+def _count_commits(db):
+    commits = []
+    event.listen(db, "after_commit", commits.append)
+    return commits
+
+
+def _create(db, instructor_id, **kwargs):
+    return scheduled_event_repo.create_scheduled_event(
+        db, room_id=1, creator_id=instructor_id, title="Clase en vivo",
+        start_time=datetime(2026, 11, 2, 18), end_time=datetime(2026, 11, 2, 19), event_type="lecture", **kwargs
+    )
+
+
+def test_invitations_and_notifications_are_bulk_inserted_in_one_commit(db, query_counter):
+    instructor_id = _seed_room(db)
+    commits = _count_commits(db)
+    query_counter.reset()
+
+    # Los IDs repetidos se invitan una sola vez
+    db_event = _create(db, instructor_id, invited_user_ids=STUDENTS + STUDENTS[:5], invitation_message="Nueva clase")
+
+    assert len(commits) == 1
+    inserts = [statement for statement in query_counter.statements if statement.startswith("INSERT")]
+    assert [statement.split()[2] for statement in inserts] == ["scheduled_events", "event_invitations", "notifications"]
+
+    invitations = db.query(db_models.EventInvitation).filter_by(event_id=db_event.id).all()
+    notifications = db.query(db_models.Notification).all()
+    assert sorted(invitation.user_id for invitation in invitations) == STUDENTS
+    assert {invitation.status for invitation in invitations} == {"pending"}
+    assert sorted(notification.user_id for notification in notifications) == STUDENTS
+    assert {notification.link_url for notification in notifications} == {f"/calendar?event_id={db_event.id}"}
+
+
+def test_event_without_invitations_or_message(db):
+    instructor_id = _seed_room(db)
+    commits = _count_commits(db)
+
+    db_event = _create(db, instructor_id)
+    _create(db, instructor_id, invited_user_ids=[1, 2])
+
+    assert len(commits) == 2
+    assert db.query(db_models.EventInvitation).filter_by(event_id=db_event.id).count() == 0
+    assert db.query(db_models.EventInvitation).count() == 2
+    assert db.query(db_models.Notification).count() == 0
@@ -0,0 +1,99 @@
+# backend/tests/test_suggestion_index.py
+
+import difflib
+import random
+
+from app import db_models
+from app.core.suggestion_index import SuggestionIndex, normalize_topic
+from app.routers import suggestions
+
+WORDS = ["python", "datos", "redes", "web", "seguridad", "cloud", "introducción", "avanzado",
+         "de", "para", "con", "sql", "diseño", "java", "react", "docker"]
+
+
+def _brute_force(topic, rows, cutoff):
+    normalized = normalize_topic(topic)
+    best, best_ratio = None, 0.0
+    for suggestion_id, existing in rows:
+        ratio = difflib.SequenceMatcher(None, normalized, normalize_topic(existing)).ratio()
+        if ratio >= cutoff and ratio > best_ratio:
+            best, best_ratio = suggestion_id, ratio
+    return (best, best_ratio) if best is not None else None
+
+
+def test_best_match_equals_comparing_against_every_topic():
+    rng = random.Random(3)
+    topics = sorted({" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))) for _ in range(600)})
+    rows = list(enumerate(topics, 1))
+    index = SuggestionIndex()
+    index.reload(rows)
+
+    for _ in range(60):
+        chars = list(rng.choice(topics))
+        for _ in range(rng.randint(0, 3)):
+            chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+        query = "".join(chars).upper()
+        assert index.best_match(query, 0.8) == _brute_force(query, rows, 0.8)
+
+
+def test_many_similar_topics_do_not_hide_the_best_match():
+    # Cien temas casi iguales: un límite fijo de candidatos dejaba afuera al exacto
+    rows = [(n, f"Curso de Python nivel {n}") for n in range(1, 101)]
+    index = SuggestionIndex()
+    index.reload(rows)
+
+    assert index.best_match("curso de python nivel 100", 0.8) == (100, 1.0)
+
+
+def test_topics_are_compared_in_their_normalized_form():
+    index = SuggestionIndex()
+    index.reload([(1, "Machine   Learning\tcon Python")])
+
+    assert index.best_match("  machine learning con PYTHON ", 0.8) == (1, 1.0)
+
+
+def test_old_gaps_are_left_to_the_periodic_reload():
+    index = SuggestionIndex()
+    index.reload([(1, "Docker desde cero"), (500, "Redes neuronales"), (1000, "Seguridad web")])
+
+    assert index.missing_ids() == list(range(900, 1000))
+
+
+def test_rows_committed_out_of_order_are_picked_up():
+    index = SuggestionIndex()
+    index.reload([(1, "Docker desde cero"), (2, "Redes neuronales")])
+
+    # El ID 4 se confirma antes que el 3
+    index.add_many([(4, "Seguridad web")])
+    assert index.last_id == 4
+    assert index.missing_ids() == [3]
+
+    index.add_many([(3, "Kubernetes en producción")])
+    assert index.missing_ids() == []
+    assert index.best_match("kubernetes en produccion", 0.8)[0] == 3
+
+
+def test_router_sync_reads_late_rows_and_reloads(db, monkeypatch):
+    index = SuggestionIndex(reload_seconds=3600)
+    monkeypatch.setattr(suggestions, "suggestion_index", index)
+    db.add_all([
+        db_models.CourseSuggestion(id=1, topic="Docker desde cero"),
+        db_models.CourseSuggestion(id=2, topic="Redes neuronales"),
+        db_models.CourseSuggestion(id=4, topic="Seguridad web"),
+    ])
+    db.commit()
+    suggestions._sync_suggestion_index(db)
+    assert index.best_match("seguridad web", 0.8) == (4, 1.0)
+
+    # Una transacción que tomó el ID 3 confirma después de que se leyó el 4
+    db.add(db_models.CourseSuggestion(id=3, topic="Kubernetes en producción"))
+    db.commit()
+    suggestions._sync_suggestion_index(db)
+    assert index.best_match("kubernetes en producción", 0.8) == (3, 1.0)
+
+    # La recarga periódica vuelve a leer toda la tabla
+    db.query(db_models.CourseSuggestion).filter(db_models.CourseSuggestion.id == 2).delete()
+    db.commit()
+    index.reload_seconds = 0
+    suggestions._sync_suggestion_index(db)
+    assert index.best_match("redes neuronales", 0.8) is None
@@ -0,0 +1,112 @@
+# backend/tests/test_suggestion_search.py
+
+import re
+
+import pytest
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+
+from app import db_models
+from app.repositories import suggestion_repo
+
+TOPICS = [
+    ("Python para principiantes", 5),
+    ("Python avanzado con Django", 9),
+    ("Programación en Go", 3),
+    ("Go concurrente", 7),
+    ("Diseño UX para apps", 1),
+    ("Redes neuronales con PyTorch", 4),
+    ("Machine learning con Python", 6),
+    ("Bases de datos SQL", 2),
+    ("Descuentos del 100% en cursos", 0),
+    ("Docker y Kubernetes para desarrolladores", 8),
+]
+
+
+def _seed(db):
+    db.add_all([
+        db_models.CourseSuggestion(id=suggestion_id, topic=topic, votes=votes)
+        for suggestion_id, (topic, votes) in enumerate(TOPICS, 1)
+    ])
+    db.commit()
+
+
+def _all_words_as_prefix(query):
+    """Resultado esperado del modo booleano '+palabra*': todas las palabras como prefijo."""
+    words = [word for word in re.findall(r"\w+", query.lower()) if len(word) >= suggestion_repo.FULLTEXT_MIN_TOKEN_SIZE]
+    return {
+        suggestion_id for suggestion_id, (topic, _) in enumerate(TOPICS, 1)
+        if all(any(token.startswith(word) for token in re.findall(r"\w+", topic.lower())) for word in words)
+    }
+
+
+def test_short_words_fall_back_to_substring_search_ordered_by_votes(db):
+    _seed(db)
+
+    results = suggestion_repo.search_suggestions(db, "Go")
+
+    # "Go" está por debajo del largo mínimo del índice: subcadena, por votos
+    assert [suggestion.topic for suggestion in results] == [
+        "Python avanzado con Django", "Go concurrente", "Programación en Go"
+    ]
+
+
+def test_fallback_escapes_like_wildcards(db):
+    _seed(db)
+
+    assert [suggestion.id for suggestion in suggestion_repo.search_suggestions(db, "0%")] == [9]
+    assert suggestion_repo.search_suggestions(db, "x_") == []
+
+
+def test_fallback_pages_the_results(db):
+    _seed(db)
+
+    first = suggestion_repo.search_suggestions(db, "o", skip=0, limit=3)
+    second = suggestion_repo.search_suggestions(db, "o", skip=3, limit=3)
+
+    assert len(first) == len(second) == 3
+    assert not {suggestion.id for suggestion in first} & {suggestion.id for suggestion in second}
+
+
+def test_query_without_words_does_not_hit_the_database(db, query_counter):
+    query_counter.reset()
+
+    assert suggestion_repo.search_suggestions(db, "  ¿? ") == []
+    assert query_counter.count == 0
+
+
+def _mysql_sql(db, query):
+    statement = suggestion_repo._search_query(db, query).statement
+    return " ".join(str(statement.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True})).split())
+
+
+def test_indexed_words_use_a_boolean_prefix_fulltext_match(db):
+    sql = _mysql_sql(db, "Redes  de Python!")
+
+    # "de" es más corta que el token mínimo del índice: queda fuera de la búsqueda
+    match_sql = "MATCH (course_suggestions.topic) AGAINST ('+redes* +python*' IN BOOLEAN MODE)"
+    assert f"WHERE ({match_sql}) > 0" in sql
+    assert sql.endswith(f"ORDER BY {match_sql} DESC, course_suggestions.votes DESC, course_suggestions.id")
+    assert "LIKE" not in sql
+
+
+def test_only_short_words_use_a_substring_match(db):
+    sql = _mysql_sql(db, "Go")
+
+    assert "MATCH" not in sql
+    assert "LIKE concat('%%', 'Go', '%%')" in sql
+
+
+@pytest.mark.parametrize("query", ["python", "pyth", "Python con", "con pyth", "redes neuronales", "datos", "kube des", "inexistente"])
+def test_fulltext_search_matches_every_word_as_prefix(mysql_engine, query):
+    db = sessionmaker(bind=mysql_engine)()
+    try:
+        # El índice FULLTEXT de InnoDB solo ve las filas confirmadas
+        _seed(db)
+
+        results = suggestion_repo.search_suggestions(db, query, limit=len(TOPICS))
+
+        assert {suggestion.id for suggestion in results} == _all_words_as_prefix(query)
+    finally:
+        db.close()
+
@@ -0,0 +1,135 @@
+# backend/tests/test_tts.py
+
+import random
+import threading
+import time
+
+import pytest
+
+from app import db_models
+from app.core.audio_storage import LocalAudioStorage
+from app.routers import modules
+from app.services import tts_service
+from app.services.tts_service import FakeTTSBackend, split_into_chunks
+
+from conftest import seed_roles_and_instructor, current_user, make_client
+
+
+class CountingBackend(FakeTTSBackend):
+    """FakeTTSBackend lento y con demoras al azar, para que los fragmentos terminen desordenados."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+        self._random = random.Random(3)
+
+    def synthesize(self, text, lang):
+        with self._lock:
+            self.calls.append(text)
+            delay = self._random.uniform(0, 0.03)
+        time.sleep(delay)
+        return super().synthesize(text, lang)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = LocalAudioStorage(root=str(tmp_path))
+    monkeypatch.setattr(tts_service, "audio_storage", storage)
+    return storage
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = CountingBackend()
+    monkeypatch.setattr(tts_service, "tts_backend", backend)
+    return backend
+
+
+def _read(storage, key):
+    return b"".join(storage.iter_range(key, 0, storage.stat(key).size - 1))
+
+
+@pytest.mark.parametrize("text, max_chars, expected", [
+    ("Hola. Chau.", 50, ["Hola. Chau."]),
+    ("Primera oración. Segunda oración. Tercera.", 20, ["Primera oración.", "Segunda oración.", "Tercera."]),
+    ("Uno. Dos! Tres? Cuatro; cinco: seis.", 10, ["Uno. Dos!", "Tres?", "Cuatro;", "cinco:", "seis."]),
+    # Una oración más larga que el límite se corta por palabras
+    ("una dos tres cuatro cinco seis", 10, ["una dos", "tres", "cuatro", "cinco seis"]),
+    ("Corta. palabras muy largas aquí.", 12, ["Corta.", "palabras muy", "largas aquí."]),
+    ("", 10, []),
+])
+def test_split_into_chunks(text, max_chars, expected):
+    chunks = split_into_chunks(text, max_chars)
+
+    assert chunks == expected
+    assert all(len(chunk) <= max_chars for chunk in chunks)
+
+
+def test_chunks_never_exceed_the_limit_and_keep_every_word():
+    rng = random.Random(5)
+    words = [rng.choice(["ab", "datos", "python.", "redes,", "funciones!", "x"]) for _ in range(2000)]
+    text = " ".join(words)
+
+    chunks = split_into_chunks(text, 80)
+
+    assert all(len(chunk) <= 80 for chunk in chunks)
+    assert " ".join(chunks).split() == words
+
+
+def test_chunks_are_concatenated_in_order(storage, backend):
+    content = " ".join(f"Esta es la oración número {i}." for i in range(200))
+
+    key = tts_service.synthesize_module_audio(content)
+
+    chunks = split_into_chunks(content)
+    assert len(chunks) > 10
+    assert sorted(backend.calls) == sorted(chunks)
+    assert _read(storage, key) == b"".join(FakeTTSBackend().synthesize(chunk, "es") for chunk in chunks)
+
+
+def test_existing_audio_is_not_synthesized_again(storage, backend):
+    first = tts_service.synthesize_module_audio("# Título\nTexto de la lección.")
+    calls = len(backend.calls)
+
+    second = tts_service.synthesize_module_audio("# Título\nTexto de la lección.")
+    other = tts_service.synthesize_module_audio("Otra lección.")
+
+    assert second == first
+    assert other != first
+    assert len(backend.calls) == calls + 1
+
+
+def test_concurrent_callers_share_one_synthesis(storage, backend):
+    barrier = threading.Barrier(6)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(tts_service.synthesize_module_audio("La misma lección para todos."))
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 1 and results[0] is not None
+    assert backend.calls == ["La misma lección para todos."]
+    assert tts_service._in_flight == {}
+
+
+def test_second_click_joins_the_active_audio_job(db, session_factory, monkeypatch):
+    instructor_id = seed_roles_and_instructor(db)
+    db.add(db_models.Course(id=1, title="Python", level="basico", category_id=1, instructor_id=instructor_id))
+    db.add(db_models.Module(id=10, course_id=1, title="M", order_index=0, content_data="Texto."))
+    db.commit()
+    queued = []
+    monkeypatch.setattr(modules, "enqueue", lambda task_name, *args: queued.append(args))
+    client = make_client(session_factory, modules.router, user=current_user(instructor_id, "instructor"))
+
+    first = client.post("/modules/10/generate-audio")
+    second = client.post("/modules/10/generate-audio")
+
+    assert first.status_code == second.status_code == 202
+    assert second.json()["id"] == first.json()["id"]
+    assert queued == [(first.json()["id"],)]
@@ -1,14 +1,63 @@
 # worker.py
-from celery import Celery
-
-celery_app = Celery("tasks", broker="redis://localhost:6379/0", backend="redis://localhost:6379/0")
-
-@celery_app.task
-def generate_full_course_content(course_id):
-    # Aquí va toda la lógica pesada:
-    # 1. Llamar a la IA para generar la currícula
-    # 2. Guardar los módulos
-    # 3. Para cada módulo, llamar a la IA para generar contenido
-    # 4. Para cada módulo, llamar a la IA para generar quizzes
-    # 5. Actualizar el estado del curso en la DB a 'listo'
-    print(f"Curso {course_id} generado completamente.")
\ No newline at end of file
+from app.core.task_queue import (
+    celery_app,
+    GENERATE_FULL_COURSE_CONTENT,
+    GENERATE_MODULE_CONTENT,
+    GENERATE_MODULE_AUDIO,
+    REFRESH_LEARNING_PATH_SUGGESTIONS,
+    REFRESH_COURSE_SUMMARY,
+)
+from app.database import SessionLocal
+from app.services import course_service, generation_pipeline, learning_path_service
+
+# Fábrica de sesiones de las tareas; los tests la reemplazan por una sobre su propia base
+session_factory = SessionLocal
+
+
+def _run_generation_job(job_id: int):
+    db = session_factory()
+    try:
+        generation_pipeline.run_job(db, job_id)
+    finally:
+        db.close()
+
+
+@celery_app.task(name=GENERATE_FULL_COURSE_CONTENT)
+def generate_full_course_content(job_id: int):
+    """
+    Pipeline completo de un curso: currícula -> contenido de cada módulo -> quizzes -> audio.
+    El progreso se consulta en GET /jobs/{job_id}.
+    """
+    _run_generation_job(job_id)
+
+
+@celery_app.task(name=GENERATE_MODULE_CONTENT)
+def generate_module_content(job_id: int):
+    """Contenido de la lección y quiz de un módulo."""
+    _run_generation_job(job_id)
+
+
+@celery_app.task(name=GENERATE_MODULE_AUDIO)
+def generate_module_audio(job_id: int):
+    """Audio de la lección de un módulo."""
+    _run_generation_job(job_id)
+
+
+@celery_app.task(name=REFRESH_LEARNING_PATH_SUGGESTIONS)
+def refresh_learning_path_suggestions(path_id: int):
+    """Recalcula los cursos sugeridos por la IA para una ruta de conocimiento."""
+    db = session_factory()
+    try:
+        learning_path_service.refresh_path_suggestions(db, path_id)
+    finally:
+        db.close()
+
+
+@celery_app.task(name=REFRESH_COURSE_SUMMARY)
+def refresh_course_summary(course_id: int):
+    """Regenera el resumen del curso si cambiaron su título o descripción."""
+    db = session_factory()
+    try:
+        course_service.refresh_course_summary(db, course_id)
+    finally:
+        db.close()